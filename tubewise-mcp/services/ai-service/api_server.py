@@ -8,9 +8,10 @@ all the core functionality needed by the frontend.
 import os
 import sys
 import re
+import asyncio
 import json
 import logging
-import uuid
+from functools import lru_cache
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 
@@ -114,7 +115,7 @@ app.add_middleware(
 # Request ID middleware to add request ID to each request
 @app.middleware("http")
 async def add_request_id(request: Request, call_next):
-    request_id = str(uuid.uuid4())
+    request_id = os.urandom(8).hex()
     # Store request ID in request state
     request.state.request_id = request_id
     # Add request ID to response headers
@@ -187,8 +188,9 @@ def extract_video_id(url):
     
     return None
 
+@lru_cache(maxsize=2048)
 def get_video_info(video_id):
-    """Get basic info about a YouTube video."""
+    """Get basic info about a YouTube video (memoized per video ID)."""
     try:
         # In a real implementation, you would use the YouTube API
         # For now, just return a mock response
@@ -205,29 +207,39 @@ def get_video_info(video_id):
             "published_at": "Unknown"
         }
 
+@lru_cache(maxsize=2048)
+def fetch_youtube_transcript(video_id):
+    """
+    Fetch and format a transcript from YouTube, memoized per video ID.
+    
+    Errors propagate (and are therefore not cached) so that a failed fetch
+    is retried on the next request.
+    """
+    transcript_list = YouTubeTranscriptApi.get_transcript(video_id)
+    
+    # Format transcript
+    formatted_transcript = []
+    for item in transcript_list:
+        start_seconds = item['start']
+        # Format time as HH:MM:SS
+        hours = int(start_seconds // 3600)
+        minutes = int((start_seconds % 3600) // 60)
+        seconds = int(start_seconds % 60)
+        
+        formatted_time = f"{hours}:{minutes:02d}:{seconds:02d}"
+        
+        formatted_transcript.append({
+            "startTime": formatted_time,
+            "text": item['text']
+        })
+        
+    return formatted_transcript
+
 def get_transcript(video_id):
     """Get transcript for a YouTube video."""
     try:
         if youtube_api_available:
-            transcript_list = YouTubeTranscriptApi.get_transcript(video_id)
-            
-            # Format transcript
-            formatted_transcript = []
-            for item in transcript_list:
-                start_seconds = item['start']
-                # Format time as HH:MM:SS
-                hours = int(start_seconds // 3600)
-                minutes = int((start_seconds % 3600) // 60)
-                seconds = int(start_seconds % 60)
-                
-                formatted_time = f"{hours}:{minutes:02d}:{seconds:02d}"
-                
-                formatted_transcript.append({
-                    "startTime": formatted_time,
-                    "text": item['text']
-                })
-                
-            return formatted_transcript
+            return fetch_youtube_transcript(video_id)
         else:
             # Return mock transcript for testing
             return generate_mock_transcript(video_id)
@@ -236,22 +248,36 @@ def get_transcript(video_id):
         # Return mock transcript for testing
         return generate_mock_transcript(video_id)
 
+async def fetch_video_data(video_id):
+    """Fetch video info and transcript concurrently in worker threads."""
+    return await asyncio.gather(
+        asyncio.to_thread(get_video_info, video_id),
+        asyncio.to_thread(get_transcript, video_id)
+    )
+
+# Placeholder transcript returned when the real one can't be fetched
+_MOCK_TRANSCRIPT = (
+    {"startTime": "0:00:00", "text": "Hello and welcome to this video."},
+    {"startTime": "0:00:05", "text": "Today we will be discussing an important topic."},
+    {"startTime": "0:00:10", "text": "This is a key point that you should remember."},
+    {"startTime": "0:00:15", "text": "Another important concept to understand."},
+    {"startTime": "0:00:20", "text": "Let me explain this in more detail."},
+    {"startTime": "0:00:25", "text": "This is how you can apply this knowledge."},
+    {"startTime": "0:00:30", "text": "Let's summarize what we've learned."},
+    {"startTime": "0:00:35", "text": "Thank you for watching this video."},
+    {"startTime": "0:00:40", "text": "Don't forget to like and subscribe."},
+    {"startTime": "0:00:45", "text": "See you in the next video!"}
+)
+
 def generate_mock_transcript(video_id):
     """Generate a mock transcript for testing."""
     logger.info(f"Creating mock transcript data for video: {video_id}")
     
-    return [
-        {"startTime": "0:00:00", "text": "Hello and welcome to this video."},
-        {"startTime": "0:00:05", "text": "Today we will be discussing an important topic."},
-        {"startTime": "0:00:10", "text": "This is a key point that you should remember."},
-        {"startTime": "0:00:15", "text": "Another important concept to understand."},
-        {"startTime": "0:00:20", "text": "Let me explain this in more detail."},
-        {"startTime": "0:00:25", "text": "This is how you can apply this knowledge."},
-        {"startTime": "0:00:30", "text": "Let's summarize what we've learned."},
-        {"startTime": "0:00:35", "text": "Thank you for watching this video."},
-        {"startTime": "0:00:40", "text": "Don't forget to like and subscribe."},
-        {"startTime": "0:00:45", "text": "See you in the next video!"}
-    ]
+    return [dict(item) for item in _MOCK_TRANSCRIPT]
+
+def is_mock_transcript(transcript):
+    """Whether a transcript is the placeholder from generate_mock_transcript."""
+    return list(transcript) == list(_MOCK_TRANSCRIPT)
 
 def summarize_text(transcript, title=""):
     """Generate a summary from transcript with structured sections and headlines."""
@@ -585,11 +611,8 @@ async def chat_with_video(request: ChatRequest):
     # Log the received message for debugging
     logger.info(f"Received chat message: {message}")
     
-    # Get video info
-    video_info = get_video_info(video_id)
-    
-    # Get transcript
-    transcript = get_transcript(video_id)
+    # Get video info and transcript concurrently
+    video_info, transcript = await fetch_video_data(video_id)
     
     # استفاده از تابع generate_chat_response برای تولید پاسخ بر اساس محتوای واقعی ویدیو
     try:
@@ -731,19 +754,18 @@ async def compare_multiple_videos(request: MultiVideoRequest):
     if len(video_ids) < 2:
         raise HTTPException(status_code=400, detail="Could not extract valid video IDs from URLs")
     
-    # Get video info and transcripts
+    # Get video info and transcripts for all videos concurrently
+    fetched = await asyncio.gather(*(fetch_video_data(vid) for vid in video_ids))
+    
     videos_info = []
     transcripts = []
     
-    for vid in video_ids:
-        video_info = get_video_info(vid)
+    for vid, (video_info, transcript) in zip(video_ids, fetched):
         videos_info.append({"id": vid, "title": video_info["title"]})
-        
-        transcript = get_transcript(vid)
         transcripts.append(transcript)
     
     # Generate comparison
-    comparison_result = compare_videos(video_ids, videos_info, transcripts)
+    comparison_result = await asyncio.to_thread(compare_videos, video_ids, videos_info, transcripts)
     
     return {
         "video_ids": video_ids,
@@ -2,6 +2,7 @@ import json
 import redis
 import os
 import time
+import hashlib
 from typing import Any, Dict, List, Optional, Union
 import logging
 
@@ -20,6 +21,23 @@ DEFAULT_CACHE_TTL = 60 * 60 * 24 * 7  # 7 days
 TRANSCRIPT_CACHE_TTL = 60 * 60 * 24 * 30  # 30 days
 SUMMARY_CACHE_TTL = 60 * 60 * 24 * 7  # 7 days
 COMPARISON_CACHE_TTL = 60 * 60 * 24 * 3  # 3 days
+INFLIGHT_TASK_TTL = 60 * 30  # 30 minutes; upper bound on how long a task can block duplicates
+
+def comparison_key(video_ids: List[str]) -> str:
+    """Build the order-independent cache identifier for a set of videos.
+    
+    Video IDs may themselves contain '-' and '_', so the sorted IDs are
+    hashed (BLAKE2b-128) rather than joined, which also keeps the key a fixed
+    32 hex characters however many videos are compared.
+    
+    Args:
+        video_ids: List of YouTube video IDs
+        
+    Returns:
+        32-character hex digest
+    """
+    joined = b"\0".join(sorted(video_id.encode() for video_id in video_ids))
+    return hashlib.blake2b(joined, digest_size=16).hexdigest()
 
 class CacheService:
     """Service for caching video transcripts, summaries, and analysis results."""
@@ -142,6 +160,84 @@ class CacheService:
             logger.error(f"Error deleting cache for {key}: {e}")
             return False
     
+    def claim_inflight(self, task_type: str, identifier: str, task_id: str, ttl: int = INFLIGHT_TASK_TTL) -> Optional[str]:
+        """Register a task as the one in flight for a resource, unless another already is.
+        
+        Args:
+            task_type: Type of task (e.g., 'summary', 'comparison')
+            identifier: Unique identifier of the resource the task produces
+            task_id: ID of the task about to be started
+            ttl: Time-to-live in seconds
+            
+        Returns:
+            None if the claim succeeded, otherwise the ID of the task already in flight
+        """
+        key = self._get_key(f"inflight:{task_type}", identifier)
+        
+        try:
+            if self.redis:
+                # SET NX is atomic, so only one concurrent caller wins
+                if not self.redis.set(key, task_id, nx=True, ex=ttl):
+                    return self.redis.get(key)
+            else:
+                # Fallback to in-memory cache
+                inflight = self.memory_cache.get(key)
+                if inflight and time.time() < inflight['expires_at']:
+                    return inflight['data']
+                self.memory_cache[key] = {
+                    'data': task_id,
+                    'expires_at': time.time() + ttl
+                }
+        except Exception as e:
+            logger.error(f"Error claiming in-flight task for {key}: {e}")
+            return None
+        
+        # Remember which resource the task claimed so cancelling it can release the claim
+        self.set("inflight_task", task_id, {"task_type": task_type, "identifier": identifier}, ttl)
+        return None
+    
+    def release_inflight(self, task_type: str, identifier: str) -> bool:
+        """Forget the in-flight task for a resource so a new one can start.
+        
+        Args:
+            task_type: Type of task (e.g., 'summary', 'comparison')
+            identifier: Unique identifier of the resource the task produces
+            
+        Returns:
+            True if a claim was removed, False otherwise
+        """
+        return self.delete(f"inflight:{task_type}", identifier)
+    
+    def release_inflight_task(self, task_id: str) -> bool:
+        """Release the claim held by a task, if it still holds one.
+        
+        Args:
+            task_id: ID of the task whose claim to release
+            
+        Returns:
+            True if a claim was removed, False otherwise
+        """
+        claim = self.get("inflight_task", task_id)
+        if not claim:
+            return False
+        self.delete("inflight_task", task_id)
+        
+        key = self._get_key(f"inflight:{claim['task_type']}", claim["identifier"])
+        try:
+            if self.redis:
+                current = self.redis.get(key)
+            else:
+                inflight = self.memory_cache.get(key)
+                current = inflight['data'] if inflight else None
+        except Exception as e:
+            logger.error(f"Error reading in-flight task for {key}: {e}")
+            return False
+        
+        # Leave a claim that has since passed to another task alone
+        if current != task_id:
+            return False
+        return self.release_inflight(claim["task_type"], claim["identifier"])
+    
     def cache_transcript(self, video_id: str, transcript_data: Dict) -> bool:
         """Cache a video transcript.
         
@@ -198,23 +294,20 @@ class CacheService:
         Returns:
             True if successful, False otherwise
         """
-        # Sort video IDs to ensure consistent cache keys
-        sorted_ids = sorted(video_ids)
-        comparison_id = "-".join(sorted_ids)
-        return self.set("comparison", comparison_id, comparison_data, COMPARISON_CACHE_TTL)
+        return self.set("comparison", comparison_key(video_ids), comparison_data, COMPARISON_CACHE_TTL)
     
-    def get_comparison(self, video_ids: List[str]) -> Optional[Dict]:
+    def get_comparison(self, video_ids: Optional[List[str]] = None, comparison_id: Optional[str] = None) -> Optional[Dict]:
         """Get a cached video comparison result.
         
         Args:
             video_ids: List of YouTube video IDs
+            comparison_id: Precomputed comparison_key(video_ids), used instead of video_ids
             
         Returns:
             Cached comparison if found, None otherwise
         """
-        # Sort video IDs to ensure consistent cache keys
-        sorted_ids = sorted(video_ids)
-        comparison_id = "-".join(sorted_ids)
+        if comparison_id is None:
+            comparison_id = comparison_key(video_ids)
         return self.get("comparison", comparison_id)
     
     def cache_chat_response(self, video_id: str, query: str, response_data: Dict) -> bool:
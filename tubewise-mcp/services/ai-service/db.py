@@ -2,10 +2,12 @@
 Database connection and models for TubeWise using SQLAlchemy.
 """
 import os
+from contextlib import asynccontextmanager
 from datetime import datetime
 from typing import List, Optional
 
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Float, Boolean, create_engine
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Float, Boolean, Index, create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship, sessionmaker
 
@@ -16,14 +18,44 @@ DB_USER = os.getenv("DB_USER", "postgres")
 DB_PASSWORD = os.getenv("DB_PASSWORD", "postgres")
 DB_NAME = os.getenv("DB_NAME", "tubewise")
 
-# Create database URL
+# Create database URLs
 DATABASE_URL = f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
-
-# Create SQLAlchemy engine
-engine = create_engine(DATABASE_URL)
+ASYNC_DATABASE_URL = f"postgresql+asyncpg://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+
+# Connection pool settings shared by the sync and async engines
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "20"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_SYNC_MAX_OVERFLOW = int(os.getenv("DB_SYNC_MAX_OVERFLOW", "40"))
+DB_POOL_RECYCLE = 1800  # seconds; recycle before server/proxy idle timeouts
+DB_POOL_TIMEOUT = 30  # seconds to wait for a free connection
+
+# Create SQLAlchemy engine once; every session borrows from its pool
+engine = create_engine(
+    DATABASE_URL,
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_SYNC_MAX_OVERFLOW,
+    pool_pre_ping=True,
+    pool_recycle=DB_POOL_RECYCLE
+)
 
 # Create session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+
+# Create async engine and session factory (requires the asyncpg driver)
+try:
+    async_engine = create_async_engine(
+        ASYNC_DATABASE_URL,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_pre_ping=True,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_timeout=DB_POOL_TIMEOUT
+    )
+    AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False)
+except ImportError:
+    async_engine = None
+    AsyncSessionLocal = None
+    print("asyncpg not installed, async database sessions are unavailable")
 
 # Create base class for models
 Base = declarative_base()
@@ -32,6 +64,11 @@ Base = declarative_base()
 class User(Base):
     """User model."""
     __tablename__ = "users"
+    __table_args__ = (
+        # Keyset pagination of the admin user list on (created_at, id); read
+        # newest first with a backward index scan
+        Index("ix_users_created_at_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     email = Column(String, unique=True, index=True)
@@ -185,6 +222,23 @@ def get_db():
         db.close()
 
 
+# Function to get an async database session
+@asynccontextmanager
+async def get_async_db():
+    """Get an async database session from the pooled async engine."""
+    if AsyncSessionLocal is None:
+        raise RuntimeError("Async database sessions require the asyncpg driver")
+    async with AsyncSessionLocal() as session:
+        yield session
+
+
+# FastAPI dependency for async routes
+async def get_async_session():
+    """Yield an async database session for the duration of a request."""
+    async with get_async_db() as session:
+        yield session
+
+
 # Function to create all tables
 def create_tables():
     """Create all tables in the database."""
@@ -198,6 +252,9 @@ class Subscription(Base):
     __tablename__ = "subscriptions"
 
     id = Column(Integer, primary_key=True, index=True)
+    # Both unique constraints are backed by unique indexes: user_id is the
+    # ON CONFLICT target for checkout upserts, and webhooks look rows up by
+    # stripe_subscription_id
     user_id = Column(Integer, ForeignKey("users.id"), unique=True)
     stripe_subscription_id = Column(String, unique=True)
     status = Column(String)  # active, trialing, past_due, cancelled, etc.
@@ -2,14 +2,18 @@
 Database repository for TubeWise.
 This module provides functions to interact with the database.
 """
-from typing import List, Optional, Dict, Any
+import secrets
+from typing import List, Optional, Dict, Any, Tuple
+from sqlalchemy import delete, func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from datetime import datetime
 
 from db import (
     User, Video, SavedVideo, VideoSummary, KeyPoint, 
-    UsageStats, GeneratedContent, ChatMessage, TimelineSuggestion
+    UsageStats, GeneratedContent, ChatMessage, TimelineSuggestion, Subscription
 )
+from models.usage_tracking import UsageTracking
 
 
 # User repository functions
@@ -23,36 +27,62 @@ def get_user_by_id(db: Session, user_id: int) -> Optional[User]:
     return db.query(User).filter(User.id == user_id).first()
 
 
-async def get_users(db: Session, skip: int = 0, limit: int = 100, search: Optional[str] = None, role: Optional[str] = None) -> List[User]:
-    """Get all users with optional filtering."""
-    query = db.query(User)
+async def get_users(
+    db: AsyncSession,
+    limit: int = 100,
+    search: Optional[str] = None,
+    role: Optional[str] = None,
+    after: Optional[Tuple[datetime, int]] = None
+) -> List[User]:
+    """Get users newest first with optional filtering.
+    
+    Pages are keyset-based: pass the (created_at, id) of the last user of
+    the previous page as ``after`` to get the next one.
+    """
+    query = select(User)
+    
+    if after:
+        query = query.where(tuple_(User.created_at, User.id) < tuple_(*after))
     
     if search:
         search_term = f"%{search}%"
-        query = query.filter(
+        query = query.where(
             (User.name.ilike(search_term)) | 
             (User.email.ilike(search_term))
         )
     
     if role:
-        query = query.filter(User.role == role)
+        query = query.where(User.role == role)
     
-    return query.offset(skip).limit(limit).all()
-
-
-async def count_users(db: Session) -> int:
-    """Count all users."""
-    return db.query(User).count()
+    result = await db.execute(
+        query.order_by(User.created_at.desc(), User.id.desc()).limit(limit)
+    )
+    return result.scalars().all()
 
 
-async def count_users_by_role(db: Session, role: str) -> int:
-    """Count users by role."""
-    return db.query(User).filter(User.role == role).count()
+async def reset_user_password(db: AsyncSession, user_id: int) -> Optional[str]:
+    """Replace a user's password with a random temporary one and return it."""
+    user = await db.get(User, user_id)
+    if not user:
+        return None
+    
+    temp_password = secrets.token_urlsafe(12)
+    user.password = temp_password  # In production, this should be hashed
+    await db.commit()
+    return temp_password
 
 
-async def count_active_users(db: Session, since: datetime) -> int:
-    """Count active users since a specific date."""
-    return db.query(User).filter(User.last_active >= since).count()
+async def delete_user(db: AsyncSession, user_id: int) -> bool:
+    """Delete a user and the rows that reference them."""
+    message_ids = select(ChatMessage.id).where(ChatMessage.user_id == user_id)
+    await db.execute(
+        delete(TimelineSuggestion).where(TimelineSuggestion.chat_message_id.in_(message_ids))
+    )
+    for model in (SavedVideo, UsageStats, GeneratedContent, ChatMessage, Subscription):
+        await db.execute(delete(model).where(model.user_id == user_id))
+    result = await db.execute(delete(User).where(User.id == user_id))
+    await db.commit()
+    return result.rowcount > 0
 
 
 def create_user(db: Session, email: str, name: str, password: str, role: str = "user") -> User:
@@ -308,7 +338,7 @@ def get_timeline_suggestions_by_chat_message_id(db: Session, chat_message_id: in
 
 # System logs repository functions
 async def get_system_logs(
-    db: Session, 
+    db: AsyncSession, 
     skip: int = 0, 
     limit: int = 100, 
     level: Optional[str] = None,
@@ -361,39 +391,71 @@ async def get_system_logs(
 
 
 # Usage statistics functions
-async def get_user_usage_stats(db: Session, user_id: int) -> Dict[str, int]:
-    """Get usage statistics for a user."""
-    # Get usage stats from database
-    usage_stats = get_usage_stats_by_user_id(db, user_id)
+async def get_user_counts(db: AsyncSession, yesterday: datetime, last_week: datetime) -> Dict[str, int]:
+    """Get the admin dashboard user counts in a single statement."""
+    def active_since(since: datetime):
+        return (
+            select(func.count())
+            .select_from(UsageStats)
+            .where(UsageStats.last_active >= since)
+            .scalar_subquery()
+        )
     
-    if usage_stats:
-        return {
-            "videos_summarized": usage_stats.videos_summarized,
-            "videos_compared": usage_stats.videos_compared,
-            "content_generated": usage_stats.content_generated,
-            "fact_checks": 0  # Add this field to the UsageStats model
-        }
-    else:
-        return {
-            "videos_summarized": 0,
-            "videos_compared": 0,
-            "content_generated": 0,
-            "fact_checks": 0
-        }
+    result = await db.execute(
+        select(
+            func.count().label("total_users"),
+            active_since(yesterday).label("active_users_last_24h"),
+            active_since(last_week).label("active_users_last_7d"),
+            func.count().filter(User.role == "pro").label("pro_users_count"),
+            func.count().filter(User.role == "free").label("free_users_count")
+        ).select_from(User)
+    )
+    return dict(result.one()._mapping)
+
+
+async def get_feature_usage_counts(db: AsyncSession, features: List[str]) -> Dict[str, int]:
+    """Get total usage of each feature in one scan of usage_tracking."""
+    result = await db.execute(
+        select(*[
+            func.coalesce(
+                func.sum(UsageTracking.count).filter(UsageTracking.feature == feature), 0
+            ).label(feature)
+            for feature in features
+        ]).where(UsageTracking.feature.in_(features))
+    )
+    return dict(result.one()._mapping)
 
 
-async def count_feature_usage(db: Session, feature: str) -> int:
-    """Count total usage of a specific feature."""
-    # In a real implementation, this would query the usage_tracking table
-    # For now, we'll return some sample data
-    sample_counts = {
-        "summarize": 150,
-        "compare": 75,
-        "fact_check": 45,
-        "generate": 120
-    }
+async def get_user_usage_stats_bulk(db: AsyncSession, user_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+    """Get usage statistics for many users in one grouped query.
+    
+    Users without a usage_stats row are left out of the result.
+    """
+    if not user_ids:
+        return {}
     
-    return sample_counts.get(feature, 0)
+    result = await db.execute(
+        select(
+            UsageStats.user_id,
+            func.coalesce(func.sum(UsageStats.videos_summarized), 0).label("videos_summarized"),
+            func.coalesce(func.sum(UsageStats.videos_compared), 0).label("videos_compared"),
+            func.coalesce(func.sum(UsageStats.content_generated), 0).label("content_generated"),
+            func.max(UsageStats.last_active).label("last_active")
+        )
+        .where(UsageStats.user_id.in_(user_ids))
+        .group_by(UsageStats.user_id)
+    )
+    
+    return {
+        row.user_id: {
+            "videos_summarized": row.videos_summarized,
+            "videos_compared": row.videos_compared,
+            "content_generated": row.content_generated,
+            "fact_checks": 0,  # Add this field to the UsageStats model
+            "last_active": row.last_active
+        }
+        for row in result
+    }
 
 
 # Generated content repository functions
@@ -2,14 +2,36 @@
 Email service for sending transactional emails using Resend
 """
 import os
-from typing import List, Dict, Any, Optional
+import re
+import time
+import atexit
+import random
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Tuple, Union
 from pydantic import BaseModel
-import resend
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
+# Background send settings
+EMAIL_SEND_WORKERS = int(os.getenv("EMAIL_SEND_WORKERS", "8"))
+EMAIL_MAX_PENDING = int(os.getenv("EMAIL_MAX_PENDING", "256"))
+
+# Resend retry / circuit breaker settings
+EMAIL_MAX_RETRIES = 3
+EMAIL_RETRY_BASE_DELAY = 0.2  # seconds
+EMAIL_RETRY_MAX_DELAY = 2.0  # seconds
+EMAIL_BREAKER_FAIL_MAX = 10
+EMAIL_BREAKER_RESET_TIMEOUT = 30  # seconds
+
+# Pre-built Resend tag payloads for the built-in transactional emails
+_WELCOME_TAGS = [{"name": "welcome"}]
+_PASSWORD_RESET_TAGS = [{"name": "password_reset"}]
+_CREDITS_LOW_TAGS = [{"name": "credits_low"}]
+
 class EmailTemplate(BaseModel):
     """Email template model"""
     name: str
@@ -23,21 +45,210 @@ class EmailAttachment(BaseModel):
     content: str
     content_type: str
 
+class CircuitOpenError(Exception):
+    """Raised when the email circuit breaker is open"""
+
+@lru_cache(maxsize=None)
+def _network_error_types() -> Tuple[type, ...]:
+    """Exception types raised for transient network failures talking to Resend"""
+    error_types = [ConnectionError, TimeoutError]
+    try:
+        import requests
+        error_types += [requests.exceptions.ConnectionError, requests.exceptions.Timeout]
+    except ImportError:
+        pass
+    return tuple(error_types)
+
+def _is_transient_send_error(exc: Exception) -> bool:
+    """
+    Whether a send error is worth retrying: network failures and Resend
+    rate-limit (429) or server (5xx) errors. Validation errors and bugs
+    fail immediately and don't count against the circuit breaker.
+    """
+    if isinstance(exc, _network_error_types()):
+        return True
+    try:
+        from resend.exceptions import ResendError
+    except ImportError:
+        return False
+    if not isinstance(exc, ResendError):
+        return False
+    try:
+        status = int(exc.code)
+    except (TypeError, ValueError):
+        return False
+    return status == 429 or status >= 500
+
+class _CircuitBreaker:
+    """
+    Minimal thread-safe circuit breaker.
+    
+    After ``fail_max`` consecutive failures the circuit opens and calls fail
+    fast until ``reset_timeout`` seconds have passed. A single trial call is
+    then let through (half-open); success closes the circuit, failure
+    re-opens it. Exceptions for which ``is_failure`` returns False are
+    re-raised without counting as failures.
+    """
+    
+    def __init__(self, fail_max: int, reset_timeout: float, is_failure=None):
+        self.fail_max = fail_max
+        self.reset_timeout = reset_timeout
+        self.is_failure = is_failure or (lambda exc: True)
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+    
+    def _before_call(self):
+        with self._lock:
+            if self._opened_at is None:
+                return
+            if self._trial_in_flight or time.monotonic() - self._opened_at < self.reset_timeout:
+                raise CircuitOpenError("Email service circuit is open")
+            self._trial_in_flight = True
+    
+    def _on_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+    
+    def _on_ignored(self):
+        with self._lock:
+            self._trial_in_flight = False
+    
+    def _on_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._opened_at is not None or self._failures >= self.fail_max:
+                self._opened_at = time.monotonic()
+    
+    def call(self, fn, *args, **kwargs):
+        self._before_call()
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as e:
+            if self.is_failure(e):
+                self._on_failure()
+            else:
+                self._on_ignored()
+            raise
+        self._on_success()
+        return result
+
+# Shared <head> used by all HTML templates
+_SHARED_HEAD = """
+<head>
+    <style>
+        body { font-family: Arial, sans-serif; line-height: 1.6; color: #333; }
+        .container { max-width: 600px; margin: 0 auto; padding: 20px; }
+        .header { text-align: center; margin-bottom: 30px; }
+        .logo { max-width: 150px; }
+        .footer { margin-top: 30px; text-align: center; font-size: 12px; color: #999; }
+        .button { display: inline-block; background-color: #722be6; color: white; padding: 12px 24px; text-decoration: none; border-radius: 4px; }
+    </style>
+</head>
+"""
+
+_FOOTER_LINKS = """
+<a href="https://tubewise.app/privacy">Privacy Policy</a> | 
+<a href="https://tubewise.app/terms">Terms of Service</a>
+"""
+
+def _base_html(title: str, body: str, extra_footer_links: str = "") -> str:
+    """
+    Wrap a template body in the shared email layout (head, header, footer)
+    
+    Args:
+        title: Heading shown under the logo
+        body: Template-specific HTML placed between header and footer
+        extra_footer_links: Additional footer links appended after the defaults
+        
+    Returns:
+        Complete HTML document
+    """
+    return (
+        "<html>" + _SHARED_HEAD + """
+<body>
+    <div class="container">
+        <div class="header">
+            <img src="https://tubewise.app/logo.png" alt="TubeWise Logo" class="logo">
+            <h1>""" + title + """</h1>
+        </div>
+        """ + body + """
+        <div class="footer">
+            <p>© 2025 TubeWise. All rights reserved.</p>
+            <p>""" + _FOOTER_LINKS + extra_footer_links + """</p>
+        </div>
+    </div>
+</body>
+</html>
+"""
+    )
+
+_HTML_COMMENT_RE = re.compile(r"<!--.*?-->", re.DOTALL)
+_WHITESPACE_RE = re.compile(r"\s+")
+_INTER_TAG_SPACE_RE = re.compile(r">\s+<")
+_PLACEHOLDER_RE = re.compile(r"\{\{(\w+)\}\}")
+
+def _minify_html(html: str) -> str:
+    """Strip comments and collapse whitespace in an HTML template"""
+    html = _HTML_COMMENT_RE.sub("", html)
+    html = _WHITESPACE_RE.sub(" ", html)
+    html = _INTER_TAG_SPACE_RE.sub("><", html)
+    return html.strip()
+
+@lru_cache(maxsize=64)
+def _split_template(content: str) -> Tuple[str, ...]:
+    """
+    Split a template into alternating literal text and placeholder names,
+    memoized on the template content. Only the templates themselves are
+    cached, never rendered bodies, which can carry tokens such as reset links.
+    
+    Call ``_split_template.cache_clear()`` if templates are ever reloaded.
+    """
+    return tuple(_PLACEHOLDER_RE.split(content))
+
+def _replace_placeholders(content: str, data: Dict[str, Any]) -> str:
+    """Replace placeholders in the template with actual data, leaving unknown ones as-is"""
+    parts = list(_split_template(content))
+    for i in range(1, len(parts), 2):
+        name = parts[i]
+        parts[i] = str(data[name]) if name in data else f"{{{{{name}}}}}"
+    return "".join(parts)
+
+def _render_template(html_content: str, text_content: str, data: Dict[str, Any]) -> Tuple[str, str]:
+    """Render a template's HTML and text bodies"""
+    return _replace_placeholders(html_content, data), _replace_placeholders(text_content, data)
+
 class EmailService:
     """Service for sending transactional emails"""
     
+    # Shared across instances: they all talk to the same Resend account
+    _breaker = _CircuitBreaker(EMAIL_BREAKER_FAIL_MAX, EMAIL_BREAKER_RESET_TIMEOUT, _is_transient_send_error)
+    
     def __init__(self):
         """Initialize the email service"""
         self.api_key = os.getenv("RESEND_API_KEY")
         self.from_email = os.getenv("EMAIL_FROM", "no-reply@tubewise.app")
         self.from_name = os.getenv("EMAIL_FROM_NAME", "TubeWise")
+        self._from_header = f"{self.from_name} <{self.from_email}>"
         
         if not self.api_key:
             print("Warning: RESEND_API_KEY not set. Email service will not work.")
-            self.client = None
-        else:
-            resend.api_key = self.api_key
-            self.client = resend
+        
+        # The resend SDK (and its requests/urllib3 stack) is imported on first send
+        self._client = None
+        self._client_lock = threading.Lock()
+        
+        # Background executor for fire-and-forget sends. The semaphore bounds
+        # the number of queued emails so a slow Resend can't grow memory.
+        self._executor = ThreadPoolExecutor(
+            max_workers=EMAIL_SEND_WORKERS, thread_name_prefix="email-send"
+        )
+        self._pending = threading.BoundedSemaphore(EMAIL_MAX_PENDING)
+        atexit.register(self._executor.shutdown, wait=True)
         
         # Initialize email templates
         self._initialize_templates()
@@ -48,58 +259,32 @@ class EmailService:
             "welcome": EmailTemplate(
                 name="welcome",
                 subject="Welcome to TubeWise!",
-                html_content="""
-                <html>
-                <head>
-                    <style>
-                        body { font-family: Arial, sans-serif; line-height: 1.6; color: #333; }
-                        .container { max-width: 600px; margin: 0 auto; padding: 20px; }
-                        .header { text-align: center; margin-bottom: 30px; }
-                        .logo { max-width: 150px; }
-                        .footer { margin-top: 30px; text-align: center; font-size: 12px; color: #999; }
-                        .button { display: inline-block; background-color: #722be6; color: white; padding: 12px 24px; text-decoration: none; border-radius: 4px; }
-                    </style>
-                </head>
-                <body>
-                    <div class="container">
-                        <div class="header">
-                            <img src="https://tubewise.app/logo.png" alt="TubeWise Logo" class="logo">
-                            <h1>Welcome to TubeWise!</h1>
-                        </div>
-                        
-                        <p>Hello {{name}},</p>
-                        
-                        <p>Thank you for joining TubeWise! We're excited to have you on board.</p>
-                        
-                        <p>With TubeWise, you can:</p>
-                        <ul>
-                            <li>Get AI-powered summaries of YouTube videos with timestamps</li>
-                            <li>Compare multiple videos on the same topic</li>
-                            <li>Fact-check claims in videos</li>
-                            <li>Generate content from video insights</li>
-                        </ul>
-                        
-                        <p>Ready to get started?</p>
-                        
-                        <p style="text-align: center;">
-                            <a href="https://tubewise.app/dashboard" class="button">Go to Dashboard</a>
-                        </p>
-                        
-                        <p>If you have any questions, feel free to reply to this email.</p>
-                        
-                        <p>Best regards,<br>The TubeWise Team</p>
-                        
-                        <div class="footer">
-                            <p>© 2025 TubeWise. All rights reserved.</p>
-                            <p>
-                                <a href="https://tubewise.app/privacy">Privacy Policy</a> | 
-                                <a href="https://tubewise.app/terms">Terms of Service</a>
-                            </p>
-                        </div>
-                    </div>
-                </body>
-                </html>
-                """,
+                html_content=_base_html(
+                    title="Welcome to TubeWise!",
+                    body="""
+                <p>Hello {{name}},</p>
+                
+                <p>Thank you for joining TubeWise! We're excited to have you on board.</p>
+                
+                <p>With TubeWise, you can:</p>
+                <ul>
+                    <li>Get AI-powered summaries of YouTube videos with timestamps</li>
+                    <li>Compare multiple videos on the same topic</li>
+                    <li>Fact-check claims in videos</li>
+                    <li>Generate content from video insights</li>
+                </ul>
+                
+                <p>Ready to get started?</p>
+                
+                <p style="text-align: center;">
+                    <a href="https://tubewise.app/dashboard" class="button">Go to Dashboard</a>
+                </p>
+                
+                <p>If you have any questions, feel free to reply to this email.</p>
+                
+                <p>Best regards,<br>The TubeWise Team</p>
+                """
+                ),
                 text_content="""
                 Welcome to TubeWise!
                 
@@ -128,50 +313,24 @@ class EmailService:
             "password_reset": EmailTemplate(
                 name="password_reset",
                 subject="Reset Your TubeWise Password",
-                html_content="""
-                <html>
-                <head>
-                    <style>
-                        body { font-family: Arial, sans-serif; line-height: 1.6; color: #333; }
-                        .container { max-width: 600px; margin: 0 auto; padding: 20px; }
-                        .header { text-align: center; margin-bottom: 30px; }
-                        .logo { max-width: 150px; }
-                        .footer { margin-top: 30px; text-align: center; font-size: 12px; color: #999; }
-                        .button { display: inline-block; background-color: #722be6; color: white; padding: 12px 24px; text-decoration: none; border-radius: 4px; }
-                    </style>
-                </head>
-                <body>
-                    <div class="container">
-                        <div class="header">
-                            <img src="https://tubewise.app/logo.png" alt="TubeWise Logo" class="logo">
-                            <h1>Reset Your Password</h1>
-                        </div>
-                        
-                        <p>Hello {{name}},</p>
-                        
-                        <p>We received a request to reset your password. Click the button below to create a new password:</p>
-                        
-                        <p style="text-align: center;">
-                            <a href="{{reset_link}}" class="button">Reset Password</a>
-                        </p>
-                        
-                        <p>If you didn't request this, you can safely ignore this email.</p>
-                        
-                        <p>This link will expire in 24 hours.</p>
-                        
-                        <p>Best regards,<br>The TubeWise Team</p>
-                        
-                        <div class="footer">
-                            <p>© 2025 TubeWise. All rights reserved.</p>
-                            <p>
-                                <a href="https://tubewise.app/privacy">Privacy Policy</a> | 
-                                <a href="https://tubewise.app/terms">Terms of Service</a>
-                            </p>
-                        </div>
-                    </div>
-                </body>
-                </html>
-                """,
+                html_content=_base_html(
+                    title="Reset Your Password",
+                    body="""
+                <p>Hello {{name}},</p>
+                
+                <p>We received a request to reset your password. Click the button below to create a new password:</p>
+                
+                <p style="text-align: center;">
+                    <a href="{{reset_link}}" class="button">Reset Password</a>
+                </p>
+                
+                <p>If you didn't request this, you can safely ignore this email.</p>
+                
+                <p>This link will expire in 24 hours.</p>
+                
+                <p>Best regards,<br>The TubeWise Team</p>
+                """
+                ),
                 text_content="""
                 Reset Your TubeWise Password
                 
@@ -196,57 +355,31 @@ class EmailService:
             "credits_low": EmailTemplate(
                 name="credits_low",
                 subject="Your TubeWise Credits Are Running Low",
-                html_content="""
-                <html>
-                <head>
-                    <style>
-                        body { font-family: Arial, sans-serif; line-height: 1.6; color: #333; }
-                        .container { max-width: 600px; margin: 0 auto; padding: 20px; }
-                        .header { text-align: center; margin-bottom: 30px; }
-                        .logo { max-width: 150px; }
-                        .footer { margin-top: 30px; text-align: center; font-size: 12px; color: #999; }
-                        .button { display: inline-block; background-color: #722be6; color: white; padding: 12px 24px; text-decoration: none; border-radius: 4px; }
-                    </style>
-                </head>
-                <body>
-                    <div class="container">
-                        <div class="header">
-                            <img src="https://tubewise.app/logo.png" alt="TubeWise Logo" class="logo">
-                            <h1>Your Credits Are Running Low</h1>
-                        </div>
-                        
-                        <p>Hello {{name}},</p>
-                        
-                        <p>You have only <strong>{{credits_left}} {{feature_name}} credits</strong> remaining this month.</p>
-                        
-                        <p>Upgrade to TubeWise Pro to get:</p>
-                        <ul>
-                            <li>50 fact-check credits per month</li>
-                            <li>Unlimited video summaries</li>
-                            <li>Advanced content generation</li>
-                            <li>And much more!</li>
-                        </ul>
-                        
-                        <p style="text-align: center;">
-                            <a href="https://tubewise.app/upgrade" class="button">Upgrade to Pro</a>
-                        </p>
-                        
-                        <p>If you have any questions, feel free to reply to this email.</p>
-                        
-                        <p>Best regards,<br>The TubeWise Team</p>
-                        
-                        <div class="footer">
-                            <p>© 2025 TubeWise. All rights reserved.</p>
-                            <p>
-                                <a href="https://tubewise.app/privacy">Privacy Policy</a> | 
-                                <a href="https://tubewise.app/terms">Terms of Service</a> |
-                                <a href="https://tubewise.app/unsubscribe?email={{email}}">Unsubscribe</a>
-                            </p>
-                        </div>
-                    </div>
-                </body>
-                </html>
+                html_content=_base_html(
+                    title="Your Credits Are Running Low",
+                    body="""
+                <p>Hello {{name}},</p>
+                
+                <p>You have only <strong>{{credits_left}} {{feature_name}} credits</strong> remaining this month.</p>
+                
+                <p>Upgrade to TubeWise Pro to get:</p>
+                <ul>
+                    <li>50 fact-check credits per month</li>
+                    <li>Unlimited video summaries</li>
+                    <li>Advanced content generation</li>
+                    <li>And much more!</li>
+                </ul>
+                
+                <p style="text-align: center;">
+                    <a href="https://tubewise.app/upgrade" class="button">Upgrade to Pro</a>
+                </p>
+                
+                <p>If you have any questions, feel free to reply to this email.</p>
+                
+                <p>Best regards,<br>The TubeWise Team</p>
                 """,
+                    extra_footer_links=' |\n<a href="https://tubewise.app/unsubscribe?email={{email}}">Unsubscribe</a>'
+                ),
                 text_content="""
                 Your TubeWise Credits Are Running Low
                 
@@ -274,12 +407,16 @@ class EmailService:
                 """
             ),
         }
-    
-    def _replace_placeholders(self, content: str, data: Dict[str, Any]) -> str:
-        """Replace placeholders in the template with actual data"""
-        for key, value in data.items():
-            content = content.replace("{{" + key + "}}", str(value))
-        return content
+        
+        # Minify once here so every send posts a smaller body
+        for template in self.templates.values():
+            template.html_content = _minify_html(template.html_content)
+        
+        # Template-fixed Resend params, copied per send
+        self._base_params = {
+            name: {"from": self._from_header, "subject": template.subject}
+            for name, template in self.templates.items()
+        }
     
     def send_email(
         self,
@@ -290,7 +427,7 @@ class EmailService:
         cc: Optional[List[str]] = None,
         bcc: Optional[List[str]] = None,
         attachments: Optional[List[EmailAttachment]] = None,
-        tags: Optional[List[str]] = None
+        tags: Optional[List[Union[str, Dict[str, str]]]] = None
     ) -> Dict[str, Any]:
         """
         Send an email
@@ -303,23 +440,34 @@ class EmailService:
             cc: CC recipients
             bcc: BCC recipients
             attachments: Email attachments
-            tags: Email tags
+            tags: Email tags, either names or pre-built {"name": ...} dicts
             
         Returns:
             Response from the email service
         """
-        if not self.client:
-            print("Email service not initialized. Cannot send email.")
-            return {"error": "Email service not initialized"}
-        
         params = {
-            "from": f"{self.from_name} <{self.from_email}>",
+            "from": self._from_header,
             "to": to,
             "subject": subject,
             "html": html_content,
             "text": text_content,
         }
         
+        return self._deliver(params, cc, bcc, attachments, tags)
+    
+    def _deliver(
+        self,
+        params: Dict[str, Any],
+        cc: Optional[List[str]] = None,
+        bcc: Optional[List[str]] = None,
+        attachments: Optional[List[EmailAttachment]] = None,
+        tags: Optional[List[Union[str, Dict[str, str]]]] = None
+    ) -> Dict[str, Any]:
+        """Add optional fields to the Resend params and send them"""
+        if not self.client:
+            print("Email service not initialized. Cannot send email.")
+            return {"error": "Email service not initialized"}
+        
         if cc:
             params["cc"] = cc
         
@@ -337,15 +485,74 @@ class EmailService:
             ]
         
         if tags:
-            params["tags"] = [{"name": tag} for tag in tags]
+            if isinstance(tags[0], dict):
+                params["tags"] = tags
+            else:
+                params["tags"] = [{"name": tag} for tag in tags]
         
         try:
-            response = self.client.emails.send(**params)
+            response = self._breaker.call(self._send_raw, params)
             return response
         except Exception as e:
             print(f"Failed to send email: {e}")
             return {"error": str(e)}
     
+    @property
+    def client(self):
+        """Resend client, imported and configured on first use"""
+        if self._client is None and self.api_key:
+            with self._client_lock:
+                if self._client is None:
+                    import resend
+                    resend.api_key = self.api_key
+                    self._client = resend
+        return self._client
+    
+    def _send_raw(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Send via Resend, retrying transient errors with full-jitter exponential backoff"""
+        for attempt in range(EMAIL_MAX_RETRIES):
+            try:
+                return self.client.emails.send(**params)
+            except Exception as e:
+                if attempt == EMAIL_MAX_RETRIES - 1 or not _is_transient_send_error(e):
+                    raise
+                print(f"Resend error, attempt {attempt+1}/{EMAIL_MAX_RETRIES}: {e}")
+                delay = min(EMAIL_RETRY_MAX_DELAY, EMAIL_RETRY_BASE_DELAY * (2 ** attempt))
+                time.sleep(random.uniform(0, delay))
+    
+    def _submit(self, fn, *args, **kwargs) -> Future:
+        """Submit a send to the background executor, blocking if the queue is full"""
+        self._pending.acquire()
+        try:
+            future = self._executor.submit(fn, *args, **kwargs)
+        except Exception:
+            self._pending.release()
+            raise
+        future.add_done_callback(lambda _: self._pending.release())
+        return future
+    
+    def send_email_async(self, *args, **kwargs) -> Future:
+        """
+        Send an email on a background thread
+        
+        Accepts the same arguments as send_email.
+        
+        Returns:
+            Future resolving to the response from the email service
+        """
+        return self._submit(self.send_email, *args, **kwargs)
+    
+    def send_template_email_async(self, *args, **kwargs) -> Future:
+        """
+        Send a template email on a background thread
+        
+        Accepts the same arguments as send_template_email.
+        
+        Returns:
+            Future resolving to the response from the email service
+        """
+        return self._submit(self.send_template_email, *args, **kwargs)
+    
     def send_template_email(
         self,
         template_name: str,
@@ -354,7 +561,7 @@ class EmailService:
         cc: Optional[List[str]] = None,
         bcc: Optional[List[str]] = None,
         attachments: Optional[List[EmailAttachment]] = None,
-        tags: Optional[List[str]] = None
+        tags: Optional[List[Union[str, Dict[str, str]]]] = None
     ) -> Dict[str, Any]:
         """
         Send an email using a template
@@ -377,19 +584,16 @@ class EmailService:
         
         template = self.templates[template_name]
         
-        html_content = self._replace_placeholders(template.html_content, data)
-        text_content = self._replace_placeholders(template.text_content, data)
-        
-        return self.send_email(
-            to=to,
-            subject=template.subject,
-            html_content=html_content,
-            text_content=text_content,
-            cc=cc,
-            bcc=bcc,
-            attachments=attachments,
-            tags=tags
+        html_content, text_content = _render_template(
+            template.html_content, template.text_content, data
         )
+        
+        params = self._base_params[template_name].copy()
+        params["to"] = to
+        params["html"] = html_content
+        params["text"] = text_content
+        
+        return self._deliver(params, cc, bcc, attachments, tags)
     
     def send_welcome_email(self, to: str, name: str) -> Dict[str, Any]:
         """
@@ -406,7 +610,7 @@ class EmailService:
             template_name="welcome",
             to=to,
             data={"name": name},
-            tags=["welcome"]
+            tags=_WELCOME_TAGS
         )
     
     def send_password_reset_email(self, to: str, name: str, reset_link: str) -> Dict[str, Any]:
@@ -425,7 +629,7 @@ class EmailService:
             template_name="password_reset",
             to=to,
             data={"name": name, "reset_link": reset_link},
-            tags=["password_reset"]
+            tags=_PASSWORD_RESET_TAGS
         )
     
     def send_credits_low_email(self, to: str, name: str, email: str, credits_left: int, feature_name: str) -> Dict[str, Any]:
@@ -451,7 +655,7 @@ class EmailService:
                 "credits_left": credits_left,
                 "feature_name": feature_name
             },
-            tags=["credits_low"]
+            tags=_CREDITS_LOW_TAGS
         )
 
 # Create a singleton instance
@@ -1,27 +1,128 @@
 from enum import Enum
 from typing import Dict, Any, Optional, List, Union
 import logging
-import traceback
-import json
+import queue
+import atexit
+import threading
+from logging.handlers import QueueHandler, QueueListener
 import time
+import traceback
 from datetime import datetime
+from functools import lru_cache
+import orjson
 from fastapi import Request, Response
 from fastapi.responses import JSONResponse
 from starlette.middleware.base import BaseHTTPMiddleware
-import uuid
+import os
+
+from services.error_log_service import error_log_service
+
+LOG_FILE = os.getenv("TUBEWISE_LOG_FILE")
+LOG_BUFFER_SIZE = 128 * 1024  # bytes
+LOG_FLUSH_INTERVAL = 0.5  # seconds
+ERROR_LOG_DB_LEVEL = logging.ERROR  # errors at or above this level are also stored in error_logs
+
+class BufferedFileHandler(logging.FileHandler):
+    """
+    FileHandler that coalesces records in a large write buffer instead of
+    flushing after every record. The buffer is flushed on CRITICAL records,
+    every ``flush_interval`` seconds by a daemon thread, and on close.
+    """
+    
+    def __init__(
+        self,
+        filename: str,
+        mode: str = "a",
+        encoding: Optional[str] = None,
+        buffer_size: int = LOG_BUFFER_SIZE,
+        flush_interval: float = LOG_FLUSH_INTERVAL,
+    ):
+        self.buffer_size = buffer_size
+        super().__init__(filename, mode, encoding)
+        self._stop_flusher = threading.Event()
+        self._flusher = threading.Thread(
+            target=self._flush_periodically,
+            args=(flush_interval,),
+            name="log-flusher",
+            daemon=True,
+        )
+        self._flusher.start()
+    
+    def _open(self):
+        return open(
+            self.baseFilename,
+            self.mode,
+            buffering=self.buffer_size,
+            encoding=self.encoding,
+            errors=self.errors,
+        )
+    
+    def _flush_periodically(self, interval: float):
+        while not self._stop_flusher.wait(interval):
+            self.flush()
+    
+    def emit(self, record: logging.LogRecord):
+        if self.stream is None:
+            self.stream = self._open()
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+            if record.levelno >= logging.CRITICAL:
+                self.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+    
+    def close(self):
+        self._stop_flusher.set()
+        super().close()
 
 # Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler("app_errors.log")
-    ]
-)
+def _configure_logging() -> Optional[QueueListener]:
+    """
+    Route root logging through a queue so request handlers never block on
+    console/file writes; a background QueueListener thread does the I/O.
+    
+    Like logging.basicConfig, this does nothing if the root logger already
+    has handlers.
+    """
+    root = logging.getLogger()
+    if root.handlers:
+        return None
+    
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    handlers = [logging.StreamHandler()]
+    
+    # Under Docker/systemd/Kubernetes stdout is already captured, so the log
+    # file is opt-in (e.g. TUBEWISE_LOG_FILE=app_errors.log for local runs)
+    if LOG_FILE:
+        handlers.append(BufferedFileHandler(LOG_FILE))
+    
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    
+    log_queue = queue.Queue(-1)
+    root.addHandler(QueueHandler(log_queue))
+    root.setLevel(logging.INFO)
+    
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
+
+log_listener = _configure_logging()
 
 logger = logging.getLogger("error_handler")
 
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_NAIVE_UTC | orjson.OPT_SERIALIZE_NUMPY
+
+class ORJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson, which encodes straight to bytes"""
+    media_type = "application/json"
+    
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=ORJSON_OPTIONS)
+
 # Error types
 class ErrorType(str, Enum):
     VALIDATION = "validation_error"
@@ -42,7 +143,8 @@ class ErrorSeverity(str, Enum):
     ERROR = "error"
     CRITICAL = "critical"
 
-# Standard error response
+# Standard error response (ErrorHandler builds the equivalent dict directly;
+# this class is kept for callers that pass error objects around)
 class ErrorResponse:
     def __init__(
         self,
@@ -55,9 +157,10 @@ class ErrorResponse:
         timestamp: Optional[datetime] = None,
         path: Optional[str] = None,
     ):
-        self.error_type = error_type
+        # Store the plain string values so serialization skips enum handling
+        self.error_type = error_type.value if isinstance(error_type, ErrorType) else error_type
         self.message = message
-        self.severity = severity
+        self.severity = severity.value if isinstance(severity, ErrorSeverity) else severity
         self.code = code
         self.details = details or {}
         self.request_id = request_id
@@ -72,12 +175,48 @@ class ErrorResponse:
             "code": self.code,
             "details": self.details,
             "request_id": self.request_id,
-            "timestamp": self.timestamp.isoformat(),
+            # Left as a datetime; orjson encodes it natively (RFC 3339, UTC)
+            "timestamp": self.timestamp,
             "path": self.path
         }
     
     def to_json(self) -> str:
-        return json.dumps(self.to_dict())
+        return orjson.dumps(self.to_dict(), option=ORJSON_OPTIONS).decode()
+
+# Fixed fields of the built-in error responses; only the per-request fields vary.
+# Enum members are stored as their plain string values.
+_VALIDATION_TEMPLATE = {"error_type": ErrorType.VALIDATION.value, "severity": ErrorSeverity.WARNING.value, "code": "VALIDATION_ERROR"}
+_AUTHENTICATION_TEMPLATE = {"error_type": ErrorType.AUTHENTICATION.value, "severity": ErrorSeverity.WARNING.value, "code": "AUTHENTICATION_ERROR"}
+_AUTHORIZATION_TEMPLATE = {"error_type": ErrorType.AUTHORIZATION.value, "severity": ErrorSeverity.WARNING.value, "code": "AUTHORIZATION_ERROR"}
+_NOT_FOUND_TEMPLATE = {"error_type": ErrorType.RESOURCE_NOT_FOUND.value, "severity": ErrorSeverity.WARNING.value, "code": "RESOURCE_NOT_FOUND"}
+_RATE_LIMIT_TEMPLATE = {"error_type": ErrorType.RATE_LIMIT.value, "severity": ErrorSeverity.WARNING.value, "code": "RATE_LIMIT_ERROR"}
+_DEPENDENCY_TEMPLATE = {"error_type": ErrorType.DEPENDENCY.value, "severity": ErrorSeverity.ERROR.value, "code": "DEPENDENCY_ERROR"}
+_INTERNAL_TEMPLATE = {"error_type": ErrorType.INTERNAL.value, "severity": ErrorSeverity.ERROR.value, "code": "INTERNAL_ERROR"}
+_BUSINESS_LOGIC_TEMPLATE = {"error_type": ErrorType.BUSINESS_LOGIC.value, "severity": ErrorSeverity.WARNING.value, "code": "BUSINESS_LOGIC_ERROR"}
+_UNEXPECTED_TEMPLATE = {"error_type": ErrorType.UNEXPECTED.value, "severity": ErrorSeverity.CRITICAL.value, "code": "UNEXPECTED_ERROR"}
+
+# Templates whose responses are served from pre-encoded bytes (auth/rate-limit storms)
+_POOLED_TEMPLATES = {
+    401: _AUTHENTICATION_TEMPLATE,
+    429: _RATE_LIMIT_TEMPLATE,
+}
+
+@lru_cache(maxsize=256)
+def _pooled_error_prefix(status_code: int, message: str) -> bytes:
+    """
+    Pre-encode everything in a pooled error payload except the per-request
+    fields, as an unterminated JSON object ready for those to be appended.
+    """
+    constant = {**_POOLED_TEMPLATES[status_code], "message": message, "details": {}}
+    return orjson.dumps(constant, option=ORJSON_OPTIONS)[:-1] + b","
+
+# Logging level and message prefix for each severity
+_SEVERITY_LOG_LEVELS = {
+    ErrorSeverity.CRITICAL: (logging.CRITICAL, "CRITICAL ERROR"),
+    ErrorSeverity.ERROR: (logging.ERROR, "ERROR"),
+    ErrorSeverity.WARNING: (logging.WARNING, "WARNING"),
+}
+_DEFAULT_LOG_LEVEL = (logging.INFO, "INFO")
 
 # Error handler class
 class ErrorHandler:
@@ -86,24 +225,94 @@ class ErrorHandler:
     
     def log_error(self, error: ErrorResponse, exc_info=None):
         """Log error to file and console"""
-        log_data = error.to_dict()
+        self._log_payload(error.to_dict(), exc_info)
+    
+    def _log_payload(self, payload: Dict[str, Any], exc_info=None):
+        """Log an error response payload to file and console"""
+        level, prefix = _SEVERITY_LOG_LEVELS.get(payload["severity"], _DEFAULT_LOG_LEVEL)
+        
+        # Hand serious errors to the batched error_logs writer; this only
+        # queues the row and never waits on the database
+        if level >= ERROR_LOG_DB_LEVEL:
+            error_log_service.queue_error_log(
+                error_type=payload["error_type"],
+                message=payload["message"],
+                severity=payload["severity"],
+                code=payload.get("code"),
+                request_id=payload.get("request_id"),
+                path=payload.get("path"),
+                details=payload.get("details"),
+                stack_trace="".join(traceback.format_exception(*exc_info)) if exc_info else None
+            )
+        
+        # Skip building the log record entirely if this level is filtered out
+        if not self.logger.isEnabledFor(level):
+            return
+        
+        log_data = dict(payload)
+        message = log_data.pop('message')
         
         # Rename 'message' key to prevent conflict with logging's internal 'message' field
-        if 'message' in log_data:
-            log_data['error_message'] = log_data.pop('message')
+        log_data['error_message'] = message
+        
+        # Tracebacks are only logged for ERROR and CRITICAL; logging formats
+        # them lazily from exc_info, and only if a handler emits the record
+        if level < logging.ERROR:
+            exc_info = None
+        
+        self.logger.log(level, f"{prefix}: {message}", extra=log_data, exc_info=exc_info)
+    
+    def _respond(
+        self,
+        template: Dict[str, Any],
+        status_code: int,
+        message: str,
+        details: Optional[Dict[str, Any]] = None,
+        request_id: Optional[str] = None,
+        path: Optional[str] = None,
+        exc_info=None
+    ) -> ORJSONResponse:
+        """Fill a precomputed error template with the per-request fields, log it and respond"""
+        payload = {
+            **template,
+            "message": message,
+            "details": details or {},
+            "request_id": request_id,
+            "timestamp": datetime.utcnow(),
+            "path": path
+        }
+        
+        self._log_payload(payload, exc_info)
+        
+        return ORJSONResponse(status_code=status_code, content=payload)
+    
+    def _respond_pooled(
+        self,
+        status_code: int,
+        message: str,
+        request_id: Optional[str] = None,
+        path: Optional[str] = None
+    ) -> Response:
+        """
+        Respond with a pooled error payload, encoding only the per-request
+        fields. Produces the same JSON as _respond with no details.
+        """
+        variable = {
+            "request_id": request_id,
+            "timestamp": datetime.utcnow(),
+            "path": path
+        }
         
-        if exc_info:
-            log_data["traceback"] = traceback.format_exception(*exc_info)
+        if self.logger.isEnabledFor(logging.WARNING):
+            self._log_payload({
+                **_POOLED_TEMPLATES[status_code],
+                "message": message,
+                "details": {},
+                **variable
+            })
         
-        # Log based on severity
-        if error.severity == ErrorSeverity.CRITICAL:
-            self.logger.critical(f"CRITICAL ERROR: {error.message}", extra=log_data, exc_info=exc_info)
-        elif error.severity == ErrorSeverity.ERROR:
-            self.logger.error(f"ERROR: {error.message}", extra=log_data, exc_info=exc_info)
-        elif error.severity == ErrorSeverity.WARNING:
-            self.logger.warning(f"WARNING: {error.message}", extra=log_data)
-        else:
-            self.logger.info(f"INFO: {error.message}", extra=log_data)
+        body = _pooled_error_prefix(status_code, message) + orjson.dumps(variable, option=ORJSON_OPTIONS)[1:]
+        return Response(content=body, status_code=status_code, media_type="application/json")
     
     def create_error_response(
         self,
@@ -116,25 +325,27 @@ class ErrorHandler:
         path: Optional[str] = None,
         status_code: int = 500,
         exc_info=None
-    ) -> JSONResponse:
+    ) -> ORJSONResponse:
         """Create a standardized error response"""
-        error = ErrorResponse(
-            error_type=error_type,
-            message=message,
-            severity=severity,
-            code=code,
-            details=details,
-            request_id=request_id,
-            path=path
-        )
+        # Same shape as ErrorResponse.to_dict(), built without the intermediate object
+        payload = {
+            "error_type": error_type.value if isinstance(error_type, ErrorType) else error_type,
+            "message": message,
+            "severity": severity.value if isinstance(severity, ErrorSeverity) else severity,
+            "code": code,
+            "details": details or {},
+            "request_id": request_id,
+            "timestamp": datetime.utcnow(),
+            "path": path
+        }
         
         # Log the error
-        self.log_error(error, exc_info)
+        self._log_payload(payload, exc_info)
         
         # Return JSON response
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=status_code,
-            content=error.to_dict()
+            content=payload
         )
     
     def validation_error(
@@ -143,17 +354,15 @@ class ErrorHandler:
         details: Optional[Dict[str, Any]] = None, 
         request_id: Optional[str] = None,
         path: Optional[str] = None
-    ) -> JSONResponse:
+    ) -> ORJSONResponse:
         """Handle validation errors"""
-        return self.create_error_response(
-            error_type=ErrorType.VALIDATION,
+        return self._respond(
+            template=_VALIDATION_TEMPLATE,
+            status_code=400,
             message=message,
-            severity=ErrorSeverity.WARNING,
-            code="VALIDATION_ERROR",
             details=details,
             request_id=request_id,
-            path=path,
-            status_code=400
+            path=path
         )
     
     def authentication_error(
@@ -162,17 +371,18 @@ class ErrorHandler:
         details: Optional[Dict[str, Any]] = None,
         request_id: Optional[str] = None,
         path: Optional[str] = None
-    ) -> JSONResponse:
+    ) -> Response:
         """Handle authentication errors"""
-        return self.create_error_response(
-            error_type=ErrorType.AUTHENTICATION,
+        if details is None and isinstance(message, str):
+            return self._respond_pooled(401, message, request_id, path)
+        
+        return self._respond(
+            template=_AUTHENTICATION_TEMPLATE,
+            status_code=401,
             message=message,
-            severity=ErrorSeverity.WARNING,
-            code="AUTHENTICATION_ERROR",
             details=details,
             request_id=request_id,
-            path=path,
-            status_code=401
+            path=path
         )
     
     def authorization_error(
@@ -181,17 +391,15 @@ class ErrorHandler:
         details: Optional[Dict[str, Any]] = None,
         request_id: Optional[str] = None,
         path: Optional[str] = None
-    ) -> JSONResponse:
+    ) -> ORJSONResponse:
         """Handle authorization errors"""
-        return self.create_error_response(
-            error_type=ErrorType.AUTHORIZATION,
+        return self._respond(
+            template=_AUTHORIZATION_TEMPLATE,
+            status_code=403,
             message=message,
-            severity=ErrorSeverity.WARNING,
-            code="AUTHORIZATION_ERROR",
             details=details,
             request_id=request_id,
-            path=path,
-            status_code=403
+            path=path
         )
     
     def not_found_error(
@@ -200,17 +408,15 @@ class ErrorHandler:
         details: Optional[Dict[str, Any]] = None,
         request_id: Optional[str] = None,
         path: Optional[str] = None
-    ) -> JSONResponse:
+    ) -> ORJSONResponse:
         """Handle not found errors"""
-        return self.create_error_response(
-            error_type=ErrorType.RESOURCE_NOT_FOUND,
+        return self._respond(
+            template=_NOT_FOUND_TEMPLATE,
+            status_code=404,
             message=message,
-            severity=ErrorSeverity.WARNING,
-            code="RESOURCE_NOT_FOUND",
             details=details,
             request_id=request_id,
-            path=path,
-            status_code=404
+            path=path
         )
     
     def rate_limit_error(
@@ -219,17 +425,18 @@ class ErrorHandler:
         details: Optional[Dict[str, Any]] = None,
         request_id: Optional[str] = None,
         path: Optional[str] = None
-    ) -> JSONResponse:
+    ) -> Response:
         """Handle rate limit errors"""
-        return self.create_error_response(
-            error_type=ErrorType.RATE_LIMIT,
+        if details is None and isinstance(message, str):
+            return self._respond_pooled(429, message, request_id, path)
+        
+        return self._respond(
+            template=_RATE_LIMIT_TEMPLATE,
+            status_code=429,
             message=message,
-            severity=ErrorSeverity.WARNING,
-            code="RATE_LIMIT_ERROR",
             details=details,
             request_id=request_id,
-            path=path,
-            status_code=429
+            path=path
         )
     
     def dependency_error(
@@ -239,17 +446,15 @@ class ErrorHandler:
         request_id: Optional[str] = None,
         path: Optional[str] = None,
         exc_info=None
-    ) -> JSONResponse:
+    ) -> ORJSONResponse:
         """Handle dependency errors (e.g. database, cache)"""
-        return self.create_error_response(
-            error_type=ErrorType.DEPENDENCY,
+        return self._respond(
+            template=_DEPENDENCY_TEMPLATE,
+            status_code=500,
             message=message,
-            severity=ErrorSeverity.ERROR,
-            code="DEPENDENCY_ERROR",
             details=details,
             request_id=request_id,
             path=path,
-            status_code=500,
             exc_info=exc_info
         )
     
@@ -261,7 +466,7 @@ class ErrorHandler:
         request_id: Optional[str] = None,
         path: Optional[str] = None,
         exc_info=None
-    ) -> JSONResponse:
+    ) -> ORJSONResponse:
         """Handle external service errors (e.g. YouTube API, LLM API)"""
         if details is None:
             details = {}
@@ -287,17 +492,15 @@ class ErrorHandler:
         request_id: Optional[str] = None,
         path: Optional[str] = None,
         exc_info=None
-    ) -> JSONResponse:
+    ) -> ORJSONResponse:
         """Handle internal server errors"""
-        return self.create_error_response(
-            error_type=ErrorType.INTERNAL,
+        return self._respond(
+            template=_INTERNAL_TEMPLATE,
+            status_code=500,
             message=message,
-            severity=ErrorSeverity.ERROR,
-            code="INTERNAL_ERROR",
             details=details,
             request_id=request_id,
             path=path,
-            status_code=500,
             exc_info=exc_info
         )
     
@@ -306,17 +509,15 @@ class ErrorHandler:
         exception: Exception,
         request_id: Optional[str] = None,
         path: Optional[str] = None
-    ) -> JSONResponse:
+    ) -> ORJSONResponse:
         """Handle unexpected errors"""
-        return self.create_error_response(
-            error_type=ErrorType.UNEXPECTED,
+        return self._respond(
+            template=_UNEXPECTED_TEMPLATE,
+            status_code=500,
             message="An unexpected error occurred",
-            severity=ErrorSeverity.CRITICAL,
-            code="UNEXPECTED_ERROR",
             details={"error_class": exception.__class__.__name__},
             request_id=request_id,
             path=path,
-            status_code=500,
             exc_info=(type(exception), exception, exception.__traceback__)
         )
     
@@ -326,48 +527,54 @@ class ErrorHandler:
         details: Optional[Dict[str, Any]] = None,
         request_id: Optional[str] = None,
         path: Optional[str] = None
-    ) -> JSONResponse:
+    ) -> ORJSONResponse:
         """Handle business logic errors"""
-        return self.create_error_response(
-            error_type=ErrorType.BUSINESS_LOGIC,
+        return self._respond(
+            template=_BUSINESS_LOGIC_TEMPLATE,
+            status_code=400,
             message=message,
-            severity=ErrorSeverity.WARNING,
-            code="BUSINESS_LOGIC_ERROR",
             details=details,
             request_id=request_id,
-            path=path,
-            status_code=400
+            path=path
         )
 
 # Create a singleton instance
 error_handler = ErrorHandler()
 
+# HTTPException status codes that map onto a dedicated error handler
+_STATUS_DISPATCH = {
+    401: error_handler.authentication_error,
+    403: error_handler.authorization_error,
+    404: error_handler.not_found_error,
+    429: error_handler.rate_limit_error,
+}
+
 # Middleware for request/response logging and error handling
 class ErrorHandlingMiddleware(BaseHTTPMiddleware):
     async def dispatch(self, request: Request, call_next):
         # Generate request ID
-        request_id = str(uuid.uuid4())
+        request_id = os.urandom(8).hex()
         request.state.request_id = request_id
         
         # Add request ID to response headers
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         
         try:
             # Process the request and get the response
             response = await call_next(request)
             
-            # Calculate processing time
-            process_time = time.time() - start_time
+            # Calculate processing time (whole milliseconds)
+            process_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
             
             # Add custom headers to the response
             response.headers["X-Request-ID"] = request_id
-            response.headers["X-Process-Time"] = str(process_time)
+            response.headers["X-Process-Time"] = str(process_ms)
             
             return response
             
         except Exception as exc:
             # Handle any unhandled exceptions
-            process_time = time.time() - start_time
+            process_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
             
             # Create error response
             error_response = error_handler.unexpected_error(
@@ -378,7 +585,7 @@ class ErrorHandlingMiddleware(BaseHTTPMiddleware):
             
             # Add custom headers to the error response
             error_response.headers["X-Request-ID"] = request_id
-            error_response.headers["X-Process-Time"] = str(process_time)
+            error_response.headers["X-Process-Time"] = str(process_ms)
             
             return error_response
 
@@ -392,40 +599,23 @@ def configure_exception_handlers(app):
         """Handle FastAPI HTTP exceptions"""
         request_id = getattr(request.state, "request_id", None)
         
-        if exc.status_code == 401:
-            return error_handler.authentication_error(
-                message=exc.detail,
-                request_id=request_id,
-                path=request.url.path
-            )
-        elif exc.status_code == 403:
-            return error_handler.authorization_error(
-                message=exc.detail,
-                request_id=request_id,
-                path=request.url.path
-            )
-        elif exc.status_code == 404:
-            return error_handler.not_found_error(
+        handler = _STATUS_DISPATCH.get(exc.status_code)
+        if handler is not None:
+            return handler(
                 message=exc.detail,
                 request_id=request_id,
                 path=request.url.path
             )
-        elif exc.status_code == 429:
-            return error_handler.rate_limit_error(
-                message=exc.detail,
-                request_id=request_id,
-                path=request.url.path
-            )
-        else:
-            return error_handler.create_error_response(
-                error_type=ErrorType.INTERNAL,
-                message=exc.detail,
-                severity=ErrorSeverity.ERROR,
-                code=f"HTTP_{exc.status_code}",
-                request_id=request_id,
-                path=request.url.path,
-                status_code=exc.status_code
-            )
+        
+        return error_handler.create_error_response(
+            error_type=ErrorType.INTERNAL,
+            message=exc.detail,
+            severity=ErrorSeverity.ERROR,
+            code=f"HTTP_{exc.status_code}",
+            request_id=request_id,
+            path=request.url.path,
+            status_code=exc.status_code
+        )
     
     @app.exception_handler(RequestValidationError)
     async def validation_exception_handler(request: Request, exc: RequestValidationError):
@@ -1,9 +1,17 @@
 import os
-import json
+import re
+import asyncio
 import httpx
+import orjson
 from typing import List, Dict, Any, Optional
 from pydantic import BaseModel
 
+# Maximum number of concurrent Perplexity requests per fact_check_claims call
+MAX_CONCURRENT_REQUESTS = int(os.getenv("PERPLEXITY_MAX_CONCURRENCY", "8"))
+
+# JSON object inside a ```json or bare ``` markdown code fence
+_CODE_FENCE_JSON_RE = re.compile(r"```(?:json)?\s*(\{.*?\})\s*```", re.S)
+
 class FactCheckResult(BaseModel):
     claim: str
     is_correct: bool
@@ -24,6 +32,19 @@ class PerplexityService:
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
         }
+        
+        # One pooled client for the service's lifetime so connections (and
+        # TLS sessions) are reused across claims and requests
+        self.client = httpx.AsyncClient(
+            timeout=60.0,
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+            headers=self.headers
+        )
+    
+    async def aclose(self):
+        """Close the underlying HTTP client"""
+        await self.client.aclose()
     
     async def fact_check_claim(self, claim: str) -> FactCheckResult:
         """
@@ -62,47 +83,39 @@ class PerplexityService:
             "max_tokens": 2048
         }
         
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            response = await client.post(
-                self.api_url,
-                headers=self.headers,
-                json=payload
-            )
-            
-            if response.status_code != 200:
-                raise Exception(f"Perplexity API error: {response.text}")
+        response = await self.client.post(self.api_url, json=payload)
+        
+        if response.status_code != 200:
+            raise Exception(f"Perplexity API error: {response.text}")
+        
+        result = orjson.loads(response.content)
+        content = result["choices"][0]["message"]["content"]
+        
+        # Extract JSON from the response
+        try:
+            # Find JSON in the response (it might be wrapped in markdown code blocks)
+            match = _CODE_FENCE_JSON_RE.search(content)
+            json_str = match.group(1) if match else content
             
-            result = response.json()
-            content = result["choices"][0]["message"]["content"]
+            fact_check_data = orjson.loads(json_str)
             
-            # Extract JSON from the response
-            try:
-                # Find JSON in the response (it might be wrapped in markdown code blocks)
-                json_str = content
-                if "```json" in content:
-                    json_str = content.split("```json")[1].split("```")[0].strip()
-                elif "```" in content:
-                    json_str = content.split("```")[1].split("```")[0].strip()
-                
-                fact_check_data = json.loads(json_str)
-                
-                # Create and return FactCheckResult
-                return FactCheckResult(
-                    claim=claim,
-                    is_correct=fact_check_data.get("is_correct", False),
-                    confidence=fact_check_data.get("confidence", 0.0),
-                    explanation=fact_check_data.get("explanation", "No explanation provided"),
-                    sources=fact_check_data.get("sources", [])
-                )
-            except Exception as e:
-                # If JSON parsing fails, try to extract information manually
-                return FactCheckResult(
-                    claim=claim,
-                    is_correct=False,
-                    confidence=0.0,
-                    explanation=f"Error parsing response: {str(e)}",
-                    sources=[]
-                )
+            # Create and return FactCheckResult
+            return FactCheckResult(
+                claim=claim,
+                is_correct=fact_check_data.get("is_correct", False),
+                confidence=fact_check_data.get("confidence", 0.0),
+                explanation=fact_check_data.get("explanation", "No explanation provided"),
+                sources=fact_check_data.get("sources", [])
+            )
+        except Exception as e:
+            # If JSON parsing fails, try to extract information manually
+            return FactCheckResult(
+                claim=claim,
+                is_correct=False,
+                confidence=0.0,
+                explanation=f"Error parsing response: {str(e)}",
+                sources=[]
+            )
     
     async def fact_check_claims(self, claims: List[str]) -> List[FactCheckResult]:
         """
@@ -114,9 +127,11 @@ class PerplexityService:
         Returns:
             List of FactCheckResult objects with the fact-checking results
         """
-        results = []
-        for claim in claims:
-            result = await self.fact_check_claim(claim)
-            results.append(result)
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        
+        async def check(claim: str) -> FactCheckResult:
+            async with semaphore:
+                return await self.fact_check_claim(claim)
         
-        return results
+        # gather preserves input order, so results line up with claims
+        return list(await asyncio.gather(*(check(claim) for claim in claims)))
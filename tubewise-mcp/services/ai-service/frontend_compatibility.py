@@ -3,7 +3,9 @@ Frontend compatibility module for TubeWise AI Service.
 This module adds additional API endpoints to ensure compatibility with the frontend.
 """
 
+import asyncio
 import logging
+from functools import lru_cache
 from fastapi import FastAPI, APIRouter, HTTPException
 from fastapi.responses import JSONResponse
 from typing import List, Dict, Any, Optional
@@ -31,28 +33,9 @@ def get_video_summary(video_id: str):
         )
     
     try:
-        # Import functions from api_server to avoid circular imports
-        from api_server import get_video_info, get_transcript, summarize_text, extract_key_points
-        
-        # Get video info
-        video_info = get_video_info(video_id)
-        
-        # Get transcript
-        transcript = get_transcript(video_id)
-        
-        # Generate summary
-        summary_text = summarize_text(transcript, video_info["title"])
-        
-        # Extract key points
-        key_points = extract_key_points(transcript, summary_text)
-        
-        # Return summary
-        return {
-            "videoId": video_id,
-            "title": video_info["title"],
-            "summary": summary_text,
-            "keyPoints": key_points
-        }
+        return _cached_summary(video_id)
+    except _UncachedSummary as e:
+        return e.response
     except Exception as e:
         logger.error(f"Error generating summary: {str(e)}")
         return JSONResponse(
@@ -60,9 +43,60 @@ def get_video_summary(video_id: str):
             content={"error": f"Error generating summary: {str(e)}"}
         )
 
+class _UncachedSummary(Exception):
+    """Carries a degraded summary response out of _cached_summary without caching it."""
+    
+    def __init__(self, response: Dict[str, Any]):
+        super().__init__("Summary built from fallback data")
+        self.response = response
+
+@lru_cache(maxsize=1024)
+def _cached_summary(video_id: str) -> Dict[str, Any]:
+    """
+    Build the summary response for a video, memoized on video_id.
+    
+    Only genuine results are cached. A response built from the mock
+    transcript, the mock summary or the extractive key point fallback is
+    raised as _UncachedSummary instead (lru_cache doesn't cache exceptions),
+    so the next request tries again.
+    """
+    # Import functions from api_server to avoid circular imports
+    from api_server import (
+        get_video_info, get_transcript, summarize_text, extract_key_points,
+        is_mock_transcript, generate_structured_mock_summary, simple_extract_key_points
+    )
+    
+    # Get video info
+    video_info = get_video_info(video_id)
+    
+    # Get transcript
+    transcript = get_transcript(video_id)
+    
+    # Generate summary
+    summary_text = summarize_text(transcript, video_info["title"])
+    
+    # Extract key points
+    key_points = extract_key_points(transcript, summary_text)
+    
+    response = {
+        "videoId": video_id,
+        "title": video_info["title"],
+        "summary": summary_text,
+        "keyPoints": key_points
+    }
+    
+    if (
+        is_mock_transcript(transcript)
+        or summary_text == generate_structured_mock_summary(video_info["title"])
+        or key_points == simple_extract_key_points(transcript)
+    ):
+        raise _UncachedSummary(response)
+    
+    return response
+
 # Add POST endpoint for comparing videos with URLs
 @router.post("/api/compare")
-def compare_videos_frontend(request: Dict[str, Any]):
+async def compare_videos_frontend(request: Dict[str, Any]):
     """Compare multiple YouTube videos (compatible with frontend)."""
     # Frontend sends full video URLs
     video_urls = request.get("videoUrls", [])
@@ -75,7 +109,7 @@ def compare_videos_frontend(request: Dict[str, Any]):
     
     try:
         # Import functions from api_server to avoid circular imports
-        from api_server import extract_video_id, get_video_info, get_transcript, compare_videos
+        from api_server import extract_video_id, fetch_video_data, compare_videos
         
         # Extract video IDs from URLs
         video_ids = [extract_video_id(url) for url in video_urls]
@@ -87,17 +121,15 @@ def compare_videos_frontend(request: Dict[str, Any]):
                 content={"error": "Could not extract valid video IDs from URLs"}
             )
         
-        # Get video info and transcripts
+        # Get video info and transcripts for all videos concurrently
+        fetched = await asyncio.gather(*(fetch_video_data(vid) for vid in video_ids))
+        
         videos_info = []
         transcripts = []
         
-        for vid in video_ids:
-            # Get video info
-            video_info = get_video_info(vid)
+        for vid, (video_info, transcript) in zip(video_ids, fetched):
             videos_info.append({"id": vid, "title": video_info["title"]})
             
-            # Get transcript
-            transcript = get_transcript(vid)
             if not transcript:
                 return JSONResponse(
                     status_code=404,
@@ -107,7 +139,7 @@ def compare_videos_frontend(request: Dict[str, Any]):
             transcripts.append(transcript)
         
         # Generate comparison
-        comparison_result = compare_videos(video_ids, videos_info, transcripts)
+        comparison_result = await asyncio.to_thread(compare_videos, video_ids, videos_info, transcripts)
         
         # Return comparison result
         return {
@@ -205,7 +237,7 @@ def generate_content_frontend(request: Dict[str, Any]):
 
 # Ensure chat API returns data in the format expected by frontend
 @router.post("/api/chat")
-def chat_with_video_frontend(request: Dict[str, Any]):
+async def chat_with_video_frontend(request: Dict[str, Any]):
     """Chat with a YouTube video (compatible with frontend)."""
     # Support both videoId and video_id formats for better compatibility
     video_id = request.get("videoId") or request.get("video_id")
@@ -230,13 +262,10 @@ def chat_with_video_frontend(request: Dict[str, Any]):
     
     try:
         # Import functions from api_server to avoid circular imports
-        from api_server import get_video_info, get_transcript, generate_chat_response
+        from api_server import fetch_video_data, generate_chat_response
         
-        # Get video info
-        video_info = get_video_info(video_id)
-        
-        # Get transcript
-        transcript = get_transcript(video_id)
+        # Get video info and transcript concurrently
+        video_info, transcript = await fetch_video_data(video_id)
         if not transcript:
             return JSONResponse(
                 status_code=404,
@@ -244,7 +273,9 @@ def chat_with_video_frontend(request: Dict[str, Any]):
             )
         
         # Generate chat response
-        chat_response = generate_chat_response(transcript, message, video_info["title"])
+        chat_response = await asyncio.to_thread(
+            generate_chat_response, transcript, message, video_info["title"]
+        )
         
         # Return response in the format expected by frontend
         return {
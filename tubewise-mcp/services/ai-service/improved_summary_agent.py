@@ -7,14 +7,25 @@ from youtube_transcript_api import YouTubeTranscriptApi
 import re
 import os
 import json
-import requests
+import httpx
 import math
 import time
+import heapq
+import asyncio
+import hashlib
+import random
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from collections import Counter
+from itertools import repeat
 from string import punctuation
 
 # Import OpenAI for high-quality summarization
 import openai
+from openai import AsyncOpenAI
+
+from openai_summarizer import get_client, run_sync
 
 # Import sumy as fallback for text summarization
 from sumy.parsers.plaintext import PlaintextParser
@@ -22,6 +33,7 @@ from sumy.nlp.tokenizers import Tokenizer
 from sumy.summarizers.lex_rank import LexRankSummarizer
 from sumy.nlp.stemmers import Stemmer
 from sumy.utils import get_stop_words
+from sumy.models.dom import ObjectDocumentModel, Paragraph
 
 from dotenv import load_dotenv
 
@@ -35,42 +47,281 @@ openai.api_key = os.getenv("OPENAI_API_KEY", "")
 if not openai.api_key:
     print("WARNING: No OpenAI API key found. Using fallback summarization methods.")
 
+# Use tiktoken for token-accurate truncation and chunking when available
+try:
+    import tiktoken
+    _ENCODING = tiktoken.encoding_for_model("gpt-3.5-turbo-16k")
+except Exception as e:
+    print(f"tiktoken unavailable ({e}), falling back to word/character limits")
+    _ENCODING = None
+
+# Response cache settings for OpenAI and video info lookups
+LLM_CACHE_MAXSIZE = 1000
+LLM_CACHE_TTL = 60 * 60  # 1 hour
+
+# ETags of video info responses are kept longer so expired entries can be
+# revalidated with a conditional request instead of refetched
+VIDEO_INFO_ETAG_TTL = 60 * 60 * 24  # 1 day
+
+# Transcript size limits. Token counts are used when tiktoken is available;
+# otherwise words/characters serve as a rough proxy.
+MAX_TRANSCRIPT_TOKENS = 20000
+MAX_TRANSCRIPT_WORDS = 15000
+MAX_CHUNK_TOKENS = 3500  # Leaves room for the prompt and completion in a 16k context
+MAX_CHUNK_SIZE = 12000  # Characters per chunk without tiktoken
+
+# Part summaries below these limits are joined locally instead of reduced by OpenAI
+REDUCE_SKIP_MAX_CHUNKS = 3
+REDUCE_SKIP_MAX_TOKENS = 800
+
+# Documents with more sentences than this are ranked block-wise by LexRank
+LEXRANK_DIRECT_MAX_SENTENCES = 200
+LEXRANK_BLOCKS = 8
+
+# OpenAI Batch API settings for the offline summarization path
+BATCH_MIN_CHUNKS = 8
+BATCH_POLL_INTERVAL = 30  # seconds
+BATCH_COMPLETION_WINDOW = "24h"
+
+# Precompiled text patterns
+_PUNCT_RE = re.compile(f"[{re.escape(punctuation)}]")
+_SENT_SPLIT_RE = re.compile(r'(?<!\w\.\w.)(?<![A-Z][a-z]\.)(?<=\.|\?|\!)\s')
+_TIMESTAMP_RE = re.compile(r'\[(\d+:?\d*)\]')
+_WORD_RE = re.compile(r'\S+')
+
+# Prompts. System messages are shared dicts and user prompts are
+# str.format templates, so building a request only fills in the variable parts.
+_SUMMARY_SYS_MSG = {"role": "system", "content": "You are an expert video summarizer. Create concise, informative summaries that capture the essence of video content."}
+_REDUCE_SYS_MSG = {"role": "system", "content": "You are an expert at creating comprehensive summaries from partial summaries. Create a coherent, flowing summary that captures the essence of the entire content."}
+_KEYPOINT_SYS_MSG = {"role": "system", "content": "You are an expert at identifying the most important points in video transcripts with their approximate timestamps."}
+_COMBINED_SYS_MSG = {"role": "system", "content": "You are an expert video summarizer. Create concise, informative summaries and identify the most important points with their approximate timestamps. Always answer with a JSON object."}
+
+_SUMMARY_USER_TEMPLATE = """Below is the transcript of a YouTube video titled '{title}'.
+Please provide a comprehensive yet concise summary (200-300 words) that captures the main points and key insights from the entire video.
+Focus on the most important information and ensure the summary gives a complete overview of what the video is about.
+
+TRANSCRIPT:
+{transcript}
+
+SUMMARY:"""
+
+_CHUNK_USER_TEMPLATE = """Below is part {part} of {total} from the transcript of a YouTube video.
+Please provide a brief summary (100-150 words) of THIS PART ONLY, focusing on the main points and key insights.
+
+TRANSCRIPT PART {part}/{total}:
+{chunk}
+
+SUMMARY OF THIS PART:"""
+
+_REDUCE_USER_TEMPLATE = """Below are summaries of different parts of a YouTube video titled '{title}'.
+Please create a comprehensive yet concise final summary (250-300 words) that integrates all these parts into a coherent overview.
+Focus on the most important points and ensure the summary gives a complete picture of the video content.
+
+PART SUMMARIES:
+{summaries}
+
+FINAL COMPREHENSIVE SUMMARY:"""
+
+_KEYPOINT_USER_TEMPLATE = """Below is the transcript of a YouTube video.
+Please identify 5-7 key points or insights from the transcript, and for each one, specify approximately when in the video it appears.
+
+Format your response as a numbered list, with each point having a timestamp and the key insight. For example:
+1. [2:30] The main concept is explained
+2. [5:45] An important example is provided
+
+TRANSCRIPT:
+{transcript}
+
+KEY POINTS WITH TIMESTAMPS:"""
+
+_COMBINED_USER_TEMPLATE = """Below is material from a YouTube video titled '{title}'.
+Return a JSON object with exactly two keys:
+"summary": a comprehensive yet concise summary (200-300 words) of the entire video.
+"keyPoints": a list of 5-7 objects, each with "timestamp" (approximate time in the video, formatted mm:ss) and "point" (the key insight).
+
+{source_label}:
+{source}"""
+
+# Worker pool for blocking lookups
+_background_executor = ThreadPoolExecutor(max_workers=4)
+
+class _TTLCache:
+    """Small thread-safe LRU cache whose entries expire after a fixed TTL."""
+    
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+    
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+# Retry settings for OpenAI calls (exponential backoff with jitter)
+OPENAI_MAX_RETRIES = 5
+OPENAI_RETRY_MAX_DELAY = 30  # seconds
+
+# Only transient failures are retried; auth or request errors fail fast
+_RETRYABLE_OPENAI_ERRORS = (
+    openai.RateLimitError,
+    openai.APIConnectionError,
+    openai.APITimeoutError,
+    openai.InternalServerError,
+)
+
+def _retry_delay(attempt):
+    """Exponential backoff with jitter: ~1s, 2s, 4s, ... capped at OPENAI_RETRY_MAX_DELAY."""
+    return min(2 ** attempt + random.random(), OPENAI_RETRY_MAX_DELAY)
+
+def _count_tokens(text):
+    """Count tokens with tiktoken, or estimate ~4 characters per token without it."""
+    if _ENCODING is not None:
+        return len(_ENCODING.encode(text))
+    return len(text) // 4
+
+def _deduplicate_sentences(text):
+    """Drop sentences that repeat an earlier one (ignoring case and punctuation)."""
+    seen = set()
+    kept = []
+    for sentence in _SENT_SPLIT_RE.split(text):
+        normalized = " ".join(_PUNCT_RE.sub(" ", sentence.lower()).split())
+        if not normalized or normalized in seen:
+            continue
+        seen.add(normalized)
+        kept.append(sentence.strip())
+    return " ".join(kept)
+
+def _chat_cache_key(model, messages, max_tokens, temperature, response_format=None):
+    """Hash a chat completion request into a cache key."""
+    payload = json.dumps(
+        {
+            "model": model,
+            "messages": messages,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            "response_format": response_format,
+        },
+        sort_keys=True
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
 # Define a class for improved summary generation
 class ImprovedSummaryAgent:
     """Agent responsible for generating improved summaries from transcripts."""
     
     def __init__(self, name="ImprovedSummaryAgent"):
         self.name = name
+        self._llm_cache = _TTLCache(LLM_CACHE_MAXSIZE, LLM_CACHE_TTL)
+        self._video_info_cache = _TTLCache(LLM_CACHE_MAXSIZE, LLM_CACHE_TTL)
+        self._video_info_etags = _TTLCache(LLM_CACHE_MAXSIZE, VIDEO_INFO_ETAG_TTL)
+        
+        # Persistent HTTP/2 client so video info lookups reuse one connection
+        self._http = httpx.Client(http2=True, timeout=3.0)
+        self._stop_words = frozenset(get_stop_words("english"))
+        
+        # sumy components are expensive to build (NLTK data, stop word files),
+        # so construct them once and reuse them for every call
+        self._tokenizer = Tokenizer("english")
+        self._stemmer = Stemmer("english")
+        self._summarizer = LexRankSummarizer(self._stemmer)
+        self._summarizer.stop_words = self._stop_words
         print(f"Agent {name} initialized")
     
-    def process(self, data):
-        """Generate summary from transcript."""
+    async def _openai_call_with_retry(self, client, messages, label, validate=None, model="gpt-3.5-turbo-16k", max_tokens=500, temperature=0.5, response_format=None):
+        """Call the chat completions API with caching, validation and retries.
+        
+        Args:
+            client: AsyncOpenAI client
+            messages: Chat messages to send
+            label: Description used in log messages
+            validate: Optional callable turning the response text into a result,
+                or None when the response is unusable and should be retried
+            
+        Returns:
+            The validated result, or None if every attempt failed
+        """
+        key = _chat_cache_key(model, messages, max_tokens, temperature, response_format)
+        cached = self._llm_cache.get(key)
+        if cached is not None:
+            return cached
+        
+        extra = {"response_format": response_format} if response_format else {}
+        for attempt in range(OPENAI_MAX_RETRIES):
+            try:
+                response = await client.chat.completions.create(
+                    model=model,
+                    messages=messages,
+                    max_tokens=max_tokens,
+                    temperature=temperature,
+                    **extra,
+                )
+                content = response.choices[0].message.content.strip()
+                result = validate(content) if validate else content
+                if result:
+                    self._llm_cache.set(key, result)
+                    return result
+                print(f"OpenAI returned unusable {label}, attempt {attempt+1}/{OPENAI_MAX_RETRIES}")
+                
+            except _RETRYABLE_OPENAI_ERRORS as e:
+                print(f"OpenAI API error on {label}, attempt {attempt+1}/{OPENAI_MAX_RETRIES}: {e}")
+                if attempt < OPENAI_MAX_RETRIES - 1:
+                    await asyncio.sleep(_retry_delay(attempt))
+            except Exception as e:
+                print(f"OpenAI API error on {label}, not retrying: {e}")
+                break
+        
+        return None
+    
+    def process(self, data, batch=False):
+        """Generate summary from transcript.
+        
+        Set batch=True for offline/background summarization: long transcripts
+        are then summarized through the OpenAI Batch API.
+        """
         transcript, video_id = data
         try:
-            # Get video info (title, etc.)
-            video_info = self.get_video_info(video_id)
-            video_title = video_info.get("title", "YouTube Video")
+            # Fetch video info (title, etc.) in the background while the
+            # transcript is prepared
+            video_info_future = _background_executor.submit(self.get_video_info, video_id)
             
             # Ensure the transcript isn't too long before processing
             # If it's very long, truncate it for processing to avoid overwhelming the summarizer
-            max_transcript_length = 15000  # Maximum number of words to process
-            words = transcript.split()
-            if len(words) > max_transcript_length:
-                print(f"Transcript is very long ({len(words)} words), truncating for processing")
-                processed_transcript = " ".join(words[:max_transcript_length])
-            else:
-                processed_transcript = transcript
+            processed_transcript = self._truncate_transcript(transcript)
+            
+            # Start the local fallback summary speculatively so an OpenAI failure
+            # doesn't have to wait for it afterwards
+            fallback_future = _background_executor.submit(self.generate_fallback_summary, processed_transcript)
             
-            # Create a high-quality summary of the entire video using OpenAI
-            summary_text = self.generate_openai_summary(processed_transcript, video_title)
+            # Create the summary and timestamped key points in a single OpenAI pass.
+            # The chunk prompts don't use the title, so the lookup is only
+            # waited on before the final prompt
+            result = self.generate_summary_and_keypoints(processed_transcript, video_info_future, batch=batch) or {}
+            video_title = video_info_future.result().get("title", "YouTube Video")
+            summary_text = result.get("summary")
+            key_points = result.get("keyPoints")
             
             # If OpenAI summary fails, use fallback method
             if not summary_text:
                 print("OpenAI summary failed, using fallback method")
-                summary_text = self.generate_fallback_summary(processed_transcript)
-            
-            # Extract key points with timestamps
-            key_points = self.extract_key_points_with_openai(processed_transcript, video_id)
+                summary_text = fallback_future.result()
+            else:
+                fallback_future.cancel()
             
             # If OpenAI key point extraction fails, use fallback method
             if not key_points or len(key_points) < 3:
@@ -88,8 +339,211 @@ class ImprovedSummaryAgent:
             print(f"Error generating summary: {e}")
             raise Exception(f"Failed to generate summary: {str(e)}")
     
+    async def process_stream(self, data):
+        """Async generator version of process for streaming responses.
+        
+        Yields an {"type": "info", ...} event with the video details, the
+        events of stream_openai_summary, and finally a
+        {"type": "keyPoints", "keyPoints": [...]} event.
+        """
+        transcript, video_id = data
+        
+        video_info_future = asyncio.ensure_future(asyncio.to_thread(self.get_video_info, video_id))
+        processed_transcript = self._truncate_transcript(transcript)
+        video_info = await video_info_future
+        video_title = video_info.get("title", "YouTube Video")
+        yield {"type": "info", "videoId": video_id, "title": video_title}
+        
+        async for event in self.stream_openai_summary(processed_transcript, video_title):
+            yield event
+        
+        key_points = await asyncio.to_thread(self.extract_key_points_with_openai, processed_transcript, video_id)
+        if not key_points or len(key_points) < 3:
+            key_points = await asyncio.to_thread(self.extract_key_points_fallback, processed_transcript, video_id)
+        yield {"type": "keyPoints", "keyPoints": key_points}
+    
+    def generate_summary_and_keypoints(self, transcript, video_title="YouTube Video", batch=False):
+        """Generate the summary and timestamped key points with one OpenAI request.
+        
+        video_title may also be a Future of get_video_info(); it is only
+        resolved when the final prompt is built.
+        
+        Returns:
+            Dict with "summary" and "keyPoints" (either may be None), or None
+            if OpenAI is unavailable or the transcript is too short.
+        """
+        return run_sync(self.generate_summary_and_keypoints_async(transcript, video_title, batch))
+    
+    async def generate_summary_and_keypoints_async(self, transcript, video_title="YouTube Video", batch=False):
+        """Async version of generate_summary_and_keypoints.
+        
+        Long transcripts are still summarized chunk by chunk; only the final
+        reduce step is fused so it emits both the summary and the key points.
+        Uses the pooled client, so it must run on the shared summarizer loop
+        (see run_sync).
+        """
+        try:
+            # Check if OpenAI API key is available
+            if not openai.api_key:
+                print("No OpenAI API key available for summarization")
+                return None
+            
+            # Short transcripts are handled by the fallback methods
+            if len(transcript.split()) < 200:
+                return None
+            
+            client = get_client()
+            if self._needs_chunking(transcript):
+                chunks = self._split_into_chunks(transcript)
+                print(f"Split transcript into {len(chunks)} chunks")
+                if batch and len(chunks) >= BATCH_MIN_CHUNKS:
+                    chunk_summaries = await self._summarize_chunks_batch(client, chunks)
+                else:
+                    chunk_summaries = await self._summarize_chunks(client, chunks)
+                source_label = "PART SUMMARIES"
+                source = "\n\n".join([f"Part {i+1}: {summary}" for i, summary in enumerate(chunk_summaries)])
+            else:
+                source_label = "TRANSCRIPT"
+                source = transcript
+            
+            if isinstance(video_title, Future):
+                video_info = await asyncio.wrap_future(video_title)
+                video_title = video_info.get("title", "YouTube Video")
+            
+            def validate(content):
+                result = self._parse_summary_and_keypoints(content)
+                return result if result["summary"] else None
+            
+            result = await self._openai_call_with_retry(
+                client,
+                [
+                    _COMBINED_SYS_MSG,
+                    {"role": "user", "content": _COMBINED_USER_TEMPLATE.format(
+                        title=video_title, source_label=source_label, source=source
+                    )}
+                ],
+                "summary JSON",
+                validate=validate,
+                max_tokens=1000,
+                temperature=0.4,
+                response_format={"type": "json_object"},
+            )
+            if result:
+                return result
+            
+            print("All OpenAI combined summarization attempts failed")
+            return None
+            
+        except Exception as e:
+            print(f"Error in OpenAI combined summarization: {e}")
+            return None
+    
+    def _parse_summary_and_keypoints(self, content):
+        """Parse the JSON returned by the combined summary prompt."""
+        try:
+            data = json.loads(content)
+        except (TypeError, ValueError):
+            return {"summary": None, "keyPoints": None}
+        
+        summary = data.get("summary")
+        if not isinstance(summary, str) or len(summary.strip()) <= 100:
+            summary = None
+        
+        key_points = []
+        for item in data.get("keyPoints") or []:
+            if not isinstance(item, dict):
+                continue
+            timestamp = str(item.get("timestamp", "")).strip("[] ")
+            point = str(item.get("point", "")).strip()
+            if not timestamp or not point:
+                continue
+            # Ensure timestamp is in mm:ss format
+            if ":" not in timestamp:
+                timestamp = f"{timestamp}:00"
+            key_points.append({"timestamp": timestamp, "point": point})
+        
+        return {
+            "summary": summary.strip() if summary else None,
+            "keyPoints": key_points if len(key_points) >= 3 else None
+        }
+    
+    def _truncate_transcript(self, transcript):
+        """Cut a transcript down to MAX_TRANSCRIPT_TOKENS (or MAX_TRANSCRIPT_WORDS without tiktoken)."""
+        if _ENCODING is not None:
+            tokens = _ENCODING.encode(transcript)
+            if len(tokens) > MAX_TRANSCRIPT_TOKENS:
+                print(f"Transcript is very long ({len(tokens)} tokens), truncating for processing")
+                return _ENCODING.decode(tokens[:MAX_TRANSCRIPT_TOKENS])
+            return transcript
+        
+        words = transcript.split()
+        if len(words) > MAX_TRANSCRIPT_WORDS:
+            print(f"Transcript is very long ({len(words)} words), truncating for processing")
+            return " ".join(words[:MAX_TRANSCRIPT_WORDS])
+        return transcript
+    
+    def _can_skip_reduce(self, chunk_summaries):
+        """Whether part summaries are few and short enough to join without a reduce call."""
+        return (
+            len(chunk_summaries) <= REDUCE_SKIP_MAX_CHUNKS
+            and _count_tokens(" ".join(chunk_summaries)) < REDUCE_SKIP_MAX_TOKENS
+        )
+    
+    def _needs_chunking(self, transcript):
+        """Whether a transcript is too large to summarize in a single request."""
+        if _ENCODING is not None:
+            return len(_ENCODING.encode(transcript)) > MAX_CHUNK_TOKENS
+        return len(transcript) > MAX_CHUNK_SIZE
+    
+    def _split_into_chunks(self, transcript):
+        """Split a transcript into chunks of at most MAX_CHUNK_TOKENS tokens.
+        
+        Chunks end on sentence boundaries; a single sentence longer than the
+        limit (common in unpunctuated auto-captions) is cut on token boundaries.
+        Without tiktoken, falls back to MAX_CHUNK_SIZE character chunks.
+        """
+        if _ENCODING is None:
+            return [transcript[i:i+MAX_CHUNK_SIZE] for i in range(0, len(transcript), MAX_CHUNK_SIZE)]
+        
+        chunks = []
+        current = []
+        current_tokens = 0
+        for sentence in _SENT_SPLIT_RE.split(transcript):
+            sentence_tokens = _ENCODING.encode(sentence)
+            
+            if len(sentence_tokens) > MAX_CHUNK_TOKENS:
+                if current:
+                    chunks.append(" ".join(current))
+                    current, current_tokens = [], 0
+                for i in range(0, len(sentence_tokens), MAX_CHUNK_TOKENS):
+                    chunks.append(_ENCODING.decode(sentence_tokens[i:i+MAX_CHUNK_TOKENS]))
+                continue
+            
+            # +1 for the joining space
+            if current and current_tokens + len(sentence_tokens) + 1 > MAX_CHUNK_TOKENS:
+                chunks.append(" ".join(current))
+                current, current_tokens = [], 0
+            current.append(sentence)
+            current_tokens += len(sentence_tokens) + 1
+        
+        if current:
+            chunks.append(" ".join(current))
+        return chunks
+    
     def generate_openai_summary(self, transcript, video_title="YouTube Video"):
-        """Generate a high-quality summary using OpenAI API."""
+        """Generate a high-quality summary using OpenAI API.
+        
+        Synchronous wrapper around generate_openai_summary_async so existing
+        callers keep working.
+        """
+        return run_sync(self.generate_openai_summary_async(transcript, video_title))
+    
+    async def generate_openai_summary_async(self, transcript, video_title="YouTube Video"):
+        """Generate a high-quality summary using OpenAI API, summarizing chunks concurrently.
+        
+        Uses the pooled client, so it must run on the shared summarizer loop
+        (see run_sync).
+        """
         try:
             # Check if OpenAI API key is available
             if not openai.api_key:
@@ -99,159 +553,281 @@ class ImprovedSummaryAgent:
             # If the transcript is very short, just return it
             if len(transcript.split()) < 200:
                 return transcript
-                
-            # For long transcripts, split into chunks and summarize each chunk
-            max_chunk_size = 12000  # Characters per chunk (adjusted to stay within token limits)
             
-            if len(transcript) > max_chunk_size:
-                print(f"Transcript is long ({len(transcript)} chars), splitting into chunks")
-                
-                # Split transcript into chunks
-                chunks = [transcript[i:i+max_chunk_size] for i in range(0, len(transcript), max_chunk_size)]
+            client = get_client()
+            return await self._summarize_with_client(client, transcript, video_title)
+            
+        except Exception as e:
+            print(f"Error in OpenAI summarization: {e}")
+            return None
+    
+    def _chunk_messages(self, i, total, chunk):
+        """Build the chat messages that summarize one transcript chunk."""
+        return [
+            _SUMMARY_SYS_MSG,
+            {"role": "user", "content": _CHUNK_USER_TEMPLATE.format(
+                part=i + 1, total=total, chunk=chunk
+            )}
+        ]
+    
+    async def _summarize_chunks_batch(self, client, chunks):
+        """Summarize chunks through the OpenAI Batch API.
+        
+        Batch jobs are billed at half price but can take a long time, so this is
+        only used for the offline path (process(..., batch=True)). Chunks that
+        the batch does not return fall back to simple_summarize; if the batch
+        itself fails, the regular concurrent map step is used instead.
+        """
+        lines = []
+        for i, chunk in enumerate(chunks):
+            lines.append(json.dumps({
+                "custom_id": f"chunk-{i}",
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": "gpt-3.5-turbo-16k",
+                    "messages": self._chunk_messages(i, len(chunks), chunk),
+                    "max_tokens": 500,
+                    "temperature": 0.5,
+                }
+            }))
+        
+        try:
+            input_file = await client.files.create(
+                file=("chunks.jsonl", "\n".join(lines).encode("utf-8")),
+                purpose="batch"
+            )
+            batch = await client.batches.create(
+                input_file_id=input_file.id,
+                endpoint="/v1/chat/completions",
+                completion_window=BATCH_COMPLETION_WINDOW
+            )
+            print(f"Submitted batch {batch.id} with {len(chunks)} chunks")
+            
+            while batch.status not in ("completed", "failed", "expired", "cancelled"):
+                await asyncio.sleep(BATCH_POLL_INTERVAL)
+                batch = await client.batches.retrieve(batch.id)
+            
+            if batch.status != "completed" or not batch.output_file_id:
+                print(f"Batch {batch.id} ended with status {batch.status}, summarizing chunks directly")
+                return await self._summarize_chunks(client, chunks)
+            
+            output = await client.files.content(batch.output_file_id)
+        except Exception as e:
+            print(f"Batch API error: {e}, summarizing chunks directly")
+            return await self._summarize_chunks(client, chunks)
+        
+        summaries = {}
+        for line in output.text.splitlines():
+            if not line.strip():
+                continue
+            try:
+                item = json.loads(line)
+                content = item["response"]["body"]["choices"][0]["message"]["content"].strip()
+            except (ValueError, KeyError, IndexError, TypeError):
+                continue
+            if len(content) > 50:
+                summaries[item.get("custom_id")] = content
+        
+        chunk_summaries = []
+        for i, chunk in enumerate(chunks):
+            summary = summaries.get(f"chunk-{i}")
+            if summary is None:
+                print(f"Batch returned no usable summary for chunk {i+1}, using fallback")
+                summary = self.simple_summarize(chunk, sentences_count=3)
+            chunk_summaries.append(summary)
+        return chunk_summaries
+    
+    async def _summarize_chunk(self, client, i, chunks):
+        """Summarize one transcript chunk, falling back to simple_summarize."""
+        chunk = chunks[i]
+        print(f"Summarizing chunk {i+1}/{len(chunks)}")
+        
+        chunk_summary = await self._openai_call_with_retry(
+            client,
+            self._chunk_messages(i, len(chunks), chunk),
+            f"summary for chunk {i+1}",
+            validate=lambda content: content if len(content) > 50 else None,
+            max_tokens=500,
+            temperature=0.5,
+        )
+        if chunk_summary:
+            return chunk_summary
+        
+        # If all attempts failed for this chunk, use a placeholder
+        print(f"Failed to get a good summary for chunk {i+1}, using fallback")
+        return self.simple_summarize(chunk, sentences_count=3)
+    
+    async def _summarize_chunks(self, client, chunks):
+        """Summarize every transcript chunk concurrently (the map step)."""
+        results = await asyncio.gather(
+            *(self._summarize_chunk(client, i, chunks) for i in range(len(chunks))),
+            return_exceptions=True
+        )
+        chunk_summaries = [
+            self.simple_summarize(chunk, sentences_count=3) if isinstance(result, Exception) else result
+            for chunk, result in zip(chunks, results)
+        ]
+        return chunk_summaries
+    
+    def _final_summary_messages(self, chunk_summaries, video_title):
+        """Build the chat messages that merge chunk summaries (the reduce step)."""
+        # Now combine all chunk summaries and create a final summary
+        combined_summaries = "\n\n".join([f"Part {i+1}: {summary}" for i, summary in enumerate(chunk_summaries)])
+        
+        # Create a final comprehensive summary from the chunk summaries
+        return [
+            _REDUCE_SYS_MSG,
+            {"role": "user", "content": _REDUCE_USER_TEMPLATE.format(title=video_title, summaries=combined_summaries)}
+        ]
+    
+    def _summary_messages(self, transcript, video_title):
+        """Build the chat messages that summarize a transcript in one call."""
+        return [
+            _SUMMARY_SYS_MSG,
+            {"role": "user", "content": _SUMMARY_USER_TEMPLATE.format(title=video_title, transcript=transcript)}
+        ]
+    
+    async def _stream_chat(self, client, messages, model="gpt-3.5-turbo-16k", max_tokens=500, temperature=0.5, min_length=100):
+        """Stream a chat completion, yielding text deltas as they arrive.
+        
+        Completed responses longer than min_length are stored under the same
+        key as non-streamed calls, and a cached response is yielded in one piece.
+        """
+        key = _chat_cache_key(model, messages, max_tokens, temperature)
+        cached = self._llm_cache.get(key)
+        if cached is not None:
+            yield cached
+            return
+        
+        stream = await client.chat.completions.create(
+            model=model,
+            messages=messages,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            stream=True,
+        )
+        parts = []
+        async for event in stream:
+            if not event.choices:
+                continue
+            delta = event.choices[0].delta.content
+            if delta:
+                parts.append(delta)
+                yield delta
+        
+        content = "".join(parts).strip()
+        if len(content) > min_length:
+            self._llm_cache.set(key, content)
+    
+    async def stream_openai_summary(self, transcript, video_title="YouTube Video"):
+        """Generate the summary incrementally.
+        
+        Yields:
+            {"type": "chunk", "index": i, "summary": ...} as each part of a
+            long transcript is summarized (in completion order), then
+            {"type": "delta", "content": ...} pieces of the final summary
+        """
+        # Without OpenAI, or for very short transcripts, emit the fallback at once
+        if not openai.api_key or len(transcript.split()) < 200:
+            yield {"type": "delta", "content": self.generate_fallback_summary(transcript)}
+            return
+        
+        # Streams run on the caller's event loop, so they can't share the
+        # pooled client bound to the summarizer loop
+        async with AsyncOpenAI(api_key=openai.api_key) as client:
+            if self._needs_chunking(transcript):
+                chunks = self._split_into_chunks(transcript)
                 print(f"Split transcript into {len(chunks)} chunks")
                 
-                # Summarize each chunk
-                chunk_summaries = []
-                for i, chunk in enumerate(chunks):
-                    print(f"Summarizing chunk {i+1}/{len(chunks)}")
-                    
-                    # Prepare the prompt for this chunk
-                    chunk_prompt = f"""Below is part {i+1} of {len(chunks)} from the transcript of a YouTube video titled '{video_title}'.
-                    Please provide a brief summary (100-150 words) of THIS PART ONLY, focusing on the main points and key insights.
-                    
-                    TRANSCRIPT PART {i+1}/{len(chunks)}:
-                    {chunk}
-                    
-                    SUMMARY OF THIS PART:"""
-                    
-                    # Call OpenAI API with retry logic for this chunk
-                    max_retries = 3
-                    chunk_summary = None
-                    
-                    for attempt in range(max_retries):
-                        try:
-                            response = openai.chat.completions.create(
-                                model="gpt-3.5-turbo-16k",
-                                messages=[
-                                    {"role": "system", "content": "You are an expert video summarizer. Create concise, informative summaries that capture the essence of video content."},
-                                    {"role": "user", "content": chunk_prompt}
-                                ],
-                                max_tokens=500,
-                                temperature=0.5,
-                            )
-                            
-                            # Extract the summary from the response
-                            chunk_summary = response.choices[0].message.content.strip()
-                            
-                            # Ensure we got a meaningful summary
-                            if chunk_summary and len(chunk_summary) > 50:
-                                chunk_summaries.append(chunk_summary)
-                                break
-                            else:
-                                print(f"OpenAI returned too short summary for chunk {i+1}, attempt {attempt+1}/{max_retries}")
-                                
-                        except Exception as e:
-                            print(f"OpenAI API error on chunk {i+1}, attempt {attempt+1}/{max_retries}: {e}")
-                            if attempt < max_retries - 1:
-                                time.sleep(2)  # Wait before retrying
-                    
-                    # If all attempts failed for this chunk, add a placeholder
-                    if not chunk_summary or len(chunk_summary) <= 50:
-                        print(f"Failed to get a good summary for chunk {i+1}, using fallback")
-                        fallback_summary = self.simple_summarize(chunk, sentences_count=3)
-                        chunk_summaries.append(fallback_summary)
-                
-                # Now combine all chunk summaries and create a final summary
-                combined_summaries = "\n\n".join([f"Part {i+1}: {summary}" for i, summary in enumerate(chunk_summaries)])
-                
-                # Create a final comprehensive summary from the chunk summaries
-                final_prompt = f"""Below are summaries of different parts of a YouTube video titled '{video_title}'.
-                Please create a comprehensive yet concise final summary (250-300 words) that integrates all these parts into a coherent overview.
-                Focus on the most important points and ensure the summary gives a complete picture of the video content.
-                
-                PART SUMMARIES:
-                {combined_summaries}
-                
-                FINAL COMPREHENSIVE SUMMARY:"""
-                
-                # Call OpenAI API for the final summary
-                max_retries = 3
-                for attempt in range(max_retries):
+                async def indexed_chunk(i):
                     try:
-                        response = openai.chat.completions.create(
-                            model="gpt-3.5-turbo-16k",
-                            messages=[
-                                {"role": "system", "content": "You are an expert at creating comprehensive summaries from partial summaries. Create a coherent, flowing summary that captures the essence of the entire content."},
-                                {"role": "user", "content": final_prompt}
-                            ],
-                            max_tokens=600,
-                            temperature=0.5,
-                        )
-                        
-                        # Extract the final summary
-                        final_summary = response.choices[0].message.content.strip()
-                        
-                        # Ensure we got a meaningful summary
-                        if final_summary and len(final_summary) > 100:
-                            return final_summary
-                        else:
-                            print(f"OpenAI returned too short final summary, attempt {attempt+1}/{max_retries}")
-                            
+                        return i, await self._summarize_chunk(client, i, chunks)
                     except Exception as e:
-                        print(f"OpenAI API error on final summary, attempt {attempt+1}/{max_retries}: {e}")
-                        if attempt < max_retries - 1:
-                            time.sleep(2)  # Wait before retrying
-                
-                # If final summary generation failed, just concatenate the chunk summaries
-                print("Failed to generate final summary, returning concatenated chunk summaries")
-                return " ".join(chunk_summaries)
-                
-            else:
-                # For shorter transcripts, summarize directly
-                # Prepare the prompt for OpenAI
-                prompt = f"""Below is the transcript of a YouTube video titled '{video_title}'. 
-                Please provide a comprehensive yet concise summary (200-300 words) that captures the main points and key insights from the entire video.
-                Focus on the most important information and ensure the summary gives a complete overview of what the video is about.
+                        print(f"Error summarizing chunk {i+1}: {e}")
+                        return i, self.simple_summarize(chunks[i], sentences_count=3)
                 
-                TRANSCRIPT:
-                {transcript}
+                # Hand each part summary to the caller as soon as it is ready
+                chunk_summaries = [None] * len(chunks)
+                for next_done in asyncio.as_completed([indexed_chunk(i) for i in range(len(chunks))]):
+                    i, chunk_summary = await next_done
+                    chunk_summaries[i] = chunk_summary
+                    yield {"type": "chunk", "index": i, "summary": chunk_summary}
                 
-                SUMMARY:"""
+                if self._can_skip_reduce(chunk_summaries):
+                    yield {"type": "delta", "content": _deduplicate_sentences(" ".join(chunk_summaries))}
+                    return
                 
-                # Call OpenAI API with retry logic
-                max_retries = 3
-                for attempt in range(max_retries):
-                    try:
-                        response = openai.chat.completions.create(
-                            model="gpt-3.5-turbo-16k",  # Using a model with larger context window
-                            messages=[
-                                {"role": "system", "content": "You are an expert video summarizer. Create concise, informative summaries that capture the essence of video content."},
-                                {"role": "user", "content": prompt}
-                            ],
-                            max_tokens=500,
-                            temperature=0.5,  # Lower temperature for more focused output
-                        )
-                        
-                        # Extract the summary from the response
-                        summary = response.choices[0].message.content.strip()
-                        
-                        # Ensure we got a meaningful summary
-                        if summary and len(summary) > 100:
-                            return summary
-                        else:
-                            print(f"OpenAI returned too short summary, attempt {attempt+1}/{max_retries}")
-                            
-                    except Exception as e:
-                        print(f"OpenAI API error on attempt {attempt+1}/{max_retries}: {e}")
-                        if attempt < max_retries - 1:
-                            time.sleep(2)  # Wait before retrying
-                            
-                # If we get here, all attempts failed
-                print("All OpenAI summarization attempts failed")
-                return None
-                
-        except Exception as e:
-            print(f"Error in OpenAI summarization: {e}")
+                messages = self._final_summary_messages(chunk_summaries, video_title)
+                max_tokens = 600
+                fallback = " ".join(chunk_summaries)
+            else:
+                messages = self._summary_messages(transcript, video_title)
+                max_tokens = 500
+                fallback = None
+            
+            streamed = False
+            try:
+                async for delta in self._stream_chat(client, messages, max_tokens=max_tokens):
+                    streamed = True
+                    yield {"type": "delta", "content": delta}
+            except Exception as e:
+                print(f"OpenAI streaming error: {e}")
+            
+            if not streamed:
+                print("Streaming summary failed, using fallback")
+                yield {"type": "delta", "content": fallback or self.generate_fallback_summary(transcript)}
+    
+    async def _summarize_with_client(self, client, transcript, video_title):
+        """Run the map-reduce summarization against an AsyncOpenAI client."""
+        # For long transcripts, split into chunks and summarize each chunk
+        if self._needs_chunking(transcript):
+            print(f"Transcript is long ({len(transcript)} chars), splitting into chunks")
+            
+            # Split transcript into chunks
+            chunks = self._split_into_chunks(transcript)
+            print(f"Split transcript into {len(chunks)} chunks")
+            
+            # Summarize all chunks concurrently
+            chunk_summaries = await self._summarize_chunks(client, chunks)
+            
+            # A few short part summaries can be merged locally without a reduce call
+            if self._can_skip_reduce(chunk_summaries):
+                return _deduplicate_sentences(" ".join(chunk_summaries))
+            
+            # Call OpenAI API for the final summary
+            final_summary = await self._openai_call_with_retry(
+                client,
+                self._final_summary_messages(chunk_summaries, video_title),
+                "final summary",
+                validate=lambda content: content if len(content) > 100 else None,
+                max_tokens=600,
+                temperature=0.5,
+            )
+            if final_summary:
+                return final_summary
+            
+            # If final summary generation failed, just concatenate the chunk summaries
+            print("Failed to generate final summary, returning concatenated chunk summaries")
+            return " ".join(chunk_summaries)
+            
+        else:
+            # For shorter transcripts, summarize directly
+            # Call OpenAI API with retry logic
+            summary = await self._openai_call_with_retry(
+                client,
+                self._summary_messages(transcript, video_title),
+                "summary",
+                validate=lambda content: content if len(content) > 100 else None,
+                model="gpt-3.5-turbo-16k",  # Using a model with larger context window
+                max_tokens=500,
+                temperature=0.5,  # Lower temperature for more focused output
+            )
+            if summary:
+                return summary
+            
+            # If we get here, all attempts failed
+            print("All OpenAI summarization attempts failed")
             return None
     
     def generate_fallback_summary(self, transcript):
@@ -288,69 +864,20 @@ class ImprovedSummaryAgent:
             if len(transcript.split()) < 200:
                 return self.extract_key_points_fallback(transcript, video_id)
                 
-            # Split transcript into segments to identify timestamps
-            segments = self.split_transcript_into_segments(transcript, 5)  # 5 segments
-            
-            # Prepare the prompt for OpenAI
-            prompt = f"""Below is the transcript of a YouTube video. 
-            Please identify 5-7 key points or insights from the transcript, and for each one, specify approximately when in the video it appears.
-            
-            Format your response as a numbered list, with each point having a timestamp and the key insight. For example:
-            1. [2:30] The main concept is explained
-            2. [5:45] An important example is provided
-            
-            TRANSCRIPT:
-            {transcript[:15000]}  # Limit to 15000 chars to stay within token limits
-            
-            KEY POINTS WITH TIMESTAMPS:"""
+            # Prepare the prompt for OpenAI (limit to 15000 chars to stay within token limits)
+            prompt = _KEYPOINT_USER_TEMPLATE.format(transcript=transcript[:15000])
             
             # Call OpenAI API with retry logic
-            max_retries = 3
-            for attempt in range(max_retries):
-                try:
-                    response = openai.chat.completions.create(
-                        model="gpt-3.5-turbo-16k",
-                        messages=[
-                            {"role": "system", "content": "You are an expert at identifying the most important points in video transcripts with their approximate timestamps."},
-                            {"role": "user", "content": prompt}
-                        ],
-                        max_tokens=500,
-                        temperature=0.3,  # Lower temperature for more focused output
-                    )
-                    
-                    # Extract the key points from the response
-                    key_points_text = response.choices[0].message.content.strip()
-                    
-                    # Parse the key points into a structured format
-                    key_points = []
-                    for line in key_points_text.split("\n"):
-                        line = line.strip()
-                        if not line:
-                            continue
-                            
-                        # Look for timestamp pattern [mm:ss] or similar
-                        timestamp_match = re.search(r'\[(\d+:?\d*)\]', line)
-                        if timestamp_match:
-                            timestamp = timestamp_match.group(1)
-                            # Ensure timestamp is in mm:ss format
-                            if ":" not in timestamp:
-                                timestamp = f"{timestamp}:00"
-                                
-                            # Extract the key point text (everything after the timestamp)
-                            point_text = line[line.find("]") + 1:].strip()
-                            if point_text:
-                                key_points.append({"timestamp": timestamp, "point": point_text})
-                    
-                    # Ensure we got enough key points
-                    if len(key_points) >= 3:
-                        return key_points
-                    else:
-                        print(f"OpenAI returned too few key points, attempt {attempt+1}/{max_retries}")
-                        
-                except Exception as e:
-                    print(f"OpenAI API error on attempt {attempt+1}/{max_retries}: {e}")
-                    if attempt < max_retries - 1:
-                        time.sleep(2)  # Wait before retrying
+            key_points = run_sync(self._openai_call_with_retry(
+                get_client(),
+                [_KEYPOINT_SYS_MSG, {"role": "user", "content": prompt}],
+                "key points",
+                validate=self._parse_key_points,
+                max_tokens=500,
+                temperature=0.3,  # Lower temperature for more focused output
+            ))
+            if key_points:
+                return key_points
                         
             # If we get here, all attempts failed
             print("All OpenAI key point extraction attempts failed")
@@ -360,38 +887,70 @@ class ImprovedSummaryAgent:
             print(f"Error in OpenAI key point extraction: {e}")
             return None
     
+    def _parse_key_points(self, key_points_text):
+        """Parse "[mm:ss] point" lines; returns None if fewer than 3 were found."""
+        key_points = []
+        for line in key_points_text.split("\n"):
+            line = line.strip()
+            if not line:
+                continue
+                
+            # Look for timestamp pattern [mm:ss] or similar
+            timestamp_match = _TIMESTAMP_RE.search(line)
+            if timestamp_match:
+                timestamp = timestamp_match.group(1)
+                # Ensure timestamp is in mm:ss format
+                if ":" not in timestamp:
+                    timestamp = f"{timestamp}:00"
+                    
+                # Extract the key point text (everything after the timestamp)
+                point_text = line[line.find("]") + 1:].strip()
+                if point_text:
+                    key_points.append({"timestamp": timestamp, "point": point_text})
+        
+        # Ensure we got enough key points
+        return key_points if len(key_points) >= 3 else None
+    
     def extract_key_points_fallback(self, transcript, video_id):
         """Extract key points with timestamps using fallback methods."""
         try:
             # Use LexRank to find important sentences
-            parser = PlaintextParser.from_string(transcript, Tokenizer("english"))
-            stemmer = Stemmer("english")
-            summarizer = LexRankSummarizer(stemmer)
-            summarizer.stop_words = get_stop_words("english")
+            parser = PlaintextParser.from_string(transcript, self._tokenizer)
+            summarizer = self._summarizer
             
-            # Split transcript into segments
+            # Split transcript into segments (character offset ranges)
             segments = self.split_transcript_into_segments(transcript, 5)
-            words = transcript.split()
             
             # Get more sentences than we need
-            sentences = summarizer(parser.document, 10)
+            sentences = self._hierarchical_lexrank(parser.document, 10, summarizer)
+            index_of = {sentence: i for i, sentence in enumerate(sentences)}
             
-            # Convert to text and find their positions in the transcript
+            # Locate every document sentence in a single forward scan
+            sentence_offsets = {}
+            cursor = 0
+            for doc_sentence in parser.document.sentences:
+                doc_text = str(doc_sentence)
+                idx = transcript.find(doc_text, cursor)
+                if idx != -1:
+                    sentence_offsets.setdefault(doc_text, idx)
+                    cursor = idx + len(doc_text)
+            
+            # Convert to text and look up their positions in the transcript
             key_points = []
             for sentence in sentences[:7]:  # Limit to 7 key points
                 sentence_text = str(sentence)
                 
                 # Find the approximate position of this sentence in the transcript
-                start_idx = transcript.find(sentence_text)
+                start_idx = sentence_offsets.get(sentence_text, -1)
                 if start_idx == -1:
                     # If exact match not found, try to find a close match
-                    for i, segment in enumerate(segments):
-                        if sentence_text in segment:
-                            start_idx = sum(len(s) for s in segments[:i])
+                    for start, end in segments:
+                        if sentence_text in self.segment_text(transcript, start, end):
+                            start_idx = start
                             break
                     else:
                         # If still not found, estimate based on sentence index
-                        start_idx = (len(transcript) * sentences.index(sentence)) // len(sentences)
+                        start_idx = (len(transcript) * index_of[sentence]) // len(sentences)
                 
                 # Calculate timestamp
                 minutes = int(start_idx / 150)  # Assuming 150 words per minute
@@ -432,28 +991,75 @@ class ImprovedSummaryAgent:
         return key_points
     
     def split_transcript_into_segments(self, transcript, num_segments):
-        """Split transcript into approximately equal segments."""
-        words = transcript.split()
-        segment_size = len(words) // num_segments
+        """Split transcript into approximately equal segments (by word count).
         
-        segments = []
-        for i in range(num_segments):
-            start = i * segment_size
-            end = start + segment_size if i < num_segments - 1 else len(words)
-            segments.append(" ".join(words[start:end]))
+        Returns:
+            List of (char_start, char_end) offsets into the transcript; use
+            segment_text to get a segment's text
+        """
+        word_count = sum(1 for _ in _WORD_RE.finditer(transcript))
+        segment_size = word_count // num_segments
+        if segment_size == 0:
+            # Too few words: every segment but the last is empty
+            return [(0, 0)] * (num_segments - 1) + [(0, len(transcript))]
         
-        return segments
+        # Record where the first word of each segment starts
+        boundaries = {i * segment_size: i for i in range(1, num_segments)}
+        starts = [0]
+        for index, match in enumerate(_WORD_RE.finditer(transcript)):
+            if index in boundaries:
+                starts.append(match.start())
+                if len(starts) == num_segments:
+                    break
+        
+        ends = starts[1:] + [len(transcript)]
+        return list(zip(starts, ends))
+    
+    def segment_text(self, transcript, start, end):
+        """Return the text of a segment produced by split_transcript_into_segments."""
+        return transcript[start:end]
+    
+    def _hierarchical_lexrank(self, document, sentences_count, summarizer=None, blocks=LEXRANK_BLOCKS):
+        """Select the top sentences of a parsed document with block-wise LexRank.
+        
+        LexRank is quadratic in the number of sentences, so long documents are
+        split into blocks of consecutive sentences, LexRank picks candidates
+        within each block, and a final LexRank pass ranks the candidates.
+        Short documents are ranked directly.
+        
+        Returns:
+            Selected sentences in document order
+        """
+        summarizer = summarizer or self._summarizer
+        sentences = document.sentences
+        if len(sentences) <= LEXRANK_DIRECT_MAX_SENTENCES:
+            return summarizer(document, sentences_count)
+        
+        # Take twice the final share from each block so the global pass has a choice
+        per_block = max(2, -(-2 * sentences_count // blocks))
+        block_size = -(-len(sentences) // blocks)
+        candidates = []
+        for start in range(0, len(sentences), block_size):
+            block = ObjectDocumentModel([Paragraph(sentences[start:start + block_size])])
+            candidates.extend(summarizer(block, per_block))
+        
+        return summarizer(ObjectDocumentModel([Paragraph(candidates)]), sentences_count)
     
     def lexrank_summarize(self, text, sentences_count=10, language="english"):
         """Summarize text using LexRank algorithm."""
         try:
-            parser = PlaintextParser.from_string(text, Tokenizer(language))
-            stemmer = Stemmer(language)
-            summarizer = LexRankSummarizer(stemmer)
-            summarizer.stop_words = get_stop_words(language)
+            if language == "english":
+                tokenizer = self._tokenizer
+                summarizer = self._summarizer
+            else:
+                tokenizer = Tokenizer(language)
+                summarizer = LexRankSummarizer(Stemmer(language))
+                summarizer.stop_words = get_stop_words(language)
+            
+            parser = PlaintextParser.from_string(text, tokenizer)
             
             # Get summary sentences
-            summary_sentences = summarizer(parser.document, sentences_count)
+            summary_sentences = self._hierarchical_lexrank(parser.document, sentences_count, summarizer)
             
             # Join into a single text
             summary = " ".join(str(sentence) for sentence in summary_sentences)
@@ -471,51 +1077,44 @@ class ImprovedSummaryAgent:
             return text[:500] + "..." if len(text) > 500 else text
             
         try:
-            # Make a copy of the text to preserve the original
-            original_text = text
-            
-            # Remove punctuation and convert to lowercase for analysis
-            text_for_analysis = text.lower()
-            for p in punctuation:
-                text_for_analysis = text_for_analysis.replace(p, ' ')
-            
-            # Tokenize the text
-            words = text_for_analysis.split()
+            # Strip punctuation in one regex pass and tokenize once
+            tokens = _PUNCT_RE.sub(' ', text.lower()).split()
             
-            # Remove stop words
-            stop_words = set(get_stop_words("english"))
-            filtered_words = [word for word in words if word not in stop_words and len(word) > 1]
-            
-            # Calculate word frequencies
-            word_frequencies = Counter(filtered_words)
-            
-            # Normalize frequencies
+            # Calculate word frequencies, ignoring stop words
+            stop_words = self._stop_words
+            word_frequencies = Counter(t for t in tokens if len(t) > 1 and t not in stop_words)
             max_frequency = max(word_frequencies.values()) if word_frequencies else 1
-            for word in word_frequencies:
-                word_frequencies[word] = word_frequencies[word] / max_frequency
+            frequency_of = word_frequencies.get
             
             # Split the original text into sentences
-            import re
-            sentences = re.split(r'(?<!\w\.\w.)(?<![A-Z][a-z]\.)(?<=\.|\?|\!)\s', original_text)
+            sentences = _SENT_SPLIT_RE.split(text)
             
-            # Calculate sentence scores based on word frequencies
-            sentence_scores = {}
+            # Calculate sentence scores based on normalized word frequencies,
+            # kept in parallel lists (repeated sentences share one entry)
+            scored_sentences = []
+            scores = []
+            index_of = {}
             for sentence in sentences:
+                sentence_tokens = _PUNCT_RE.sub(' ', sentence.lower()).split()
+                
                 # Skip very short sentences
-                if len(sentence.split()) < 3:
+                if len(sentence_tokens) < 3:
                     continue
-                    
-                for word in sentence.lower().split():
-                    # Remove punctuation from the word
-                    word = ''.join(c for c in word if c not in punctuation)
-                    if word in word_frequencies:
-                        if sentence not in sentence_scores:
-                            sentence_scores[sentence] = 0
-                        sentence_scores[sentence] += word_frequencies[word]
-            
-            # Get the top sentences
-            import heapq
-            summary_sentences = heapq.nlargest(sentences_count, sentence_scores, key=sentence_scores.get)
+                
+                score = sum(map(frequency_of, sentence_tokens, repeat(0)))
+                if score:
+                    idx = index_of.get(sentence)
+                    if idx is None:
+                        index_of[sentence] = len(scores)
+                        scored_sentences.append(sentence)
+                        scores.append(score / max_frequency)
+                    else:
+                        scores[idx] += score / max_frequency
+            
+            # Get the top sentences; comparing (score, -index) tuples avoids a
+            # key-function call per element and keeps earlier sentences first on ties
+            top = heapq.nlargest(sentences_count, zip(scores, range(0, -len(scores), -1)))
+            summary_sentences = [scored_sentences[-neg_idx] for _, neg_idx in top]
             
             # Join sentences back into a summary
             summary = ". ".join(summary_sentences)
@@ -528,21 +1127,46 @@ class ImprovedSummaryAgent:
             
         except Exception as e:
             print(f"Simple summarization error: {e}")
-            return original_text[:500] + "..." if len(original_text) > 500 else original_text
+            return text[:500] + "..." if len(text) > 500 else text
     
     def get_video_info(self, video_id):
         """Get video information from YouTube."""
+        cached = self._video_info_cache.get(video_id)
+        if cached is not None:
+            return cached
+        
         try:
             # In a production environment, you would use the YouTube Data API
             # For this demo, we'll make a simple request to get the video title
-            response = requests.get(f"https://noembed.com/embed?url=https://www.youtube.com/watch?v={video_id}")
+            headers = {}
+            validator = self._video_info_etags.get(video_id)
+            if validator is not None:
+                headers["If-None-Match"] = validator[0]
+            
+            response = self._http.get(
+                f"https://noembed.com/embed?url=https://www.youtube.com/watch?v={video_id}",
+                headers=headers
+            )
+            
+            # Unchanged since the last fetch: reuse the stored info
+            if response.status_code == 304 and validator is not None:
+                video_info = validator[1]
+                self._video_info_cache.set(video_id, video_info)
+                return video_info
+            
             if response.status_code == 200:
                 data = response.json()
-                return {
+                video_info = {
                     "title": data.get("title", "YouTube Video"),
                     "author": data.get("author_name", "Unknown"),
                     "thumbnail": data.get("thumbnail_url", "")
                 }
+                self._video_info_cache.set(video_id, video_info)
+                
+                etag = response.headers.get("ETag")
+                if etag:
+                    self._video_info_etags.set(video_id, (etag, video_info))
+                return video_info
         except Exception as e:
             print(f"Error getting video info: {e}")
         
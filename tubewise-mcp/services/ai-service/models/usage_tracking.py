@@ -1,53 +1,238 @@
 from fastapi import BackgroundTasks
-from sqlalchemy import Column, Integer, String, DateTime, func
+from sqlalchemy import Column, Integer, String, DateTime, Date, Index, UniqueConstraint, func
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from datetime import datetime, timedelta
-from typing import Optional
-from db import Base, get_db
+from datetime import date, datetime
+from typing import Dict, List, Optional
+from db import Base, get_async_db
+from redis_client import get_redis
+import asyncio
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Redis usage counters: "usage:{user_id}:{feature}:{YYYYMMDD}" holds the count
+# for that UTC day, "usage:pending:..." the increments not yet flushed to Postgres
+USAGE_KEY_PREFIX = "usage"
+USAGE_PENDING_PREFIX = "usage:pending"
+USAGE_COUNTER_TTL = 60 * 60 * 36  # 36 hours
+USAGE_FLUSH_INTERVAL = 30  # seconds
+
+def _utc_today() -> date:
+    """Today's date in UTC, the day boundary used for all usage counts"""
+    return datetime.utcnow().date()
+
+def _utc_now():
+    """SQL expression for the current UTC time as a naive timestamp"""
+    return func.timezone("UTC", func.now())
+
 class UsageTracking(Base):
     """Model for tracking feature usage by users"""
     __tablename__ = "usage_tracking"
+    __table_args__ = (
+        # One row per user, feature and day; target of the increment UPSERT
+        # and the index behind get_usage/get_remaining's per-day lookups
+        UniqueConstraint("user_id", "feature", "date_day", name="uq_usage_tracking_user_feature_day"),
+        # Serves user/feature lookups over a date range in one index scan;
+        # it also covers lookups by user_id alone
+        Index("ix_usage_uid_feature_date", "user_id", "feature", "date"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(String, index=True)
-    feature = Column(String, index=True)  # e.g., 'summarize', 'compare', 'fact_check', 'generate'
+    user_id = Column(String)
+    feature = Column(String)  # e.g., 'summarize', 'compare', 'fact_check', 'generate'
     count = Column(Integer, default=0)
-    date = Column(DateTime, default=func.now())
+    date = Column(DateTime, default=_utc_now())  # UTC
+    date_day = Column(Date, default=func.date(_utc_now()), server_default=func.date(_utc_now()))
     
     @classmethod
     async def get_usage(cls, user_id: str, feature: str, session: AsyncSession):
         """Get usage for a specific feature by a user for the current day"""
-        today = datetime.now().date()
-        tomorrow = today + timedelta(days=1)
-        
+        # Keyed on date_day, not date: a batched flush after midnight inserts
+        # the previous day's row with today's timestamp
         query = select(cls).where(
             cls.user_id == user_id,
             cls.feature == feature,
-            cls.date >= today,
-            cls.date < tomorrow
+            cls.date_day == _utc_today()
         )
         
         result = await session.execute(query)
         return result.scalars().first()
     
     @classmethod
-    async def increment_usage(cls, user_id: str, feature: str, session: AsyncSession):
-        """Increment usage count for a specific feature by a user"""
-        usage = await cls.get_usage(user_id, feature, session)
+    async def add_usage_batch(cls, rows: List[Dict], session: AsyncSession) -> None:
+        """Add usage counts for many (user_id, feature, date_day) rows in one UPSERT
         
-        if usage:
-            usage.count += 1
-        else:
-            usage = cls(user_id=user_id, feature=feature, count=1)
-            session.add(usage)
+        Args:
+            rows: Dicts with user_id, feature, date_day and count (the delta to add)
+            session: Database session
+        """
+        if not rows:
+            return
         
+        stmt = insert(cls).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[cls.user_id, cls.feature, cls.date_day],
+            set_={"count": cls.count + stmt.excluded.count}
+        )
+        await session.execute(stmt)
         await session.commit()
-        return usage.count
+    
+    @classmethod
+    async def consume_usage(cls, user_id: str, feature: str, limit: int, session: AsyncSession) -> int:
+        """Use one credit of a feature and return the credits left for today
+        
+        A single INSERT ... ON CONFLICT DO UPDATE ... RETURNING does the
+        read-modify-write atomically in one round trip: an existing count is
+        only incremented while it is below the limit, and Postgres computes
+        the remaining credits from the new count.
+        
+        Returns:
+            Remaining credits after this use (0 if the limit was already reached)
+        """
+        stmt = insert(cls).values(
+            user_id=user_id,
+            feature=feature,
+            count=1,
+            date=_utc_now(),
+            date_day=func.date(_utc_now())
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[cls.user_id, cls.feature, cls.date_day],
+            set_={"count": cls.count + 1},
+            where=cls.count < limit
+        ).returning(func.greatest(0, limit - cls.count))
+        
+        result = await session.execute(stmt)
+        await session.commit()
+        
+        # No row comes back when the update was skipped at the limit
+        remaining = result.scalar_one_or_none()
+        return remaining if remaining is not None else 0
+    
+    @classmethod
+    async def get_remaining(cls, user_id: str, feature: str, limit: int, session: AsyncSession) -> int:
+        """Credits left for today for a feature, computed in the query"""
+        # The aggregate always yields one row, even before the first use today
+        query = select(
+            func.greatest(0, limit - func.coalesce(func.max(cls.count), 0))
+        ).where(
+            cls.user_id == user_id,
+            cls.feature == feature,
+            cls.date_day == _utc_today()
+        )
+        
+        result = await session.execute(query)
+        return result.scalar_one()
+
+def _usage_suffix(user_id: str, feature: str, day: date) -> str:
+    return f"{user_id}:{feature}:{day:%Y%m%d}"
+
+async def _increment_usage_counter(user_id: str, feature: str) -> Optional[int]:
+    """Increment today's Redis usage counter
+    
+    Returns:
+        The new count, or None if Redis is unavailable
+    """
+    redis = get_redis()
+    if redis is None:
+        return None
+    
+    key = f"{USAGE_KEY_PREFIX}:{_usage_suffix(user_id, feature, _utc_today())}"
+    try:
+        async with redis.pipeline(transaction=False) as pipe:
+            pipe.incr(key)
+            pipe.expire(key, USAGE_COUNTER_TTL)
+            new_count, _ = await pipe.execute()
+        
+        if new_count == 1:
+            # Counter was just created (new day or Redis restart): seed it
+            # with whatever Postgres already recorded for today
+            async with get_async_db() as session:
+                usage = await UsageTracking.get_usage(user_id, feature, session)
+            if usage and usage.count:
+                new_count = await redis.incrby(key, usage.count)
+        
+        return new_count
+    except Exception as e:
+        logger.warning(f"Redis usage counter unavailable: {str(e)}")
+        return None
+
+async def _record_pending_usage(user_id: str, feature: str) -> None:
+    """Queue one usage increment for the next flush to Postgres"""
+    redis = get_redis()
+    key = f"{USAGE_PENDING_PREFIX}:{_usage_suffix(user_id, feature, _utc_today())}"
+    try:
+        async with redis.pipeline(transaction=False) as pipe:
+            pipe.incr(key)
+            pipe.expire(key, USAGE_COUNTER_TTL)
+            await pipe.execute()
+    except Exception as e:
+        logger.error(f"Error recording pending usage: {str(e)}")
+
+async def flush_usage_counters() -> int:
+    """Write pending Redis usage increments to Postgres in one batched UPSERT
+    
+    Returns:
+        Number of (user, feature, day) rows flushed
+    """
+    redis = get_redis()
+    if redis is None:
+        return 0
+    
+    rows = []
+    keys = []
+    async for key in redis.scan_iter(match=f"{USAGE_PENDING_PREFIX}:*", count=500):
+        # Read and clear the pending delta atomically
+        async with redis.pipeline(transaction=True) as pipe:
+            pipe.get(key)
+            pipe.delete(key)
+            delta, _ = await pipe.execute()
+        if not delta or int(delta) <= 0:
+            continue
+        
+        user_id, feature, day = key[len(USAGE_PENDING_PREFIX) + 1:].rsplit(":", 2)
+        rows.append({
+            "user_id": user_id,
+            "feature": feature,
+            "date_day": datetime.strptime(day, "%Y%m%d").date(),
+            "count": int(delta)
+        })
+        keys.append(key)
+    
+    if not rows:
+        return 0
+    
+    try:
+        async with get_async_db() as session:
+            await UsageTracking.add_usage_batch(rows, session)
+    except Exception as e:
+        logger.error(f"Error flushing usage counters: {str(e)}")
+        # Put the deltas back so the next flush retries them
+        async with redis.pipeline(transaction=False) as pipe:
+            for key, row in zip(keys, rows):
+                pipe.incrby(key, row["count"])
+                pipe.expire(key, USAGE_COUNTER_TTL)
+            await pipe.execute()
+        return 0
+    
+    return len(rows)
+
+async def run_usage_flusher(interval: float = USAGE_FLUSH_INTERVAL) -> None:
+    """Periodically flush Redis usage counters to Postgres until cancelled"""
+    while True:
+        await asyncio.sleep(interval)
+        # Shield the flush so cancelling mid-flush still writes the deltas
+        # it has already taken out of Redis
+        flush = asyncio.ensure_future(flush_usage_counters())
+        try:
+            await asyncio.shield(flush)
+        except asyncio.CancelledError:
+            await asyncio.wait([flush])
+            raise
+        except Exception as e:
+            logger.error(f"Usage flusher error: {str(e)}")
 
 async def track_usage(
     user_id: str, 
@@ -69,37 +254,26 @@ async def track_usage(
     Returns:
         Remaining credits for the feature
     """
-    async def _track_usage():
-        async with get_db() as session:
-            try:
-                usage = await UsageTracking.get_usage(user_id, feature, session)
-                current_count = usage.count if usage else 0
-                
-                if increment and current_count < usage_limit:
-                    await UsageTracking.increment_usage(user_id, feature, session)
-                    current_count += 1
-                
-                remaining = max(0, usage_limit - current_count)
-                return remaining
-            except Exception as e:
-                logger.error(f"Error tracking usage: {str(e)}")
-                # If there's an error, we'll assume the user has remaining credits
-                # to avoid blocking legitimate usage due to tracking issues
-                return max(0, usage_limit - 1)
+    # Routers pass the integer users.id; the column and Redis keys are strings
+    user_id = str(user_id)
+    if background_tasks and increment:
+        # Hot path: count in Redis and let the periodic flusher write the
+        # increment through to Postgres
+        new_count = await _increment_usage_counter(user_id, feature)
+        if new_count is not None:
+            if new_count <= usage_limit:
+                background_tasks.add_task(_record_pending_usage, user_id, feature)
+            return max(0, usage_limit - new_count)
     
-    if background_tasks:
-        # If we have background tasks, we'll track usage asynchronously
-        # but return the approximate remaining credits immediately
-        async with get_db() as session:
-            usage = await UsageTracking.get_usage(user_id, feature, session)
-            current_count = usage.count if usage else 0
-            
-        if increment:
-            background_tasks.add_task(_track_usage)
-            # Assume the current request will succeed
-            current_count += 1
-            
-        return max(0, usage_limit - current_count)
-    else:
-        # If no background tasks, track usage synchronously
-        return await _track_usage()
+    # Redis unavailable or no background tasks: the atomic UPSERT costs one
+    # round trip like a plain read, so a single session serves either case
+    async with get_async_db() as session:
+        try:
+            if increment and usage_limit > 0:
+                return await UsageTracking.consume_usage(user_id, feature, usage_limit, session)
+            return await UsageTracking.get_remaining(user_id, feature, usage_limit, session)
+        except Exception as e:
+            logger.error(f"Error tracking usage: {str(e)}")
+            # If there's an error, we'll assume the user has remaining credits
+            # to avoid blocking legitimate usage due to tracking issues
+            return max(0, usage_limit - 1)
@@ -2,27 +2,38 @@
 User model for TubeWise.
 """
 
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, ConfigDict, EmailStr, TypeAdapter
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 
 # Import User model from db.py
 from db import User
 
+# Serialized shape of a User; lenient like the ORM row itself, so users with
+# missing credits or a legacy email still serialize
+class _UserDict(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    
+    id: Optional[int] = None
+    email: Optional[str] = None
+    name: Optional[str] = None
+    role: Optional[str] = None
+    credits: Optional[int] = None
+    language_preference: Optional[str] = None
+    created_at: Optional[datetime] = None
+    last_active: Optional[datetime] = None
+    is_active: Optional[bool] = True
+
+# Built once so pydantic-core reuses the compiled validator and serializer
+_user_adapter = TypeAdapter(_UserDict)
+
 # Add to_dict method to User class
 def user_to_dict(user) -> Dict[str, Any]:
     """Convert user to dictionary."""
-    return {
-        "id": user.id,
-        "email": user.email,
-        "name": user.name,
-        "role": user.role,
-        "credits": user.credits,
-        "language_preference": user.language_preference,
-        "created_at": user.created_at.isoformat() if user.created_at else None,
-        "last_active": user.last_active.isoformat() if user.last_active else None,
-        "is_active": getattr(user, 'is_active', True)
-    }
+    return _user_adapter.dump_python(
+        _user_adapter.validate_python(user, from_attributes=True),
+        mode="json"
+    )
 
 # Add to_dict method to User class
 User.to_dict = user_to_dict
@@ -43,12 +54,11 @@ class UserUpdate(BaseModel):
     language_preference: Optional[str] = None
 
 class UserResponse(UserBase):
+    model_config = ConfigDict(from_attributes=True)
+    
     id: int
     role: str
     credits: int
     language_preference: str
     created_at: datetime
     last_active: Optional[datetime] = None
-    
-    class Config:
-        orm_mode = True
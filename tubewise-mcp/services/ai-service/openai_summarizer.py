@@ -1,10 +1,93 @@
 """OpenAI-based summarization module for high-quality text summarization."""
 
 import os
-import time
 import re
-from typing import List, Dict, Any, Optional
-import openai
+import asyncio
+import hashlib
+import json
+import threading
+from typing import List, Dict, Any, Optional, Tuple
+from functools import lru_cache
+from redis_client import create_redis
+
+# openai, httpx and tiktoken are heavy imports, so they are loaded on first
+# use; workers that never summarize don't pay for them at startup
+
+@lru_cache(maxsize=None)
+def _get_encoding():
+    """Return the tiktoken encoding for the summary model, or None without tiktoken."""
+    try:
+        import tiktoken
+        return tiktoken.encoding_for_model("gpt-3.5-turbo-16k")
+    except Exception as e:
+        print(f"tiktoken unavailable ({e}), estimating token counts from characters")
+        return None
+
+# Texts below this size are returned as-is; above the long threshold they are
+# summarized in chunks to stay inside the 16k context window
+MIN_SUMMARY_TOKENS = 130  # Roughly 100 words
+LONG_TEXT_TOKENS = 14000
+
+# Long texts are cut into overlapping token windows so each chunk fits the
+# context window exactly and no sentence is lost at a boundary
+CHUNK_TOKENS = 12000
+CHUNK_OVERLAP_TOKENS = 200
+
+# Completion budget for summaries: English averages ~1.3 tokens per word, plus
+# a little headroom so the model can finish its last sentence
+SUMMARY_TOKENS_PER_WORD = 1.5
+SUMMARY_TOKEN_HEADROOM = 64
+
+# Maximum number of chunk summaries requested from OpenAI at once
+MAX_CONCURRENT_CHUNKS = 5
+
+# Summaries and key points of identical texts are cached in Redis for a week
+SUMMARY_CACHE_PREFIX = "summary"
+KEY_POINTS_CACHE_PREFIX = "kp"
+SUMMARY_CACHE_TTL = 60 * 60 * 24 * 7
+
+# Precompiled patterns for sentence splitting and key point parsing
+_SENT_SPLIT = re.compile(r'(?<!\.\w.)(?<![A-Z][a-z]\.)(?<=\.|\?|\!)\s')
+_NUM_PREFIX = re.compile(r'^\d+\.\s*')
+_TS_LINE = re.compile(r'([0-9]+:[0-9]+)\s*-\s*(.+)')
+
+# Shared async OpenAI client with a pooled HTTP/2 connection, created on first use
+_client = None
+
+def get_client() -> "openai.AsyncOpenAI":
+    """Return the shared AsyncOpenAI client, creating it on first use."""
+    global _client
+    if _client is None:
+        import httpx
+        import openai
+        _client = openai.AsyncOpenAI(
+            api_key=openai.api_key,
+            http_client=httpx.AsyncClient(
+                http2=True,
+                limits=httpx.Limits(max_connections=50, max_keepalive_connections=20)
+            )
+        )
+    return _client
+
+# The pooled client's connections are bound to the loop that opened them, so
+# synchronous callers run its coroutines on one shared background loop
+_loop = asyncio.new_event_loop()
+threading.Thread(target=_loop.run_forever, name="summarizer-loop", daemon=True).start()
+
+def run_sync(coro):
+    """Run a coroutine on the shared background loop and wait for its result."""
+    return asyncio.run_coroutine_threadsafe(coro, _loop).result()
+
+def _summary_max_tokens(max_words: int) -> int:
+    """Completion token budget for a summary of at most max_words words."""
+    return int(max_words * SUMMARY_TOKENS_PER_WORD) + SUMMARY_TOKEN_HEADROOM
+
+def _count_tokens(text: str) -> int:
+    """Count tokens with tiktoken, or estimate ~4 characters per token without it."""
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text))
+    return len(text) // 4
 
 class OpenAISummarizer:
     """
@@ -16,12 +99,34 @@ class OpenAISummarizer:
         Initialize the summarizer with OpenAI API key.
         """
         # Get API key from environment variable
+        import openai
         openai.api_key = os.getenv("OPENAI_API_KEY")
         if not openai.api_key:
             raise ValueError("OpenAI API key not found. Please set the OPENAI_API_KEY environment variable.")
+        self.client = get_client()
+        self.redis = create_redis()
         print("OpenAI summarizer initialized")
     
-    def summarize(self, text: str, max_length: int = 300, min_length: int = 100) -> str:
+    async def _cache_get(self, key: str) -> Optional[str]:
+        """Look up a cached result, treating Redis errors as a miss."""
+        if self.redis is None:
+            return None
+        try:
+            return await self.redis.get(key)
+        except Exception as e:
+            print(f"Error reading summarizer cache: {e}")
+            return None
+    
+    async def _cache_set(self, key: str, value: str) -> None:
+        """Store a result in the cache, ignoring Redis errors."""
+        if self.redis is None:
+            return
+        try:
+            await self.redis.setex(key, SUMMARY_CACHE_TTL, value)
+        except Exception as e:
+            print(f"Error writing summarizer cache: {e}")
+    
+    async def summarize(self, text: str, max_length: int = 300, min_length: int = 100) -> str:
         """
         Generate a summary of the input text using OpenAI API.
         
@@ -33,14 +138,39 @@ class OpenAISummarizer:
         Returns:
             str: The generated summary
         """
-        if not text or len(text.split()) < 100:
+        summary, _ = await self._summarize(text, max_length, min_length)
+        return summary
+    
+    async def _summarize(self, text: str, max_length: int, min_length: int) -> Tuple[str, bool]:
+        """
+        Implementation of summarize that also reports whether OpenAI produced
+        the summary, as opposed to the extractive fallback.
+        
+        Returns:
+            Tuple[str, bool]: The summary and whether it is complete
+        """
+        if not text:
+            return text, True
+        
+        token_count = _count_tokens(text)
+        if token_count < MIN_SUMMARY_TOKENS:
             print("Text too short for summarization, returning original")
-            return text
+            return text, True
+        
+        # Identical transcripts get the same summary, so serve it from the cache
+        cache_key = f"{SUMMARY_CACHE_PREFIX}:{hashlib.sha256(text.encode()).hexdigest()}"
+        cached = await self._cache_get(cache_key)
+        if cached:
+            return cached, True
             
         try:
             # For very long texts, we need to chunk and summarize separately
-            if len(text.split()) > 4000:  # GPT-3.5 has a context limit
-                return self.summarize_long_text(text, max_length, min_length)
+            if token_count > LONG_TEXT_TOKENS:  # GPT-3.5 has a context limit
+                summary, ok = await self._summarize_long_text(text, max_length, min_length)
+                # Don't pin a degraded summary in the cache for a week
+                if ok:
+                    await self._cache_set(cache_key, summary)
+                return summary, ok
                 
             # Prepare the prompt for OpenAI
             prompt = f"""Please provide a comprehensive yet concise summary of the following text. 
@@ -56,13 +186,13 @@ class OpenAISummarizer:
             max_retries = 3
             for attempt in range(max_retries):
                 try:
-                    response = openai.chat.completions.create(
+                    response = await self.client.chat.completions.create(
                         model="gpt-3.5-turbo-16k",  # Using a model with larger context window
                         messages=[
                             {"role": "system", "content": "You are an expert video summarizer. Create concise, informative summaries that capture the essence of content."},
                             {"role": "user", "content": prompt}
                         ],
-                        max_tokens=max_length * 4,  # Rough estimate: 1 word ≈ 4 tokens
+                        max_tokens=_summary_max_tokens(max_length),
                         temperature=0.5,  # Lower temperature for more focused output
                     )
                     
@@ -71,25 +201,26 @@ class OpenAISummarizer:
                     
                     # Ensure we got a meaningful summary
                     if summary and len(summary) > 50:
-                        return summary
+                        await self._cache_set(cache_key, summary)
+                        return summary, True
                     else:
                         print(f"OpenAI returned too short summary, attempt {attempt+1}/{max_retries}")
                         
                 except Exception as e:
                     print(f"OpenAI API error, attempt {attempt+1}/{max_retries}: {e}")
                     if attempt < max_retries - 1:
-                        time.sleep(2)  # Wait before retrying
+                        await asyncio.sleep(2)  # Wait before retrying
             
             # If all attempts failed, return a simple extractive summary
             print("Failed to generate summary with OpenAI, using fallback method")
-            return self._simple_summarize(text, max_length)
+            return self._simple_summarize(text, max_length), False
             
         except Exception as e:
             print(f"Error in summarization: {e}")
             # Return a portion of the original text as fallback
-            return self._simple_summarize(text, max_length)
+            return self._simple_summarize(text, max_length), False
     
-    def summarize_long_text(self, text: str, max_length: int = 300, min_length: int = 100) -> str:
+    async def summarize_long_text(self, text: str, max_length: int = 300, min_length: int = 100) -> str:
         """
         Summarize a long text by breaking it into chunks, summarizing each chunk,
         and then summarizing the combined summaries.
@@ -102,18 +233,31 @@ class OpenAISummarizer:
         Returns:
             str: The generated summary
         """
+        summary, _ = await self._summarize_long_text(text, max_length, min_length)
+        return summary
+    
+    async def _summarize_long_text(self, text: str, max_length: int, min_length: int) -> Tuple[str, bool]:
+        """
+        Implementation of summarize_long_text that also reports whether every
+        chunk and the final reduce step were summarized by OpenAI.
+        
+        Returns:
+            Tuple[str, bool]: The summary and whether it is complete
+        """
         print(f"Text is long ({len(text.split())} words), using chunk-based summarization")
         
         # Split text into chunks of approximately 4000 words (GPT-3.5 context limit)
         chunks = self._split_into_chunks(text, chunk_size=4000)
         print(f"Split text into {len(chunks)} chunks")
         
-        # Summarize each chunk
-        chunk_summaries = []
-        for i, chunk in enumerate(chunks):
-            print(f"Summarizing chunk {i+1}/{len(chunks)}")
-            chunk_summary = self.summarize(chunk, max_length=max_length//2, min_length=min_length//2)
-            chunk_summaries.append(chunk_summary)
+        # Summarize the chunks concurrently, bounded to respect rate limits
+        sem = asyncio.Semaphore(MAX_CONCURRENT_CHUNKS)
+        results = await asyncio.gather(*[
+            self._sem_summarize(sem, chunk, max_length//2, min_length//2)
+            for chunk in chunks
+        ])
+        chunk_summaries = [summary for summary, _ in results]
+        ok = all(chunk_ok for _, chunk_ok in results)
         
         # Combine chunk summaries
         combined_summary = "\n\n".join([f"Part {i+1}: {summary}" for i, summary in enumerate(chunk_summaries)])
@@ -132,25 +276,30 @@ class OpenAISummarizer:
             
             # Call OpenAI API for the final summary
             try:
-                response = openai.chat.completions.create(
+                response = await self.client.chat.completions.create(
                     model="gpt-3.5-turbo-16k",
                     messages=[
                         {"role": "system", "content": "You are an expert at creating comprehensive summaries from partial summaries. Create a coherent, flowing summary that captures the essence of the entire content."},
                         {"role": "user", "content": final_summary_prompt}
                     ],
-                    max_tokens=max_length * 4,
+                    max_tokens=_summary_max_tokens(max_length),
                     temperature=0.5,
                 )
                 
-                return response.choices[0].message.content.strip()
+                return response.choices[0].message.content.strip(), ok
             except Exception as e:
                 print(f"Error in final summarization: {e}")
                 # If final summarization fails, just return the combined summaries
-                return " ".join(chunk_summaries)
+                return " ".join(chunk_summaries), False
         
-        return combined_summary
+        return combined_summary, ok
+    
+    async def _sem_summarize(self, sem: asyncio.Semaphore, text: str, max_length: int, min_length: int) -> Tuple[str, bool]:
+        """Summarize a chunk once a slot in the semaphore is free."""
+        async with sem:
+            return await self._summarize(text, max_length, min_length)
     
-    def extract_key_points(self, text: str, video_id: str, num_points: int = 5) -> List[Dict[str, str]]:
+    async def extract_key_points(self, text: str, video_id: str, num_points: int = 5) -> List[Dict[str, str]]:
         """
         Extract key points with timestamps from the text using OpenAI API.
         
@@ -162,6 +311,12 @@ class OpenAISummarizer:
         Returns:
             List[Dict[str, str]]: List of key points with timestamps
         """
+        # Identical requests get the same key points, so serve them from the cache
+        cache_key = f"{KEY_POINTS_CACHE_PREFIX}:{hashlib.sha256(f'{video_id}|{num_points}|{text}'.encode()).hexdigest()}"
+        cached = await self._cache_get(cache_key)
+        if cached:
+            return json.loads(cached)
+        
         try:
             # Prepare the prompt for OpenAI
             prompt = f"""Extract {num_points} key points from the following transcript of a video.
@@ -174,7 +329,7 @@ class OpenAISummarizer:
             KEY POINTS (format each point as 'mm:ss - description'):"""
             
             # Call OpenAI API
-            response = openai.chat.completions.create(
+            response = await self.client.chat.completions.create(
                 model="gpt-3.5-turbo-16k",
                 messages=[
                     {"role": "system", "content": "You are an expert at extracting key points from video transcripts. Provide concise, informative key points with accurate timestamps."},
@@ -191,14 +346,14 @@ class OpenAISummarizer:
             key_points = []
             for line in key_points_text.split('\n'):
                 line = line.strip()
-                if not line or line.startswith('#') or line.startswith('KEY POINTS'):
+                if not line or line.startswith(('#', 'KEY POINTS')):
                     continue
                     
                 # Remove numbering if present
-                line = re.sub(r'^\d+\.\s*', '', line)
+                line = _NUM_PREFIX.sub('', line)
                 
                 # Extract timestamp and point
-                match = re.match(r'([0-9]+:[0-9]+)\s*-\s*(.+)', line)
+                match = _TS_LINE.match(line)
                 if match:
                     timestamp, point = match.groups()
                     key_points.append({
@@ -206,11 +361,19 @@ class OpenAISummarizer:
                         "point": point.strip()
                     })
             
+            # Only a full set parsed from OpenAI's answer is worth caching;
+            # padded-out results are recomputed on the next request
+            complete = len(key_points) >= num_points
+            
             # If we couldn't extract enough key points, generate some
-            if len(key_points) < num_points:
+            if not complete:
                 print(f"Only extracted {len(key_points)} key points, generating more")
                 missing_points = num_points - len(key_points)
                 
+                # Split the transcript once for all missing points
+                words = text.split()
+                n_words = len(words)
+                
                 # Calculate timestamps for missing points
                 # Assume a 10-minute video by default
                 for i in range(missing_points):
@@ -219,12 +382,12 @@ class OpenAISummarizer:
                     timestamp = f"{minutes}:{seconds:02d}"
                     
                     # Generate a point for this timestamp
-                    segment_index = (i * len(text.split())) // num_points
-                    segment_end = ((i + 1) * len(text.split())) // num_points
-                    segment = " ".join(text.split()[segment_index:segment_end])
+                    segment_index = (i * n_words) // num_points
+                    segment_end = ((i + 1) * n_words) // num_points
+                    segment = " ".join(words[segment_index:segment_end])
                     
                     # Use the first sentence as the point
-                    sentences = segment.split('.')
+                    sentences = segment.split('.', 1)
                     point = sentences[0] + '.' if sentences else segment[:100]
                     
                     key_points.append({
@@ -232,7 +395,10 @@ class OpenAISummarizer:
                         "point": point.strip()
                     })
             
-            return key_points[:num_points]  # Limit to requested number of points
+            key_points = key_points[:num_points]  # Limit to requested number of points
+            if complete:
+                await self._cache_set(cache_key, json.dumps(key_points))
+            return key_points
             
         except Exception as e:
             print(f"Error extracting key points: {e}")
@@ -240,22 +406,33 @@ class OpenAISummarizer:
     
     def _split_into_chunks(self, text: str, chunk_size: int = 4000) -> List[str]:
         """
-        Split text into chunks of approximately chunk_size words,
+        Split text into overlapping windows of CHUNK_TOKENS tokens. Without
+        tiktoken, fall back to chunks of approximately chunk_size words,
         trying to break at paragraph or sentence boundaries.
         
         Args:
             text (str): The text to split
-            chunk_size (int): Target size of each chunk in words
+            chunk_size (int): Target size of each chunk in words (fallback only)
             
         Returns:
             List[str]: List of text chunks
         """
+        encoding = _get_encoding()
+        if encoding is not None:
+            tokens = encoding.encode(text)
+            step = CHUNK_TOKENS - CHUNK_OVERLAP_TOKENS
+            # Stop before a window that would only repeat the previous overlap
+            return [
+                encoding.decode(tokens[start:start + CHUNK_TOKENS])
+                for start in range(0, max(len(tokens) - CHUNK_OVERLAP_TOKENS, 1), step)
+            ]
+        
         # First try to split by paragraphs
         paragraphs = text.split('\n\n')
         
         # If we only have one paragraph or very few, split by sentences
         if len(paragraphs) < 3:
-            sentences = re.split(r'(?<!\.\w.)(?<![A-Z][a-z]\.)(?<=\.|\?|\!)\s', text)
+            sentences = _SENT_SPLIT.split(text)
             return self._combine_units(sentences, chunk_size)
         
         return self._combine_units(paragraphs, chunk_size)
@@ -308,37 +485,35 @@ class OpenAISummarizer:
             str: The generated summary
         """
         # Split text into sentences
-        sentences = re.split(r'(?<!\.\w.)(?<![A-Z][a-z]\.)(?<=\.|\?|\!)\s', text)
+        sentences = _SENT_SPLIT.split(text)
         
         # If there are very few sentences, just return the text
         if len(sentences) <= 3:
             return text
         
+        # Word count of each sentence, computed once for scoring and selection
+        lengths = [len(sentence.split()) for sentence in sentences]
+        
         # Calculate sentence importance based on position
         # First and last sentences are usually more important
-        importance = {}
-        for i, sentence in enumerate(sentences):
-            # Position-based importance: beginning and end are more important
-            pos_importance = 1.0
-            if i < len(sentences) * 0.2:  # First 20%
-                pos_importance = 2.0
-            elif i > len(sentences) * 0.8:  # Last 20%
-                pos_importance = 1.5
-            
-            # Length-based importance: longer sentences often contain more information
-            length_importance = min(1.0, len(sentence.split()) / 20.0)
-            
-            # Combined importance
-            importance[i] = pos_importance * length_importance
+        n = len(sentences)
+        head_end = n * 0.2  # First 20%
+        tail_start = n * 0.8  # Last 20%
+        importance = [
+            # Position-based importance times length-based importance:
+            # longer sentences often contain more information
+            (2.0 if i < head_end else 1.5 if i > tail_start else 1.0) * min(1.0, length / 20.0)
+            for i, length in enumerate(lengths)
+        ]
         
         # Sort sentences by importance
-        sorted_sentences = sorted(range(len(sentences)), key=lambda i: importance[i], reverse=True)
+        sorted_sentences = sorted(range(n), key=importance.__getitem__, reverse=True)
         
         # Select top sentences to form summary (up to max_words)
         selected_indices = []
         word_count = 0
         for i in sorted_sentences:
-            sentence_words = len(sentences[i].split())
+            sentence_words = lengths[i]
             if word_count + sentence_words <= max_words:
                 selected_indices.append(i)
                 word_count += sentence_words
@@ -367,13 +542,14 @@ class OpenAISummarizer:
         """
         # Split text into segments
         words = text.split()
-        segment_size = max(1, len(words) // num_points)
+        n_words = len(words)
+        segment_size = max(1, n_words // num_points)
         
         key_points = []
-        for i in range(min(num_points, len(words) // segment_size)):
+        for i in range(min(num_points, n_words // segment_size)):
             # Extract segment
             start_idx = i * segment_size
-            end_idx = min((i + 1) * segment_size, len(words))
+            end_idx = min((i + 1) * segment_size, n_words)
             segment = ' '.join(words[start_idx:end_idx])
             
             # Calculate timestamp
@@ -383,7 +559,7 @@ class OpenAISummarizer:
             timestamp = f"{minutes}:{seconds:02d}"
             
             # Extract first sentence as key point
-            sentences = segment.split('.')
+            sentences = segment.split('.', 1)
             point = sentences[0] + '.' if sentences else segment[:100]
             
             key_points.append({
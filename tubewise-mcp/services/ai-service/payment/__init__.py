@@ -2,4 +2,4 @@
 Payment package for TubeWise Pro subscriptions.
 """
 
-from payment.stripe_service import create_customer, create_checkout_session, handle_webhook_event, get_subscription_details, cancel_subscription, get_pricing_plans
+from payment.stripe_service import create_customer, create_checkout_session, verify_event, dispatch_event, invalidate_subscription_cache, get_subscription_details, cancel_subscription, get_pricing_plans
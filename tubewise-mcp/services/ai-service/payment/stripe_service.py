@@ -4,20 +4,60 @@ This module handles all interactions with the Stripe API for subscription manage
 """
 
 import os
+import time
+import asyncio
+import logging
+import threading
+import orjson
 import stripe
+from collections import OrderedDict
+from functools import lru_cache
 from datetime import datetime
 from typing import Dict, Any, Optional, List, Tuple
 
+from sqlalchemy import update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
 
 # Import models
-from db import User, Subscription
+from db import SessionLocal, User, Subscription
+from redis_client import get_redis
+
+logger = logging.getLogger(__name__)
 
 # Set up Stripe API key
 stripe.api_key = os.getenv("STRIPE_SECRET_KEY", "sk_test_your_test_key")
+
+# Stripe API calls use the SDK's *_async methods, which run over httpx so a
+# Stripe round trip doesn't block the event loop. Webhook signature checks
+# are local HMAC work and stay synchronous.
 STRIPE_WEBHOOK_SECRET = os.getenv("STRIPE_WEBHOOK_SECRET", "whsec_your_webhook_secret")
 
+# One httpx-backed client for every Stripe call in this process, so
+# connections to api.stripe.com stay alive between calls instead of paying
+# for a new TLS handshake; also serves any synchronous calls
+STRIPE_HTTP_TIMEOUT = int(os.getenv("STRIPE_HTTP_TIMEOUT", "10"))  # seconds
+stripe.default_http_client = stripe.HTTPXClient(
+    timeout=STRIPE_HTTP_TIMEOUT,
+    allow_sync_methods=True
+)
+
+# Webhook idempotency: Stripe retries deliveries for up to 72 hours, so
+# remember processed event IDs for that long. Event IDs are claimed in Redis
+# so replays are caught across workers; the in-process map (bounded, oldest
+# evicted first) is the fallback when Redis is unavailable
+WEBHOOK_EVENT_PREFIX = "stripe:evt"
+WEBHOOK_EVENT_TTL = 72 * 60 * 60  # seconds
+WEBHOOK_SEEN_EVENTS_MAX = 10000
+_seen_events: "OrderedDict[str, float]" = OrderedDict()
+_seen_events_lock = threading.Lock()
+
+# Subscription details are polled by the UI; cache them briefly in Redis
+# (shared by all workers) and drop the entry whenever a subscription changes
+SUBSCRIPTION_CACHE_PREFIX = "sub"
+SUBSCRIPTION_CACHE_TTL = 60  # seconds
+
 # Pro plan configuration
 PRO_PLAN_PRICE_ID = os.getenv("STRIPE_PRO_PLAN_PRICE_ID", "price_your_price_id")
 PRO_PLAN_PRODUCT_ID = os.getenv("STRIPE_PRO_PLAN_PRODUCT_ID", "prod_your_product_id")
@@ -38,7 +78,7 @@ PRO_PLAN_DETAILS = {
     "currency": "USD"
 }
 
-def create_customer(db: Session, user: User) -> str:
+async def create_customer(db: Session, user: User) -> str:
     """
     Create a Stripe customer for a user and save the customer ID to the database.
     
@@ -55,7 +95,7 @@ def create_customer(db: Session, user: User) -> str:
         
     # Create a new customer in Stripe
     try:
-        customer = stripe.Customer.create(
+        customer = await stripe.Customer.create_async(
             email=user.email,
             name=user.name,
             metadata={"user_id": str(user.id)}
@@ -70,7 +110,7 @@ def create_customer(db: Session, user: User) -> str:
         db.rollback()
         raise HTTPException(status_code=400, detail=f"Stripe error: {str(e)}")
 
-def create_checkout_session(db: Session, user: User, price_id: str, success_url: str, cancel_url: str) -> str:
+async def create_checkout_session(db: Session, user: User, price_id: str, success_url: str, cancel_url: str) -> str:
     """
     Create a Stripe checkout session for subscription payment.
     
@@ -85,11 +125,11 @@ def create_checkout_session(db: Session, user: User, price_id: str, success_url:
         Checkout session URL
     """
     # Ensure user has a Stripe customer ID
-    customer_id = create_customer(db, user)
+    customer_id = await create_customer(db, user)
     
     try:
         # Create the checkout session
-        checkout_session = stripe.checkout.Session.create(
+        checkout_session = await stripe.checkout.Session.create_async(
             customer=customer_id,
             payment_method_types=["card"],
             line_items=[{
@@ -108,54 +148,221 @@ def create_checkout_session(db: Session, user: User, price_id: str, success_url:
     except stripe.error.StripeError as e:
         raise HTTPException(status_code=400, detail=f"Stripe error: {str(e)}")
 
-def handle_webhook_event(db: Session, payload: bytes, signature: str) -> Dict[str, Any]:
+@lru_cache(maxsize=1024)
+def _epoch_iso(ts: int) -> str:
+    """
+    Format a Stripe epoch timestamp as an ISO 8601 UTC string.
+    
+    Period ends repeat across requests, so formatted values are memoized.
+    
+    Args:
+        ts: Seconds since the epoch
+        
+    Returns:
+        ISO 8601 string such as 2024-01-31T12:00:00Z
+    """
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(ts))
+
+async def close_http_client() -> None:
+    """Close the shared Stripe HTTP client's connection pools."""
+    await stripe.default_http_client.close_async()
+
+async def _get_cached_subscription(user_id: int) -> Optional[Dict[str, Any]]:
+    """Look up cached subscription details, treating Redis errors as a miss."""
+    redis = get_redis()
+    if redis is None:
+        return None
+    try:
+        cached = await redis.get(f"{SUBSCRIPTION_CACHE_PREFIX}:{user_id}")
+    except Exception as e:
+        logger.warning(f"Error reading subscription cache: {e}")
+        return None
+    return orjson.loads(cached) if cached else None
+
+async def _cache_subscription(user_id: int, details: Dict[str, Any]) -> None:
+    """Cache subscription details, ignoring Redis errors."""
+    redis = get_redis()
+    if redis is None:
+        return
+    try:
+        await redis.setex(f"{SUBSCRIPTION_CACHE_PREFIX}:{user_id}", SUBSCRIPTION_CACHE_TTL, orjson.dumps(details))
+    except Exception as e:
+        logger.warning(f"Error writing subscription cache: {e}")
+
+async def invalidate_subscription_cache(user_id: int) -> None:
+    """Drop a user's cached subscription details after their subscription changes."""
+    redis = get_redis()
+    if redis is None:
+        return
+    try:
+        await redis.delete(f"{SUBSCRIPTION_CACHE_PREFIX}:{user_id}")
+    except Exception as e:
+        logger.warning(f"Error invalidating subscription cache: {e}")
+
+def _mark_event_seen(event_id: str) -> bool:
+    """
+    Record a webhook event ID, evicting expired and overflow entries.
+    
+    Args:
+        event_id: Stripe event ID
+        
+    Returns:
+        True if the event is new, False if it was already seen
+    """
+    now = time.time()
+    
+    with _seen_events_lock:
+        # Entries are in insertion order, so expired ones are at the front
+        while _seen_events:
+            oldest_id, seen_at = next(iter(_seen_events.items()))
+            if now - seen_at < WEBHOOK_EVENT_TTL and len(_seen_events) < WEBHOOK_SEEN_EVENTS_MAX:
+                break
+            _seen_events.pop(oldest_id)
+        
+        if event_id in _seen_events:
+            return False
+        
+        _seen_events[event_id] = now
+        return True
+
+async def _claim_event(event_id: str) -> bool:
     """
-    Handle Stripe webhook events for subscription lifecycle management.
+    Claim a webhook event ID so only its first delivery is processed.
+    
+    Args:
+        event_id: Stripe event ID
+        
+    Returns:
+        True if the event is new, False if it was already claimed
+    """
+    redis = get_redis()
+    if redis is not None:
+        try:
+            claimed = await redis.set(f"{WEBHOOK_EVENT_PREFIX}:{event_id}", "1", nx=True, ex=WEBHOOK_EVENT_TTL)
+            return bool(claimed)
+        except Exception as e:
+            logger.warning(f"Error claiming Stripe event in Redis, using local replay check: {e}")
+    return _mark_event_seen(event_id)
+
+async def _release_event(event_id: str) -> None:
+    """Release a claimed event ID so a redelivery gets processed."""
+    with _seen_events_lock:
+        _seen_events.pop(event_id, None)
+    redis = get_redis()
+    if redis is None:
+        return
+    try:
+        await redis.delete(f"{WEBHOOK_EVENT_PREFIX}:{event_id}")
+    except Exception as e:
+        logger.warning(f"Error releasing Stripe event in Redis: {e}")
+
+def _dispatch_event(db: Session, event_type: str, event_data: Dict[str, Any]) -> Optional[int]:
+    """
+    Apply a verified webhook event to the database.
     
     Args:
         db: Database session
+        event_type: Stripe event type
+        event_data: Stripe event data
+        
+    Returns:
+        ID of the user whose subscription changed, if any
+    """
+    # Handle different event types
+    if event_type == "checkout.session.completed":
+        # Payment was successful, activate the subscription
+        return handle_successful_checkout(db, event_data)
+    elif event_type == "customer.subscription.updated":
+        # Subscription was updated
+        return handle_subscription_updated(db, event_data)
+    elif event_type == "customer.subscription.deleted":
+        # Subscription was cancelled
+        return handle_subscription_cancelled(db, event_data)
+    elif event_type == "invoice.payment_failed":
+        # Payment failed
+        return handle_payment_failed(db, event_data)
+    return None
+
+def verify_event(payload: bytes, signature: str) -> stripe.Event:
+    """
+    Verify a webhook payload's signature and parse it into an event.
+    
+    Args:
         payload: Raw request payload
         signature: Stripe signature header
         
     Returns:
-        Processed event data
+        Verified Stripe event
     """
     try:
-        # Verify the event came from Stripe
-        event = stripe.Webhook.construct_event(
+        return stripe.Webhook.construct_event(
             payload, signature, STRIPE_WEBHOOK_SECRET
         )
-        
-        event_data = event["data"]["object"]
-        event_type = event["type"]
-        
-        # Handle different event types
-        if event_type == "checkout.session.completed":
-            # Payment was successful, activate the subscription
-            handle_successful_checkout(db, event_data)
-        elif event_type == "customer.subscription.updated":
-            # Subscription was updated
-            handle_subscription_updated(db, event_data)
-        elif event_type == "customer.subscription.deleted":
-            # Subscription was cancelled
-            handle_subscription_cancelled(db, event_data)
-        elif event_type == "invoice.payment_failed":
-            # Payment failed
-            handle_payment_failed(db, event_data)
-            
-        return {"status": "success", "event_type": event_type}
     except stripe.error.SignatureVerificationError:
         raise HTTPException(status_code=400, detail="Invalid signature")
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Webhook error: {str(e)}")
 
-def handle_successful_checkout(db: Session, event_data: Dict[str, Any]) -> None:
+def _apply_event_in_session(event: stripe.Event) -> Optional[int]:
+    """
+    Apply a verified event on its own database session.
+    
+    Args:
+        event: Verified Stripe event
+        
+    Returns:
+        ID of the user whose subscription changed, if any
+    """
+    db = SessionLocal()
+    try:
+        return _dispatch_event(db, event["type"], event["data"]["object"])
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+async def dispatch_event(event: stripe.Event) -> Dict[str, Any]:
+    """
+    Apply a verified event once and drop the affected user's cached subscription.
+    
+    Runs before the webhook is acknowledged: if the database update fails
+    the event is released and a 500 is raised, so Stripe redelivers it.
+    
+    Args:
+        event: Verified Stripe event
+        
+    Returns:
+        Processed event data
+    """
+    event_type = event["type"]
+    
+    # Skip replayed deliveries of an event we've already handled
+    if not await _claim_event(event["id"]):
+        return {"status": "duplicate", "event_type": event_type}
+    
+    try:
+        # The handlers use a synchronous session, so keep them off the event loop
+        user_id = await asyncio.to_thread(_apply_event_in_session, event)
+    except Exception as e:
+        logger.error(f"Error handling Stripe event {event['id']} ({event_type}): {str(e)}")
+        await _release_event(event["id"])
+        raise HTTPException(status_code=500, detail="Error processing webhook event")
+    
+    if user_id is not None:
+        await invalidate_subscription_cache(user_id)
+    return {"status": "success", "event_type": event_type}
+
+def handle_successful_checkout(db: Session, event_data: Dict[str, Any]) -> Optional[int]:
     """
     Handle successful checkout session completion.
     
     Args:
         db: Database session
         event_data: Stripe event data
+        
+    Returns:
+        ID of the upgraded user, or None if nothing changed
     """
     # Get user ID from metadata
     user_id = int(event_data.get("metadata", {}).get("user_id"))
@@ -167,124 +374,153 @@ def handle_successful_checkout(db: Session, event_data: Dict[str, Any]) -> None:
     if not subscription_id:
         return
         
-    # Get user from database
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
+    # Upgrade the user to pro; nothing to do if the user doesn't exist
+    result = db.execute(update(User).where(User.id == user_id).values(role="pro"))
+    if result.rowcount == 0:
+        db.rollback()
         return
         
-    # Update user role to pro
-    user.role = "pro"
-    
-    # Create or update subscription record
-    subscription = db.query(Subscription).filter(Subscription.user_id == user_id).first()
-    if not subscription:
-        subscription = Subscription(
-            user_id=user_id,
-            stripe_subscription_id=subscription_id,
-            status="active",
-            start_date=datetime.utcnow()
-        )
-        db.add(subscription)
-    else:
-        subscription.stripe_subscription_id = subscription_id
-        subscription.status = "active"
-        subscription.start_date = datetime.utcnow()
-        subscription.end_date = None
-        
+    # Create or update subscription record in one statement
+    now = datetime.utcnow()
+    stmt = insert(Subscription).values(
+        user_id=user_id,
+        stripe_subscription_id=subscription_id,
+        status="active",
+        start_date=now
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Subscription.user_id],
+        set_={
+            "stripe_subscription_id": subscription_id,
+            "status": "active",
+            "start_date": now,
+            "end_date": None,
+            "updated_at": now
+        }
+    )
+    db.execute(stmt)
     db.commit()
+    return user_id
 
-def handle_subscription_updated(db: Session, event_data: Dict[str, Any]) -> None:
+def handle_subscription_updated(db: Session, event_data: Dict[str, Any]) -> Optional[int]:
     """
     Handle subscription update events.
     
     Args:
         db: Database session
         event_data: Stripe event data
+        
+    Returns:
+        ID of the subscription's user, or None if no subscription matched
     """
     subscription_id = event_data.get("id")
     if not subscription_id:
         return
         
-    # Find subscription in database
-    subscription = db.query(Subscription).filter(
-        Subscription.stripe_subscription_id == subscription_id
-    ).first()
-    
-    if not subscription:
-        return
-        
     # Update subscription status
     status = event_data.get("status")
+    stmt = update(Subscription).where(Subscription.stripe_subscription_id == subscription_id)
     if status:
-        subscription.status = status
+        stmt = stmt.values(status=status)
+    else:
+        stmt = stmt.values(updated_at=datetime.utcnow())
+    user_id = db.execute(stmt.returning(Subscription.user_id)).scalar()
+    
+    if user_id is None:
+        db.rollback()
+        return
         
     # If subscription is no longer active, update user role
     if status not in ["active", "trialing"]:
-        user = db.query(User).filter(User.id == subscription.user_id).first()
-        if user:
-            user.role = "free"
+        db.execute(update(User).where(User.id == user_id).values(role="free"))
             
     db.commit()
+    return user_id
 
-def handle_subscription_cancelled(db: Session, event_data: Dict[str, Any]) -> None:
+def handle_subscription_cancelled(db: Session, event_data: Dict[str, Any]) -> Optional[int]:
     """
     Handle subscription cancellation events.
     
     Args:
         db: Database session
         event_data: Stripe event data
+        
+    Returns:
+        ID of the subscription's user, or None if no subscription matched
     """
     subscription_id = event_data.get("id")
     if not subscription_id:
         return
         
-    # Find subscription in database
-    subscription = db.query(Subscription).filter(
-        Subscription.stripe_subscription_id == subscription_id
-    ).first()
+    # Update subscription status and end date
+    user_id = db.execute(
+        update(Subscription)
+        .where(Subscription.stripe_subscription_id == subscription_id)
+        .values(
+            status="cancelled",
+            end_date=datetime.fromtimestamp(event_data.get("cancel_at", 0))
+        )
+        .returning(Subscription.user_id)
+    ).scalar()
     
-    if not subscription:
+    if user_id is None:
+        db.rollback()
         return
-        
-    # Update subscription status and end date
-    subscription.status = "cancelled"
-    subscription.end_date = datetime.fromtimestamp(event_data.get("cancel_at", 0))
     
     # Update user role to free
-    user = db.query(User).filter(User.id == subscription.user_id).first()
-    if user:
-        user.role = "free"
+    db.execute(update(User).where(User.id == user_id).values(role="free"))
         
     db.commit()
+    return user_id
 
-def handle_payment_failed(db: Session, event_data: Dict[str, Any]) -> None:
+def handle_payment_failed(db: Session, event_data: Dict[str, Any]) -> Optional[int]:
     """
     Handle payment failure events.
     
     Args:
         db: Database session
         event_data: Stripe event data
+        
+    Returns:
+        ID of the subscription's user, or None if no subscription matched
     """
     subscription_id = event_data.get("subscription")
     if not subscription_id:
         return
         
-    # Find subscription in database
-    subscription = db.query(Subscription).filter(
-        Subscription.stripe_subscription_id == subscription_id
-    ).first()
-    
-    if not subscription:
-        return
-        
     # Update subscription status
-    subscription.status = "past_due"
+    user_id = db.execute(
+        update(Subscription)
+        .where(Subscription.stripe_subscription_id == subscription_id)
+        .values(status="past_due")
+        .returning(Subscription.user_id)
+    ).scalar()
     db.commit()
+    return user_id
 
-def get_subscription_details(user_id: int, db: Session) -> Dict[str, Any]:
+async def get_subscription_details(user_id: int, db: Session) -> Dict[str, Any]:
     """
     Get subscription details for a user.
     
+    Args:
+        user_id: User ID
+        db: Database session
+        
+    Returns:
+        Subscription details
+    """
+    cached = await _get_cached_subscription(user_id)
+    if cached is not None:
+        return cached
+        
+    details = await _load_subscription_details(user_id, db)
+    await _cache_subscription(user_id, details)
+    return details
+
+async def _load_subscription_details(user_id: int, db: Session) -> Dict[str, Any]:
+    """
+    Build subscription details for a user from the database and Stripe.
+    
     Args:
         user_id: User ID
         db: Database session
@@ -313,14 +549,15 @@ def get_subscription_details(user_id: int, db: Session) -> Dict[str, Any]:
         
     # Get subscription details from Stripe
     try:
-        stripe_subscription = stripe.Subscription.retrieve(subscription.stripe_subscription_id)
+        stripe_subscription = await stripe.Subscription.retrieve_async(subscription.stripe_subscription_id)
         
         return {
             "plan": "pro",
             "status": subscription.status,
             "start_date": subscription.start_date.isoformat() if subscription.start_date else None,
             "end_date": subscription.end_date.isoformat() if subscription.end_date else None,
-            "current_period_end": datetime.fromtimestamp(stripe_subscription.current_period_end).isoformat(),
+            "current_period_end": _epoch_iso(stripe_subscription.current_period_end),
+            "current_period_end_ts": stripe_subscription.current_period_end,
             "cancel_at_period_end": stripe_subscription.cancel_at_period_end,
             "limits": {
                 "videos_summarized": 100,
@@ -342,7 +579,7 @@ def get_subscription_details(user_id: int, db: Session) -> Dict[str, Any]:
             }
         }
 
-def cancel_subscription(user_id: int, db: Session) -> Dict[str, Any]:
+async def cancel_subscription(user_id: int, db: Session) -> Dict[str, Any]:
     """
     Cancel a user's subscription.
     
@@ -364,7 +601,7 @@ def cancel_subscription(user_id: int, db: Session) -> Dict[str, Any]:
         
     # Cancel subscription in Stripe
     try:
-        stripe_subscription = stripe.Subscription.modify(
+        stripe_subscription = await stripe.Subscription.modify_async(
             subscription.stripe_subscription_id,
             cancel_at_period_end=True
         )
@@ -372,37 +609,45 @@ def cancel_subscription(user_id: int, db: Session) -> Dict[str, Any]:
         # Update subscription in database
         subscription.cancel_at_period_end = True
         db.commit()
+        await invalidate_subscription_cache(user_id)
         
         return {
             "status": "cancelled",
-            "effective_date": datetime.fromtimestamp(stripe_subscription.cancel_at).isoformat()
+            "effective_date": _epoch_iso(stripe_subscription.cancel_at)
         }
     except stripe.error.StripeError as e:
         raise HTTPException(status_code=400, detail=f"Stripe error: {str(e)}")
 
+# Pricing plans are static, so build them (and their JSON encoding) once
+FREE_PLAN_DETAILS = {
+    "name": "Free",
+    "price": 0,
+    "currency": "USD",
+    "features": [
+        "5 video summaries per month",
+        "No video comparisons",
+        "10 content generations per month",
+        "Basic AI analysis"
+    ],
+    "limits": {
+        "videos_summarized": 5,
+        "videos_compared": 0,
+        "content_generated": 10
+    }
+}
+
+PRICING_PLANS = {
+    "free": FREE_PLAN_DETAILS,
+    "pro": PRO_PLAN_DETAILS
+}
+
+PRICING_PLANS_JSON = orjson.dumps(PRICING_PLANS)
+
 def get_pricing_plans() -> Dict[str, Any]:
     """
     Get pricing plans information.
     
     Returns:
-        Pricing plans details
-    """
-    return {
-        "free": {
-            "name": "Free",
-            "price": 0,
-            "currency": "USD",
-            "features": [
-                "5 video summaries per month",
-                "No video comparisons",
-                "10 content generations per month",
-                "Basic AI analysis"
-            ],
-            "limits": {
-                "videos_summarized": 5,
-                "videos_compared": 0,
-                "content_generated": 10
-            }
-        },
-        "pro": PRO_PLAN_DETAILS
-    }
+        Pricing plans details (shared; do not mutate)
+    """
+    return PRICING_PLANS
@@ -2,7 +2,7 @@
 Subscription API endpoints for TubeWise Pro.
 """
 
-from fastapi import APIRouter, Depends, Request, HTTPException, Header
+from fastapi import APIRouter, Depends, Request, HTTPException, Header, Response
 from sqlalchemy.orm import Session
 from typing import Dict, Any, Optional
 import stripe
@@ -10,16 +10,30 @@ import stripe
 from . import stripe_service
 from db import get_db, User
 from auth.auth_service import get_current_user
+from error_handler import ORJSONResponse
 
 # Create router
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
+
+# Pricing only changes with a deploy, so let browsers and CDNs cache it
+PRICING_CACHE_CONTROL = "public, max-age=3600, immutable"
+
+@router.on_event("shutdown")
+async def close_stripe_client():
+    """Close pooled connections to the Stripe API."""
+    await stripe_service.close_http_client()
 
 @router.get("/pricing")
-async def get_pricing_plans() -> Dict[str, Any]:
+async def get_pricing_plans() -> Response:
     """
     Get pricing plans information.
     """
-    return stripe_service.get_pricing_plans()
+    # Serve the pre-encoded JSON instead of re-serializing the same dict
+    return Response(
+        content=stripe_service.PRICING_PLANS_JSON,
+        media_type="application/json",
+        headers={"Cache-Control": PRICING_CACHE_CONTROL}
+    )
 
 @router.post("/create-checkout-session")
 async def create_checkout_session(
@@ -36,7 +50,7 @@ async def create_checkout_session(
     cancel_url = f"{base_url}/subscription/cancel"
     
     # Create checkout session
-    checkout_url = stripe_service.create_checkout_session(
+    checkout_url = await stripe_service.create_checkout_session(
         db=db,
         user=current_user,
         price_id=stripe_service.PRO_PLAN_PRICE_ID,
@@ -54,7 +68,7 @@ async def get_subscription(
     """
     Get current user's subscription details.
     """
-    return stripe_service.get_subscription_details(current_user.id, db)
+    return await stripe_service.get_subscription_details(current_user.id, db)
 
 @router.post("/cancel")
 async def cancel_subscription(
@@ -64,19 +78,21 @@ async def cancel_subscription(
     """
     Cancel current user's subscription.
     """
-    return stripe_service.cancel_subscription(current_user.id, db)
+    return await stripe_service.cancel_subscription(current_user.id, db)
 
 @router.post("/webhook")
 async def stripe_webhook(
     request: Request,
-    stripe_signature: str = Header(None),
-    db: Session = Depends(get_db)
+    stripe_signature: str = Header(None)
 ) -> Dict[str, Any]:
     """
     Handle Stripe webhook events.
+    
+    The event is only acknowledged once its database updates are committed;
+    a failure returns 500 so Stripe redelivers it.
     """
     # Get raw request payload
     payload = await request.body()
     
-    # Process webhook event
-    return stripe_service.handle_webhook_event(db, payload, stripe_signature)
+    event = stripe_service.verify_event(payload, stripe_signature)
+    return await stripe_service.dispatch_event(event)
@@ -7,4 +7,5 @@ from pydantic import BaseModel, ConfigDict
 
 class BaseModelWithConfig(BaseModel):
     """Base model with configuration for arbitrary types."""
-    model_config = ConfigDict(arbitrary_types_allowed=True)
+    # Timedeltas as ISO 8601 strings, a JSON-native type orjson can pass through
+    model_config = ConfigDict(arbitrary_types_allowed=True, ser_json_timedelta="iso8601")
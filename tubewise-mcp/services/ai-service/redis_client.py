@@ -0,0 +1,67 @@
+"""
+Shared asyncio Redis client for hot, high-frequency data such as usage counters.
+"""
+import os
+import logging
+from typing import Optional
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:
+    aioredis = None
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Redis connection settings (same variables as cache_service)
+REDIS_HOST = os.getenv("REDIS_HOST", "localhost")
+REDIS_PORT = int(os.getenv("REDIS_PORT", "6379"))
+REDIS_PASSWORD = os.getenv("REDIS_PASSWORD", "")
+REDIS_DB = int(os.getenv("REDIS_DB", "0"))
+
+_client = None
+
+def create_redis(db: Optional[int] = None):
+    """Create a new asyncio Redis client.
+
+    Connections are bound to the event loop that opens them, so code running
+    on its own loop should hold its own client rather than the shared one.
+
+    Args:
+        db: Redis database number, defaulting to REDIS_DB
+
+    Returns:
+        A redis.asyncio.Redis client, or None if the redis package is not installed
+    """
+    if aioredis is None:
+        return None
+    return aioredis.Redis(
+        host=REDIS_HOST,
+        port=REDIS_PORT,
+        password=REDIS_PASSWORD or None,
+        db=REDIS_DB if db is None else db,
+        decode_responses=True,
+        socket_timeout=5,
+        socket_connect_timeout=5
+    )
+
+def get_redis():
+    """Return the shared asyncio Redis client, creating it on first use.
+
+    Returns:
+        A redis.asyncio.Redis client, or None if the redis package is not installed
+    """
+    global _client
+    if _client is None:
+        _client = create_redis()
+    return _client
+
+async def close_redis() -> None:
+    """Close the shared client's connection pool."""
+    global _client
+    if _client is not None:
+        try:
+            await _client.close()
+        except Exception as e:
+            logger.warning(f"Error closing Redis client: {e}")
+        _client = None
@@ -1,18 +1,26 @@
 from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Query
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from pydantic import BaseModel
 import os
-from sqlalchemy.orm import Session
+import asyncio
+import base64
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import update
 from sqlalchemy.future import select
 from datetime import datetime, timedelta
 import logging
 
 from auth.dependencies import get_current_user, verify_admin_role
-from db import get_db
+from error_handler import ORJSONResponse
+from db import get_async_db, get_async_session
 from models.user import User
 import db_repository as repo
 
-router = APIRouter(prefix="/admin", tags=["admin"])
+# Importing error_handler routes records through its QueueHandler, so the
+# actual console/file writes happen on the listener thread
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/admin", tags=["admin"], default_response_class=ORJSONResponse)
 
 # Models for admin dashboard
 class UserListItem(BaseModel):
@@ -25,6 +33,10 @@ class UserListItem(BaseModel):
     last_active: Optional[datetime] = None
     usage_stats: Dict[str, int]
 
+class UserListPage(BaseModel):
+    items: List[UserListItem]
+    next_cursor: Optional[str] = None
+
 class SystemLog(BaseModel):
     id: int
     timestamp: datetime
@@ -48,57 +60,83 @@ class AdminDashboardStats(BaseModel):
     pro_users_count: int
     free_users_count: int
 
+async def _run_query(query_fn, **kwargs):
+    """Run a repository query on its own session so queries can run concurrently"""
+    # An AsyncSession can't run queries concurrently, but the pool can
+    async with get_async_db() as session:
+        return await query_fn(session, **kwargs)
+
+def _encode_cursor(created_at: datetime, user_id: int) -> str:
+    """Encode a user list position as an opaque cursor"""
+    raw = f"{created_at.isoformat()}|{user_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def _decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Decode a cursor from _encode_cursor back into (created_at, id)"""
+    try:
+        created_at, user_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at), int(user_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def _user_list_item(user: User, usage_stats: Dict[str, Any]) -> UserListItem:
+    """Build a UserListItem from a user row and its usage stats"""
+    # Values come straight from trusted database rows, so skip validation
+    return UserListItem.model_construct(
+        id=user.id,
+        email=user.email,
+        name=user.name,
+        role=user.role,
+        credits=user.credits,
+        created_at=user.created_at,
+        last_active=usage_stats.get("last_active"),
+        usage_stats={
+            "videos_summarized": usage_stats.get("videos_summarized", 0),
+            "videos_compared": usage_stats.get("videos_compared", 0),
+            "content_generated": usage_stats.get("content_generated", 0),
+            "fact_checks": usage_stats.get("fact_checks", 0)
+        }
+    )
+
 # Admin-only endpoints
-@router.get("/users", response_model=List[UserListItem])
+@router.get("/users", response_model=UserListPage)
 async def get_all_users(
-    skip: int = 0, 
+    after: Optional[str] = None,
     limit: int = 100,
     search: Optional[str] = None,
     role_filter: Optional[str] = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(verify_admin_role)
 ):
     """
     Get a list of all users (admin only)
     
     This endpoint allows admins to view all users in the system with their basic information
-    and usage statistics. Results can be paginated and filtered.
+    and usage statistics, newest first. Results can be filtered and are paginated
+    with cursors: pass a page's next_cursor as ``after`` to get the following page.
     """
+    position = _decode_cursor(after) if after else None
+    
     try:
         # Get users from database
-        users = await repo.get_users(db, skip=skip, limit=limit, search=search, role=role_filter)
+        users = await repo.get_users(db, limit=limit, search=search, role=role_filter, after=position)
         
-        # Get usage stats for each user
-        result = []
-        for user in users:
-            # Get usage stats
-            usage_stats = await repo.get_user_usage_stats(db, user.id)
-            
-            # Convert to UserListItem
-            user_item = UserListItem(
-                id=user.id,
-                email=user.email,
-                name=user.name,
-                role=user.role,
-                credits=user.credits,
-                created_at=user.created_at,
-                last_active=user.last_active,
-                usage_stats={
-                    "videos_summarized": usage_stats.get("videos_summarized", 0),
-                    "videos_compared": usage_stats.get("videos_compared", 0),
-                    "content_generated": usage_stats.get("content_generated", 0),
-                    "fact_checks": usage_stats.get("fact_checks", 0)
-                }
-            )
-            result.append(user_item)
+        # Get usage stats for all users in one query
+        stats_by_id = await repo.get_user_usage_stats_bulk(db, [user.id for user in users])
+        
+        result = [_user_list_item(user, stats_by_id.get(user.id, {})) for user in users]
         
-        return result
+        # A full page may have more users after it
+        next_cursor = None
+        if users and len(users) == limit:
+            next_cursor = _encode_cursor(users[-1].created_at, users[-1].id)
+        
+        return UserListPage.model_construct(items=result, next_cursor=next_cursor)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error getting users: {str(e)}")
 
 @router.get("/dashboard/stats", response_model=AdminDashboardStats)
 async def get_dashboard_stats(
-    db: Session = Depends(get_db),
     current_user: User = Depends(verify_admin_role)
 ):
     """
@@ -108,37 +146,22 @@ async def get_dashboard_stats(
     user counts, activity metrics, and feature usage.
     """
     try:
-        # Get total users
-        total_users = await repo.count_users(db)
-        
-        # Get active users in last 24 hours
         yesterday = datetime.now() - timedelta(days=1)
-        active_users_24h = await repo.count_active_users(db, since=yesterday)
-        
-        # Get active users in last 7 days
         last_week = datetime.now() - timedelta(days=7)
-        active_users_7d = await repo.count_active_users(db, since=last_week)
-        
-        # Get pro and free users count
-        pro_users = await repo.count_users_by_role(db, role="pro")
-        free_users = await repo.count_users_by_role(db, role="free")
         
-        # Get feature usage counts
-        videos_processed = await repo.count_feature_usage(db, feature="summarize")
-        comparisons = await repo.count_feature_usage(db, feature="compare")
-        fact_checks = await repo.count_feature_usage(db, feature="fact_check")
-        content_generated = await repo.count_feature_usage(db, feature="generate")
+        # One statement for the user counts and one for feature usage,
+        # run concurrently since neither depends on the other
+        user_counts, feature_counts = await asyncio.gather(
+            _run_query(repo.get_user_counts, yesterday=yesterday, last_week=last_week),
+            _run_query(repo.get_feature_usage_counts, features=["summarize", "compare", "fact_check", "generate"])
+        )
         
         return AdminDashboardStats(
-            total_users=total_users,
-            active_users_last_24h=active_users_24h,
-            active_users_last_7d=active_users_7d,
-            total_videos_processed=videos_processed,
-            total_comparisons=comparisons,
-            total_fact_checks=fact_checks,
-            total_content_generated=content_generated,
-            pro_users_count=pro_users,
-            free_users_count=free_users
+            **user_counts,
+            total_videos_processed=feature_counts["summarize"],
+            total_comparisons=feature_counts["compare"],
+            total_fact_checks=feature_counts["fact_check"],
+            total_content_generated=feature_counts["generate"]
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error getting dashboard stats: {str(e)}")
@@ -151,7 +174,7 @@ async def get_system_logs(
     source: Optional[str] = None,
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(verify_admin_role)
 ):
     """
@@ -179,7 +202,7 @@ async def get_system_logs(
 async def update_user(
     user_id: int,
     update_data: UpdateUserRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(verify_admin_role)
 ):
     """
@@ -189,45 +212,29 @@ async def update_user(
     and language preference.
     """
     try:
-        # Get user from database
-        user = await repo.get_user_by_id(db, user_id)
-        if not user:
-            raise HTTPException(status_code=404, detail="User not found")
-        
-        # Update user data
-        if update_data.role is not None:
-            if update_data.role not in ["free", "pro", "admin"]:
-                raise HTTPException(status_code=400, detail="Invalid role")
-            user.role = update_data.role
+        # Only the fields that were provided are changed
+        patch = update_data.model_dump(exclude_none=True)
+        if "role" in patch and patch["role"] not in ["free", "pro", "admin"]:
+            raise HTTPException(status_code=400, detail="Invalid role")
         
-        if update_data.credits is not None:
-            user.credits = update_data.credits
-        
-        if update_data.language_preference is not None:
-            user.language_preference = update_data.language_preference
+        if patch:
+            # Update by primary key and read the row back in one statement
+            user = await db.scalar(
+                update(User).where(User.id == user_id).values(**patch).returning(User)
+            )
+            await db.commit()
+        else:
+            user = await db.get(User, user_id)
         
-        # Save updated user
-        updated_user = await repo.update_user(db, user)
+        if not user:
+            raise HTTPException(status_code=404, detail="User not found")
         
         # Get usage stats
-        usage_stats = await repo.get_user_usage_stats(db, user.id)
+        stats_by_id = await repo.get_user_usage_stats_bulk(db, [user.id])
+        usage_stats = stats_by_id.get(user.id, {})
         
         # Return updated user
-        return UserListItem(
-            id=updated_user.id,
-            email=updated_user.email,
-            name=updated_user.name,
-            role=updated_user.role,
-            credits=updated_user.credits,
-            created_at=updated_user.created_at,
-            last_active=updated_user.last_active,
-            usage_stats={
-                "videos_summarized": usage_stats.get("videos_summarized", 0),
-                "videos_compared": usage_stats.get("videos_compared", 0),
-                "content_generated": usage_stats.get("content_generated", 0),
-                "fact_checks": usage_stats.get("fact_checks", 0)
-            }
-        )
+        return _user_list_item(user, usage_stats)
     except HTTPException:
         raise
     except Exception as e:
@@ -236,7 +243,7 @@ async def update_user(
 @router.delete("/users/{user_id}", status_code=204)
 async def delete_user(
     user_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(verify_admin_role)
 ):
     """
@@ -245,17 +252,13 @@ async def delete_user(
     This endpoint allows admins to delete a user from the system.
     """
     try:
-        # Get user from database
-        user = await repo.get_user_by_id(db, user_id)
-        if not user:
-            raise HTTPException(status_code=404, detail="User not found")
-        
         # Don't allow deleting self
-        if user.id == current_user.id:
+        if user_id == current_user.id:
             raise HTTPException(status_code=400, detail="Cannot delete yourself")
         
-        # Delete user
-        await repo.delete_user(db, user_id)
+        # Delete user by primary key; nothing deleted means no such user
+        if not await repo.delete_user(db, user_id):
+            raise HTTPException(status_code=404, detail="User not found")
         
         return None
     except HTTPException:
@@ -266,7 +269,7 @@ async def delete_user(
 @router.post("/users/{user_id}/reset-password", status_code=204)
 async def reset_user_password(
     user_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(verify_admin_role)
 ):
     """
@@ -277,7 +280,7 @@ async def reset_user_password(
     """
     try:
         # Get user from database
-        user = await repo.get_user_by_id(db, user_id)
+        user = await db.get(User, user_id)
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
         
@@ -285,8 +288,9 @@ async def reset_user_password(
         temp_password = await repo.reset_user_password(db, user_id)
         
         # TODO: Send email with temporary password
-        # For now, just log it
-        logging.info(f"Reset password for user {user.email}: {temp_password}")
+        # Until then it is not stored or logged anywhere
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Reset password for user %s", user.email)
         
         return None
     except HTTPException:
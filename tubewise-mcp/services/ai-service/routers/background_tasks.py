@@ -1,14 +1,19 @@
 from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Query
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from pydantic import BaseModel, Field
+import asyncio
 import logging
+import re
+import uuid
 from celery_worker import (
+    celery_app,
     process_video_summary,
     process_video_comparison,
     generate_content,
     get_task_status
 )
-from cache_service import cache_service
+from cache_service import cache_service, comparison_key
+from services.task_status_batcher import TaskStatusBatcher
 from auth import get_current_user
 
 # Configure logging
@@ -18,6 +23,43 @@ logger = logging.getLogger(__name__)
 # Create router
 router = APIRouter(prefix="/background-tasks", tags=["Background Tasks"])
 
+# Coalesces status polls into one result backend round trip
+task_status_batcher = TaskStatusBatcher(fallback=get_task_status)
+
+# Cached comparison task IDs carry a comparison_key digest instead of a video ID
+COMPARISON_KEY_PATTERN = re.compile(r"[0-9a-f]{32}")
+
+# Task statuses after which a task no longer produces its result
+TASK_FINISHED_STATUSES = {"COMPLETED", "FAILED", "REVOKED"}
+
+async def _claim_task(task_type: str, resource_id: str) -> Tuple[str, bool]:
+    """
+    Claim a resource for a new task, or join the task already producing it
+    
+    Concurrent requests for the same uncached resource would otherwise each
+    start a task that fetches the transcript and calls the LLM. The Redis
+    claim runs in a worker thread and the status check goes through the
+    batcher, so neither blocks the event loop.
+    
+    Args:
+        task_type: Type of task (e.g., 'summary', 'comparison')
+        resource_id: Unique identifier of the resource the task produces
+        
+    Returns:
+        Tuple of (task_id, is_new); start a task with task_id only if is_new
+    """
+    task_id = str(uuid.uuid4())
+    for _ in range(2):
+        existing = await asyncio.to_thread(cache_service.claim_inflight, task_type, resource_id, task_id)
+        if existing is None:
+            return task_id, True
+        status = await task_status_batcher.load(existing)
+        if status.get("status") not in TASK_FINISHED_STATUSES:
+            return existing, False
+        # The earlier task ended without caching a result; replace its claim
+        await asyncio.to_thread(cache_service.release_inflight, task_type, resource_id)
+    return task_id, True
+
 # Models
 class TaskResponse(BaseModel):
     task_id: str
@@ -64,11 +106,24 @@ async def create_summary_task(
                 message="Summary already available in cache"
             )
         
+        # Join a summary task that is already running for this video
+        task_id, is_new = await _claim_task("summary", request.video_id)
+        if not is_new:
+            return TaskResponse(
+                task_id=task_id,
+                status="STARTED",
+                message="Summary generation already in progress"
+            )
+        
         # Start the Celery task
         options = request.options or {}
         options["user_id"] = current_user["id"]
         
-        task = process_video_summary.delay(request.video_id, options)
+        try:
+            task = process_video_summary.apply_async(args=(request.video_id, options), task_id=task_id)
+        except Exception:
+            cache_service.release_inflight("summary", request.video_id)
+            raise
         
         return TaskResponse(
             task_id=task.id,
@@ -95,21 +150,34 @@ async def create_comparison_task(
             raise HTTPException(status_code=400, detail="Maximum 5 videos can be compared at once")
         
         # Check if we already have a cached comparison
-        cached_comparison = cache_service.get_comparison(request.video_ids)
+        comparison_id = comparison_key(request.video_ids)
+        cached_comparison = cache_service.get_comparison(comparison_id=comparison_id)
         if cached_comparison:
             # Return a fake task ID that can be used to retrieve the cached result
-            comparison_id = "-".join(sorted(request.video_ids))
             return TaskResponse(
                 task_id=f"cached_{comparison_id}",
                 status="COMPLETED",
                 message="Comparison already available in cache"
             )
         
+        # Join a comparison task that is already running for these videos
+        task_id, is_new = await _claim_task("comparison", comparison_id)
+        if not is_new:
+            return TaskResponse(
+                task_id=task_id,
+                status="STARTED",
+                message="Comparison generation already in progress"
+            )
+        
         # Start the Celery task
         options = request.options or {}
         options["user_id"] = current_user["id"]
         
-        task = process_video_comparison.delay(request.video_ids, options)
+        try:
+            task = process_video_comparison.apply_async(args=(request.video_ids, options), task_id=task_id)
+        except Exception:
+            cache_service.release_inflight("comparison", comparison_id)
+            raise
         
         return TaskResponse(
             task_id=task.id,
@@ -166,10 +234,10 @@ async def check_task_status(
     try:
         # Handle cached results
         if task_id.startswith("cached_"):
-            resource_id = task_id.replace("cached_", "")
+            resource_id = task_id[len("cached_"):]
             
             # Check if it's a video summary
-            if "_" not in resource_id:
+            if not COMPARISON_KEY_PATTERN.fullmatch(resource_id):
                 cached_summary = cache_service.get_summary(resource_id)
                 if cached_summary:
                     return TaskStatusResponse(
@@ -181,8 +249,7 @@ async def check_task_status(
             
             # Check if it's a video comparison
             else:
-                video_ids = resource_id.split("-")
-                cached_comparison = cache_service.get_comparison(video_ids)
+                cached_comparison = cache_service.get_comparison(comparison_id=resource_id)
                 if cached_comparison:
                     return TaskStatusResponse(
                         task_id=task_id,
@@ -200,7 +267,7 @@ async def check_task_status(
             )
         
         # Get status from Celery
-        status = get_task_status(task_id)
+        status = await task_status_batcher.load(task_id)
         
         return TaskStatusResponse(
             task_id=task_id,
@@ -230,12 +297,15 @@ async def cancel_task(
                 message="Task was already completed from cache"
             )
         
-        # In a real implementation, you would use Celery's revoke function
-        # For this example, we'll just return a success message
+        # Stop the task, terminating it if a worker has already picked it up
+        celery_app.control.revoke(task_id, terminate=True, signal="SIGTERM")
+        
+        # Let the next request for the same resource start a fresh task
+        cache_service.release_inflight_task(task_id)
         
         return TaskResponse(
             task_id=task_id,
-            status="CANCELED",
+            status="REVOKED",
             message="Task has been canceled"
         )
     except Exception as e:
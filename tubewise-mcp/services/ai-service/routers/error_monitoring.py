@@ -5,8 +5,10 @@ from datetime import datetime, timedelta
 from db import get_db
 from error_handler import error_handler, ErrorType, ErrorSeverity
 from services.error_log_service import error_log_service
+from services.error_log_writer import run_error_log_writer, flush_error_logs
 from models.error_log import ErrorLog
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
+import asyncio
 import logging
 
 # Configure logging
@@ -15,8 +17,33 @@ logger = logging.getLogger("error_monitoring")
 # Create router
 router = APIRouter()
 
+# Background task writing queued error logs to the database
+_error_log_writer_task: Optional[asyncio.Task] = None
+
+@router.on_event("startup")
+async def start_error_log_writer():
+    """Start the batched error log writer on application startup"""
+    global _error_log_writer_task
+    _error_log_writer_task = asyncio.create_task(run_error_log_writer())
+
+@router.on_event("shutdown")
+async def stop_error_log_writer():
+    """Stop the error log writer and write out anything still queued"""
+    if _error_log_writer_task is not None:
+        _error_log_writer_task.cancel()
+        try:
+            await _error_log_writer_task
+        except asyncio.CancelledError:
+            pass
+    try:
+        await flush_error_logs()
+    except Exception as e:
+        logger.error(f"Error flushing error logs on shutdown: {str(e)}")
+
 # Models
 class ErrorLogEntry(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    
     id: int
     error_type: str
     message: str
@@ -26,9 +53,6 @@ class ErrorLogEntry(BaseModel):
     path: Optional[str] = None
     timestamp: datetime
     details: Optional[Dict[str, Any]] = None
-    
-    class Config:
-        orm_mode = True
 
 class ErrorLogFilter(BaseModel):
     error_type: Optional[str] = None
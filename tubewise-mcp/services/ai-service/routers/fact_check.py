@@ -9,6 +9,22 @@ from models.usage_tracking import track_usage
 
 router = APIRouter(prefix="/fact-check", tags=["fact-check"])
 
+# Shared service instance so its pooled HTTP client is reused across requests
+_perplexity_service: Optional[PerplexityService] = None
+
+def get_perplexity_service() -> PerplexityService:
+    """Return the shared PerplexityService, creating it on first use"""
+    global _perplexity_service
+    if _perplexity_service is None:
+        _perplexity_service = PerplexityService()
+    return _perplexity_service
+
+@router.on_event("shutdown")
+async def close_perplexity_service():
+    """Close the shared Perplexity HTTP client on application shutdown"""
+    if _perplexity_service is not None:
+        await _perplexity_service.aclose()
+
 class FactCheckRequest(BaseModel):
     video_id: str
     claims: List[str]
@@ -51,8 +67,8 @@ async def fact_check_claims(
         )
     
     try:
-        # Initialize Perplexity service
-        perplexity_service = PerplexityService()
+        # Get the shared Perplexity service
+        perplexity_service = get_perplexity_service()
         
         # Limit the number of claims to process based on user role
         max_claims = 3 if current_user.role == "free" else 10
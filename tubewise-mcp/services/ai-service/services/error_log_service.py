@@ -1,5 +1,6 @@
 from sqlalchemy.orm import Session
 from models.error_log import ErrorLog
+from services import error_log_writer
 from typing import Dict, Any, Optional, List
 from datetime import datetime, timedelta
 import logging
@@ -74,6 +75,46 @@ class ErrorLogService:
             
             return None
     
+    @staticmethod
+    def queue_error_log(
+        error_type: str,
+        message: str,
+        severity: str,
+        code: Optional[str] = None,
+        request_id: Optional[str] = None,
+        path: Optional[str] = None,
+        details: Optional[Dict[str, Any]] = None,
+        stack_trace: Optional[str] = None,
+        user_id: Optional[int] = None,
+        request: Optional[Request] = None
+    ) -> bool:
+        """
+        Queue an error log entry for the batched background writer.
+        Unlike create_error_log this never blocks on the database.
+        """
+        ip_address = None
+        user_agent = None
+        
+        if request:
+            ip_address = request.client.host if hasattr(request.client, 'host') else None
+            user_agent = request.headers.get("user-agent")
+        
+        # Every row carries every column so the batch inserts as one executemany
+        return error_log_writer.enqueue({
+            "error_type": error_type,
+            "message": message,
+            "severity": severity,
+            "code": code,
+            "request_id": request_id,
+            "path": path,
+            "timestamp": datetime.utcnow(),
+            "details": details,
+            "stack_trace": stack_trace,
+            "user_id": user_id,
+            "ip_address": ip_address,
+            "user_agent": user_agent
+        })
+    
     @staticmethod
     def get_error_logs(
         db: Session,
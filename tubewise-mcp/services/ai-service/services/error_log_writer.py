@@ -0,0 +1,104 @@
+"""
+Batched, non-blocking writer for error log rows.
+
+Request handlers enqueue rows without touching the database; a background
+task drains the queue and inserts them in batches.
+"""
+import asyncio
+import logging
+from typing import Any, Dict, List
+
+from sqlalchemy import insert
+
+from db import SessionLocal
+from models.error_log import ErrorLog
+
+logger = logging.getLogger("error_log_writer")
+
+# Queue and batching settings
+ERROR_LOG_QUEUE_SIZE = 10000
+ERROR_LOG_BATCH_SIZE = 500
+ERROR_LOG_FLUSH_INTERVAL = 0.2  # seconds to wait for a batch to fill
+
+_queue: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue(maxsize=ERROR_LOG_QUEUE_SIZE)
+
+def enqueue(row: Dict[str, Any]) -> bool:
+    """
+    Queue an error log row for the background writer without blocking
+
+    Args:
+        row: Column values for one ErrorLog row
+
+    Returns:
+        True if queued, False if the queue was full and the row was dropped
+    """
+    try:
+        _queue.put_nowait(row)
+        return True
+    except asyncio.QueueFull:
+        logger.warning(f"Error log queue full, dropping {row.get('error_type')} error: {row.get('message')}")
+        return False
+
+def _write_batch(rows: List[Dict[str, Any]]) -> None:
+    """Insert a batch of error log rows in a single executemany"""
+    db = SessionLocal()
+    try:
+        db.execute(insert(ErrorLog), rows)
+        db.commit()
+    except Exception as e:
+        logger.error(f"Failed to write {len(rows)} error logs: {str(e)}")
+        db.rollback()
+    finally:
+        db.close()
+
+def _drain(batch: List[Dict[str, Any]], batch_size: int) -> None:
+    """Move already-queued rows into the batch without waiting"""
+    while len(batch) < batch_size:
+        try:
+            batch.append(_queue.get_nowait())
+        except asyncio.QueueEmpty:
+            return
+
+async def run_error_log_writer(
+    batch_size: int = ERROR_LOG_BATCH_SIZE,
+    interval: float = ERROR_LOG_FLUSH_INTERVAL
+) -> None:
+    """Write queued error logs in batches of up to batch_size until cancelled"""
+    loop = asyncio.get_running_loop()
+    while True:
+        batch = [await _queue.get()]
+        deadline = loop.time() + interval
+        _drain(batch, batch_size)
+
+        # Give a burst of errors a moment to fill the batch
+        try:
+            while len(batch) < batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(_queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+                _drain(batch, batch_size)
+        except asyncio.CancelledError:
+            # Don't lose rows already taken off the queue on shutdown
+            _write_batch(batch)
+            raise
+
+        await asyncio.to_thread(_write_batch, batch)
+
+async def flush_error_logs() -> int:
+    """
+    Write every queued error log immediately
+
+    Returns:
+        Number of rows written
+    """
+    written = 0
+    while not _queue.empty():
+        batch: List[Dict[str, Any]] = []
+        _drain(batch, ERROR_LOG_BATCH_SIZE)
+        await asyncio.to_thread(_write_batch, batch)
+        written += len(batch)
+    return written
@@ -0,0 +1,139 @@
+"""
+Coalesced Celery task status lookups.
+
+Status polls that arrive within a short window are answered from a single
+MGET against the Celery Redis result backend instead of one backend round
+trip per poll.
+"""
+import asyncio
+import json
+import logging
+import os
+from typing import Any, Callable, Dict, List, Optional
+
+from redis_client import create_redis
+
+logger = logging.getLogger("task_status_batcher")
+
+# Batching settings
+TASK_STATUS_BATCH_SIZE = 128
+TASK_STATUS_BATCH_TIME = 0.01  # seconds to wait for a batch to fill
+
+# Celery keeps results in its own Redis database (DB 1 in celery_worker). This
+# has its own setting because REDIS_DB selects the app cache's database here
+CELERY_RESULT_DB = int(os.getenv("CELERY_RESULT_DB", "1"))
+CELERY_RESULT_KEY_PREFIX = "celery-task-meta-"
+
+def _meta_to_status(meta: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Convert a Celery result backend entry to the API's task status format
+    
+    Args:
+        meta: Decoded result backend entry, or None if the task has none yet
+        
+    Returns:
+        Dict with status, progress, result and error
+    """
+    if meta is None:
+        return {"status": "PENDING", "progress": 0}
+    
+    state = meta.get("status")
+    result = meta.get("result")
+    if state == "SUCCESS":
+        return {"status": "COMPLETED", "progress": 100, "result": result}
+    if state == "FAILURE":
+        error = result.get("exc_message") if isinstance(result, dict) else result
+        return {"status": "FAILED", "progress": 0, "error": str(error)}
+    
+    # Custom and in-progress states carry their progress in the task meta
+    progress = result.get("progress", 0) if isinstance(result, dict) else 0
+    return {"status": state or "UNKNOWN", "progress": progress}
+
+class TaskStatusBatcher:
+    """
+    Collects task status lookups for up to ``batch_time`` seconds (or
+    ``max_batch_size`` distinct IDs) and answers them with one MGET.
+    
+    If the result backend can't be reached, each ID in the batch falls back
+    to ``fallback`` (a blocking per-task lookup), run off the event loop.
+    """
+    
+    def __init__(
+        self,
+        fallback: Callable[[str], Dict[str, Any]],
+        max_batch_size: int = TASK_STATUS_BATCH_SIZE,
+        batch_time: float = TASK_STATUS_BATCH_TIME
+    ):
+        self.fallback = fallback
+        self.max_batch_size = max_batch_size
+        self.batch_time = batch_time
+        self._pending: Dict[str, List[asyncio.Future]] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._flushes = set()
+        self._redis = None
+    
+    async def load(self, task_id: str) -> Dict[str, Any]:
+        """
+        Get a task's status, batched with other lookups in the same window
+        
+        Args:
+            task_id: Celery task ID
+            
+        Returns:
+            Task status information
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.setdefault(task_id, []).append(future)
+        
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.batch_time, self._flush)
+        
+        return await future
+    
+    def _flush(self) -> None:
+        """Start resolving every pending lookup as one batch"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        
+        batch, self._pending = self._pending, {}
+        if batch:
+            # Keep a reference so the flush task isn't garbage collected
+            flush = asyncio.ensure_future(self._resolve(batch))
+            self._flushes.add(flush)
+            flush.add_done_callback(self._flushes.discard)
+    
+    async def _fetch(self, task_ids: List[str]) -> List[Dict[str, Any]]:
+        """Read the result backend entries for all task IDs in one round trip"""
+        if self._redis is None:
+            self._redis = create_redis(db=CELERY_RESULT_DB)
+        if self._redis is None:
+            raise RuntimeError("redis package is not installed")
+        
+        raw = await self._redis.mget([CELERY_RESULT_KEY_PREFIX + task_id for task_id in task_ids])
+        return [_meta_to_status(json.loads(value) if value else None) for value in raw]
+    
+    async def _resolve(self, batch: Dict[str, List[asyncio.Future]]) -> None:
+        """Look up a batch of task IDs and resolve everyone waiting on them"""
+        task_ids = list(batch)
+        try:
+            statuses = await self._fetch(task_ids)
+        except Exception as e:
+            logger.warning(f"Batched task status lookup failed, falling back to per-task lookups: {e}")
+            try:
+                statuses = await asyncio.to_thread(lambda: [self.fallback(task_id) for task_id in task_ids])
+            except Exception as fallback_error:
+                # Fail every waiter rather than leave their load() calls hanging
+                for futures in batch.values():
+                    for future in futures:
+                        if not future.done():
+                            future.set_exception(fallback_error)
+                return
+        
+        for task_id, status in zip(task_ids, statuses):
+            for future in batch[task_id]:
+                if not future.done():
+                    future.set_result(status)
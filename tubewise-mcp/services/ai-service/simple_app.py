@@ -15,10 +15,10 @@ import os
 import sys
 import time
 import json
+import asyncio
 import logging
 import importlib
 import datetime
-import uuid
 import dotenv
 from googleapiclient.discovery import build
 
@@ -49,8 +49,9 @@ except ImportError:
 
 # Try to import error handling system
 try:
-    from error_handler import ErrorHandlingMiddleware, error_handler, configure_exception_handlers, ErrorType, ErrorSeverity
+    from error_handler import ErrorHandlingMiddleware, error_handler, configure_exception_handlers, ErrorType, ErrorSeverity, ORJSONResponse
 except ImportError:
+    ORJSONResponse = JSONResponse
     ErrorHandlingMiddleware = None
     error_handler = None
     configure_exception_handlers = None
@@ -228,7 +229,8 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/api/docs",
     redoc_url="/api/redoc",
-    openapi_url="/api/openapi.json"
+    openapi_url="/api/openapi.json",
+    default_response_class=ORJSONResponse
 )
 
 # Add CORS middleware
@@ -291,10 +293,43 @@ try:
 except ImportError:
     logging.warning("Error monitoring router not found. Error monitoring endpoints will not be available.")
 
+# Flush Redis usage counters to Postgres in the background while the app runs
+try:
+    from models.usage_tracking import run_usage_flusher, flush_usage_counters
+    from redis_client import close_redis
+    usage_flusher_available = True
+except ImportError:
+    usage_flusher_available = False
+    logging.warning("Usage tracking module not found. Usage counters will not be flushed.")
+
+_usage_flusher_task: Optional[asyncio.Task] = None
+
+if usage_flusher_available:
+    @app.on_event("startup")
+    async def start_usage_flusher():
+        """Start the periodic usage counter flush on application startup"""
+        global _usage_flusher_task
+        _usage_flusher_task = asyncio.create_task(run_usage_flusher())
+    
+    @app.on_event("shutdown")
+    async def stop_usage_flusher():
+        """Stop the usage flusher, write out pending counts and close Redis"""
+        if _usage_flusher_task is not None:
+            _usage_flusher_task.cancel()
+            try:
+                await _usage_flusher_task
+            except asyncio.CancelledError:
+                pass
+        try:
+            await flush_usage_counters()
+        except Exception as e:
+            logger.error(f"Error flushing usage counters on shutdown: {str(e)}")
+        await close_redis()
+
 # Request ID middleware to add request ID to each request
 @app.middleware("http")
 async def add_request_id(request: Request, call_next):
-    request_id = str(uuid.uuid4())
+    request_id = os.urandom(8).hex()
     # Store request ID in request state
     request.state.request_id = request_id
     
@@ -2,8 +2,9 @@
 Improved SummaryAgent that uses OpenAI API for high-quality summarization.
 """
 
-from openai_summarizer import OpenAISummarizer
+from openai_summarizer import OpenAISummarizer, run_sync
 from typing import List, Dict, Any, Optional, Tuple
+import inspect
 import time
 import re
 import os
@@ -63,6 +64,9 @@ class ImprovedSummaryAgent:
                 max_length=300,  # Maximum length of the summary in words
                 min_length=150   # Minimum length of the summary in words
             )
+            # The OpenAI summarizer is async; the transformer one is not
+            if inspect.isawaitable(summary_text):
+                summary_text = run_sync(summary_text)
             
             # Log the summary for debugging
             print(f"Generated summary length: {len(summary_text.split())} words")
@@ -71,6 +75,8 @@ class ImprovedSummaryAgent:
             # Extract key points with timestamps
             print("Extracting key points from transcript")
             key_points = self.summarizer.extract_key_points(transcript, video_id, num_points=7)
+            if inspect.isawaitable(key_points):
+                key_points = run_sync(key_points)
             
             # Log key points for debugging
             print(f"Generated {len(key_points)} key points")
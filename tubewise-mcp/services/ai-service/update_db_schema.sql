@@ -17,3 +17,77 @@ CREATE TABLE IF NOT EXISTS subscriptions (
 -- Update existing tables if needed
 ALTER TABLE usage_stats ADD COLUMN IF NOT EXISTS videos_compared INTEGER DEFAULT 0;
 ALTER TABLE usage_stats ADD COLUMN IF NOT EXISTS content_generated INTEGER DEFAULT 0;
+
+-- Add the UTC day column behind usage_tracking's per-day UPSERT: backfill it,
+-- fold any same-day duplicate rows into one, then add the unique index the
+-- ON CONFLICT (user_id, feature, date_day) clause needs
+DO $$
+BEGIN
+    IF to_regclass('usage_tracking') IS NOT NULL THEN
+        ALTER TABLE usage_tracking ADD COLUMN IF NOT EXISTS date_day DATE;
+        ALTER TABLE usage_tracking ALTER COLUMN date_day SET DEFAULT date(timezone('UTC', now()));
+        
+        UPDATE usage_tracking SET date_day = date(date) WHERE date_day IS NULL AND date IS NOT NULL;
+        
+        WITH totals AS (
+            SELECT min(id) AS keep_id, sum(coalesce(count, 0)) AS total
+            FROM usage_tracking
+            WHERE date_day IS NOT NULL
+            GROUP BY user_id, feature, date_day
+            HAVING count(*) > 1
+        )
+        UPDATE usage_tracking u SET count = totals.total
+        FROM totals WHERE u.id = totals.keep_id;
+        
+        DELETE FROM usage_tracking u
+        USING usage_tracking keep
+        WHERE u.user_id = keep.user_id
+          AND u.feature = keep.feature
+          AND u.date_day = keep.date_day
+          AND u.id > keep.id;
+        
+        CREATE UNIQUE INDEX IF NOT EXISTS uq_usage_tracking_user_feature_day
+            ON usage_tracking (user_id, feature, date_day);
+    END IF;
+END $$;
+
+-- Replace the single-column usage_tracking indexes with one composite index
+-- matching the per-user, per-feature, per-day usage lookup
+DO $$
+BEGIN
+    IF to_regclass('usage_tracking') IS NOT NULL THEN
+        CREATE INDEX IF NOT EXISTS ix_usage_uid_feature_date ON usage_tracking (user_id, feature, date);
+        DROP INDEX IF EXISTS ix_usage_tracking_user_id;
+        DROP INDEX IF EXISTS ix_usage_tracking_feature;
+    END IF;
+END $$;
+
+
+-- Make sure subscriptions has unique indexes on user_id (the checkout upsert's
+-- ON CONFLICT target) and stripe_subscription_id (the webhook lookup key).
+-- Tables created from the definition above already have them through their
+-- UNIQUE constraints; only create an index where none exists
+DO $$
+DECLARE
+    col TEXT;
+BEGIN
+    IF to_regclass('subscriptions') IS NULL THEN
+        RETURN;
+    END IF;
+    FOREACH col IN ARRAY ARRAY['user_id', 'stripe_subscription_id'] LOOP
+        IF NOT EXISTS (
+            SELECT 1
+            FROM pg_index i
+            JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = i.indkey[0]
+            WHERE i.indrelid = 'subscriptions'::regclass
+              AND i.indisunique
+              AND i.indnatts = 1
+              AND a.attname = col
+        ) THEN
+            EXECUTE format('CREATE UNIQUE INDEX %I ON subscriptions (%I)', 'ix_sub_' || col, col);
+        END IF;
+    END LOOP;
+END $$;
+
+-- Keyset pagination index for the admin user list
+CREATE INDEX IF NOT EXISTS ix_users_created_at_id ON users (created_at, id);
@@ -194,8 +194,8 @@ export default function AdminDashboard() {
         }
       });
       
-      setUsers(response.data);
-      setFilteredUsers(response.data);
+      setUsers(response.data.items);
+      setFilteredUsers(response.data.items);
       setIsLoadingUsers(false);
     } catch (error) {
       console.error('Error fetching users:', error);